@@ -1,13 +1,38 @@
 """The Av Weather integration."""
+import asyncio
 import logging
 import voluptuous as vol
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, ServiceCall
-from homeassistant.const import Platform
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.const import CONF_LATITUDE, CONF_LONGITUDE, CONF_RADIUS, Platform
 from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
-from .const import DOMAIN, SERVICE_UPDATE_WEATHER, FEED_METAR, FEED_TAF
+from .airports import get_airport_by_icao
+from .api import AviationWeatherApi, AviationWeatherApiError
+from .const import (
+    DOMAIN,
+    SERVICE_UPDATE_WEATHER,
+    SERVICE_FIND_NEARBY_STATIONS,
+    CONF_ENTRY_TYPE,
+    CONF_ICAO_CODES,
+    CONF_FEEDS,
+    CONF_METAR_INTERVAL,
+    CONF_TAF_INTERVAL,
+    CONF_ADAPTIVE_POLLING,
+    CONF_REGION,
+    DEFAULT_METAR_INTERVAL,
+    DEFAULT_TAF_INTERVAL,
+    DEFAULT_ADAPTIVE_POLLING,
+    ENTRY_TYPE_REGION,
+    FEED_METAR,
+    FEED_TAF,
+)
+from .coordinator import AvWeatherFeedCoordinator, AvWeatherInitialRefresh, AvWeatherRegionCoordinator
+from .geo import async_get_geo_index
+from .sensor import async_hand_over_api_sensors
+from .store import AvWeatherHistoryStore, AvWeatherReportStore
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -20,13 +45,169 @@ SERVICE_UPDATE_WEATHER_SCHEMA = vol.Schema({
     vol.Optional("feed_type"): vol.In([FEED_METAR, FEED_TAF]),
 })
 
+SERVICE_FIND_NEARBY_STATIONS_SCHEMA = vol.Schema({
+    vol.Inclusive("latitude", "location"): cv.latitude,
+    vol.Inclusive("longitude", "location"): cv.longitude,
+    vol.Optional("count", default=10): vol.All(vol.Coerce(int), vol.Range(min=1, max=50)),
+    vol.Optional("radius_km"): vol.All(vol.Coerce(float), vol.Range(min=1)),
+    vol.Optional("reporting_only", default=True): cv.boolean,
+})
+
+# Candidates checked for current METARs per station requested by find_nearby_stations
+NEARBY_CANDIDATE_FACTOR = 4
+
+
+async def async_refresh_entities(
+    coordinators: dict[str, AvWeatherFeedCoordinator],
+    entities: list,
+    feed_type: str | None = None,
+) -> None:
+    """Refresh entities with one chunked multi-station request per feed.
+
+    Entities are grouped by feed so that every station of a feed is fetched
+    together; the shared coordinator then hands the response to all sensors.
+    The feeds are fetched concurrently, and each feed's sensors update as
+    soon as its own response arrives.
+    """
+    plan: dict[str, set[str]] = {}
+    for entity in entities:
+        if feed_type and entity.feed_type != feed_type:
+            continue
+        plan.setdefault(entity.feed_type, set()).add(entity.icao_code)
+
+    async def _async_refresh_feed(feed: str, stations: set[str]) -> None:
+        """Refresh one feed, logging rather than raising its errors."""
+        _LOGGER.info("Updating %s data for %d station(s)", feed, len(stations))
+        try:
+            await coordinators[feed].async_refresh_stations(stations)
+        except Exception as e:
+            _LOGGER.error("Error updating %s data: %s", feed, e)
+
+    async with asyncio.TaskGroup() as group:
+        for feed, stations in plan.items():
+            group.create_task(_async_refresh_feed(feed, stations))
+
+
+async def _async_load_cached_reports(
+    store: AvWeatherReportStore,
+    history: AvWeatherHistoryStore,
+    coordinators: dict[str, AvWeatherFeedCoordinator],
+) -> None:
+    """Restore the last known reports and their history into the coordinators."""
+    await asyncio.gather(store.async_load(), history.async_load())
+    for coordinator in coordinators.values():
+        coordinator.async_set_cached_data(store.get(coordinator.feed_type))
+
+
+async def async_find_nearby_stations(
+    hass: HomeAssistant,
+    api: AviationWeatherApi,
+    call_data: dict,
+) -> ServiceResponse:
+    """Return the airports nearest a point, optionally only those with a current METAR."""
+    latitude = call_data.get("latitude", hass.config.latitude)
+    longitude = call_data.get("longitude", hass.config.longitude)
+    count = call_data["count"]
+    reporting_only = call_data["reporting_only"]
+
+    index = await async_get_geo_index()
+    candidates = index.nearest(
+        latitude,
+        longitude,
+        count * NEARBY_CANDIDATE_FACTOR if reporting_only else count,
+        call_data.get("radius_km", float("inf")),
+    )
+
+    reports: dict = {}
+    if reporting_only and candidates:
+        # One batched METAR request tells which candidates are reporting
+        try:
+            reports = await api.async_get_data(FEED_METAR, [icao for icao, _ in candidates], use_cache=True)
+        except AviationWeatherApiError as err:
+            reports = err.data
+            _LOGGER.warning("Could not check all nearby stations for reports: %s", err)
+        candidates = [(icao, distance) for icao, distance in candidates if icao in reports]
+
+    stations = []
+    for icao, distance in candidates[:count]:
+        airport = await get_airport_by_icao(icao) or {}
+        station = {
+            "icao_code": icao,
+            "name": airport.get("name"),
+            "distance_km": round(distance, 1),
+            "latitude": airport.get("lat"),
+            "longitude": airport.get("lon"),
+        }
+        if icao in reports:
+            station["flight_category"] = reports[icao].flight_category
+        stations.append(station)
+    return {"stations": stations}
+
+
+def _get_interval(entry: ConfigEntry, feed_type: str) -> int:
+    """Return the polling interval in minutes configured for a feed."""
+    if feed_type == FEED_METAR:
+        return entry.data.get(CONF_METAR_INTERVAL, DEFAULT_METAR_INTERVAL)
+    return entry.data.get(CONF_TAF_INTERVAL, DEFAULT_TAF_INTERVAL)
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Av Weather from a config entry."""
     _LOGGER.info("Setting up Av Weather for ICAO codes: %s", entry.data.get("icao_codes"))
 
     # Store the entry in hass.data for the platforms to access
-    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = entry.data
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    domain_data[entry.entry_id] = entry.data
+
+    # One API client and one coordinator per feed, shared by all entries
+    if "coordinators" not in domain_data:
+        api = AviationWeatherApi(async_get_clientsession(hass))
+        store = AvWeatherReportStore(hass)
+        history = AvWeatherHistoryStore(hass)
+        coordinators = {
+            FEED_METAR: AvWeatherFeedCoordinator(hass, api, FEED_METAR, store, history),
+            FEED_TAF: AvWeatherFeedCoordinator(hass, api, FEED_TAF, store),
+        }
+        domain_data["api"] = api
+        domain_data["store"] = store
+        domain_data["coordinators"] = coordinators
+        domain_data["initial_refresh"] = AvWeatherInitialRefresh(hass, coordinators)
+        # Entries set up concurrently all wait for the same load
+        domain_data["store_loaded"] = hass.async_create_task(
+            _async_load_cached_reports(store, history, coordinators)
+        )
+    coordinators: dict[str, AvWeatherFeedCoordinator] = domain_data["coordinators"]
+    initial_refresh: AvWeatherInitialRefresh = domain_data["initial_refresh"]
+    await domain_data["store_loaded"]
+
+    if entry.data.get(CONF_ENTRY_TYPE) == ENTRY_TYPE_REGION:
+        # Regions poll their own area request instead of the shared station feeds
+        region = entry.data[CONF_REGION]
+        domain_data.setdefault("regions", {})[entry.entry_id] = {
+            feed_type: AvWeatherRegionCoordinator(
+                hass,
+                domain_data["api"],
+                feed_type,
+                region[CONF_LATITUDE],
+                region[CONF_LONGITUDE],
+                region[CONF_RADIUS],
+                _get_interval(entry, feed_type),
+            )
+            for feed_type in entry.data[CONF_FEEDS]
+        }
+        for coordinator in domain_data["regions"][entry.entry_id].values():
+            initial_refresh.async_add_region(coordinator)
+    else:
+        stations = {code.strip().upper() for code in entry.data[CONF_ICAO_CODES].split(",") if code.strip()}
+        for feed_type in entry.data[CONF_FEEDS]:
+            coordinators[feed_type].async_register_entry(
+                entry.entry_id,
+                stations,
+                _get_interval(entry, feed_type),
+                entry.data.get(CONF_ADAPTIVE_POLLING, DEFAULT_ADAPTIVE_POLLING),
+            )
+            # Fetched together with every other entry's stations once HA has started
+            initial_refresh.async_add_stations(feed_type, stations)
 
     # Forward the setup to the sensor platform
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
@@ -37,6 +218,13 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         icao_code = call.data.get("icao_code")
         feed_type = call.data.get("feed_type")
         
+        if not icao_code:
+            # Regions are refreshed with their single area request
+            for region_coordinators in hass.data[DOMAIN].get("regions", {}).values():
+                for region_feed, coordinator in region_coordinators.items():
+                    if not feed_type or region_feed == feed_type:
+                        await coordinator.async_request_refresh()
+        
         if "entities" not in hass.data[DOMAIN]:
             _LOGGER.warning("No weather entities found")
             return
@@ -56,20 +244,26 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             for entity_list in hass.data[DOMAIN]["entities"].values():
                 entities_to_update.extend(entity_list)
         
-        # Update each entity
-        for entity in entities_to_update:
-            try:
-                await entity.async_update_weather(feed_type)
-            except Exception as e:
-                _LOGGER.error("Error updating weather for %s: %s", entity._icao_code, e)
+        await async_refresh_entities(hass.data[DOMAIN]["coordinators"], entities_to_update, feed_type)
     
-    # Register the service
+    async def async_handle_find_nearby_stations(call: ServiceCall) -> ServiceResponse:
+        """Handle the find_nearby_stations service call."""
+        return await async_find_nearby_stations(hass, hass.data[DOMAIN]["api"], call.data)
+
+    # Register the services
     hass.services.async_register(
         DOMAIN,
         SERVICE_UPDATE_WEATHER,
         async_handle_update_weather,
         schema=SERVICE_UPDATE_WEATHER_SCHEMA,
     )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_FIND_NEARBY_STATIONS,
+        async_handle_find_nearby_stations,
+        schema=SERVICE_FIND_NEARBY_STATIONS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
     
     # Listen for config entry updates
     entry.async_on_unload(entry.add_update_listener(async_reload_entry))
@@ -86,20 +280,39 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     # Clean up hass.data
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        domain_data = hass.data[DOMAIN]
+        domain_data.pop(entry.entry_id)
+        # Another loaded entry takes over the API diagnostic sensors
+        async_hand_over_api_sensors(hass, entry.entry_id)
         # Clean up entity references
-        if "entities" in hass.data[DOMAIN]:
+        if "entities" in domain_data:
             icao_codes = entry.data.get("icao_codes", "").split(",")
             for icao_code in icao_codes:
                 icao_code = icao_code.strip().upper()
-                if icao_code in hass.data[DOMAIN]["entities"]:
-                    hass.data[DOMAIN]["entities"].pop(icao_code)
-        
-        if not hass.data[DOMAIN]:
+                if icao_code in domain_data["entities"]:
+                    domain_data["entities"].pop(icao_code)
+
+        coordinators = domain_data.get("coordinators", {})
+        for coordinator in coordinators.values():
+            coordinator.async_unregister_entry(entry.entry_id)
+        for coordinator in domain_data.get("regions", {}).pop(entry.entry_id, {}).values():
+            await coordinator.async_shutdown()
+
+        # Loaded entries keep their data under their entry ID
+        remaining = [
+            other for other in hass.config_entries.async_entries(DOMAIN) if other.entry_id in domain_data
+        ]
+        if not remaining:
+            for coordinator in coordinators.values():
+                await coordinator.async_shutdown()
+            # Cancel requests still running rather than leaving them to finish
+            await domain_data["initial_refresh"].async_shutdown()
+            await domain_data["api"].async_shutdown()
             hass.data.pop(DOMAIN)
-            # Unregister service if no more entries
-            if hass.services.has_service(DOMAIN, SERVICE_UPDATE_WEATHER):
-                hass.services.async_remove(DOMAIN, SERVICE_UPDATE_WEATHER)
+            # Unregister services if no more entries
+            for service in (SERVICE_UPDATE_WEATHER, SERVICE_FIND_NEARBY_STATIONS):
+                if hass.services.has_service(DOMAIN, service):
+                    hass.services.async_remove(DOMAIN, service)
 
     return unload_ok
 
@@ -0,0 +1,164 @@
+"""Airport search index for the Av Weather config flow."""
+import asyncio
+import heapq
+import logging
+import re
+import unicodedata
+from bisect import bisect_left
+from collections.abc import Mapping
+from typing import Any
+
+from .airports import load_airports
+
+_LOGGER = logging.getLogger(__name__)
+
+# Field weights, highest first; a token keeps the best field it appears in
+WEIGHT_ICAO = 8
+WEIGHT_IATA = 6
+WEIGHT_CITY = 3
+WEIGHT_NAME = 2
+
+# Bonus for a term matching a whole token rather than only its prefix
+EXACT_BONUS = 2
+
+# Prefixes matching more tokens than this are not costed token by token; they
+# only drive a search when every term of the query is that broad
+MAX_PREFIX_TOKENS = 256
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+_SEARCH_INDEX: "AirportSearchIndex | None" = None
+# Created on first use, so that it belongs to the running event loop
+_SEARCH_INDEX_LOCK: asyncio.Lock | None = None
+
+
+def _normalize(text: str) -> str:
+    """Lowercase text and strip accents so "Zürich" matches "zurich"."""
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(char for char in decomposed if not unicodedata.combining(char)).lower()
+
+
+def tokenize(text: str | None) -> list[str]:
+    """Split text into normalized search tokens."""
+    if not text:
+        return []
+    return _TOKEN_RE.findall(_normalize(text))
+
+
+class AirportSearchIndex:
+    """Prefix and token index over ICAO, IATA, name and city.
+
+    The distinct tokens are kept in one sorted array, which works as a
+    flattened prefix trie: every token starting with a prefix sits in one
+    contiguous range found with a binary search. Each token maps to an
+    inverted list of the airports containing it, and each airport keeps its
+    own tokens so that broad terms only need checking against the
+    candidates left by the most selective term.
+    """
+
+    def __init__(self, airports: Mapping[str, dict[str, Any]]) -> None:
+        """Build the index from the airport database."""
+        self._icaos: list[str] = []
+        self._airport_tokens: list[tuple[tuple[str, int], ...]] = []
+        postings: dict[str, dict[int, int]] = {}
+
+        for position, icao in enumerate(airports):
+            airport = airports[icao]
+            self._icaos.append(icao)
+            fields = (
+                (WEIGHT_ICAO, [icao.lower()]),
+                (WEIGHT_IATA, tokenize(airport.get("iata"))),
+                (WEIGHT_CITY, tokenize(airport.get("city"))),
+                (WEIGHT_NAME, tokenize(airport.get("name"))),
+            )
+            own: dict[str, int] = {}
+            for weight, tokens in fields:
+                for token in tokens:
+                    if own.get(token, 0) < weight:
+                        own[token] = weight
+            for token, weight in own.items():
+                postings.setdefault(token, {})[position] = weight
+            self._airport_tokens.append(tuple(own.items()))
+
+        self._tokens = sorted(postings)
+        self._postings = [tuple(postings[token].items()) for token in self._tokens]
+
+    def __len__(self) -> int:
+        """Return the number of indexed airports."""
+        return len(self._icaos)
+
+    def _prefix_range(self, term: str) -> range:
+        """Return the positions of the tokens starting with a term."""
+        start = bisect_left(self._tokens, term)
+        # Tokens are [a-z0-9], and "{" sorts right after "z"
+        return range(start, bisect_left(self._tokens, term + "{", start))
+
+    def _selectivity(self, tokens: range) -> tuple[int, int]:
+        """Return a sort key putting the narrowest token ranges first."""
+        if len(tokens) > MAX_PREFIX_TOKENS:
+            return (1, len(tokens))
+        return (0, sum(len(self._postings[index]) for index in tokens))
+
+    def _match_term(self, term: str, tokens: range) -> dict[int, int]:
+        """Return the best score per airport for tokens starting with a term."""
+        scores: dict[int, int] = {}
+        for index in tokens:
+            bonus = EXACT_BONUS if self._tokens[index] == term else 0
+            for position, weight in self._postings[index]:
+                score = weight + bonus
+                if scores.get(position, 0) < score:
+                    scores[position] = score
+        return scores
+
+    def _score_airport(self, position: int, term: str) -> int:
+        """Return an airport's best score for a term, or 0 if it does not match."""
+        best = 0
+        for token, weight in self._airport_tokens[position]:
+            if token.startswith(term):
+                score = weight + (EXACT_BONUS if token == term else 0)
+                if score > best:
+                    best = score
+        return best
+
+    def search(self, query: str, limit: int = 10) -> list[str]:
+        """Return the ICAO codes best matching every term of a query."""
+        terms = set(tokenize(query))
+        if not terms:
+            return []
+
+        # Expand the most selective term through the inverted index ...
+        ranges = {term: self._prefix_range(term) for term in terms}
+        first = min(terms, key=lambda term: (self._selectivity(ranges[term]), term))
+        totals = self._match_term(first, ranges[first])
+
+        # ... and check the remaining terms against each candidate's own tokens
+        for term in terms - {first}:
+            if not totals:
+                return []
+            narrowed: dict[int, int] = {}
+            for position, total in totals.items():
+                score = self._score_airport(position, term)
+                if score:
+                    narrowed[position] = total + score
+            totals = narrowed
+
+        best = heapq.nsmallest(limit, totals.items(), key=lambda item: (-item[1], self._icaos[item[0]]))
+        return [self._icaos[position] for position, _ in best]
+
+
+async def async_get_search_index() -> AirportSearchIndex:
+    """Return the shared search index, building it on first use."""
+    global _SEARCH_INDEX, _SEARCH_INDEX_LOCK
+
+    if _SEARCH_INDEX is not None:
+        return _SEARCH_INDEX
+
+    if _SEARCH_INDEX_LOCK is None:
+        _SEARCH_INDEX_LOCK = asyncio.Lock()
+    async with _SEARCH_INDEX_LOCK:
+        if _SEARCH_INDEX is None:
+            airports = await load_airports()
+            # Building touches every airport record, keep it off the event loop
+            _SEARCH_INDEX = await asyncio.to_thread(AirportSearchIndex, airports)
+            _LOGGER.debug("Built airport search index for %d airports", len(_SEARCH_INDEX))
+    return _SEARCH_INDEX
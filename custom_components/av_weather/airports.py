@@ -2,19 +2,133 @@
 import asyncio
 import json
 import logging
+import mmap
+import struct
+from collections.abc import Iterator, Mapping
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
 _LOGGER = logging.getLogger(__name__)
 
-_AIRPORTS_CACHE: dict[str, dict[str, Any]] | None = None
-
+AIRPORTS_DB_FILE = Path(__file__).parent / "airports.bin"
+AIRPORTS_JSON_FILE = Path(__file__).parent / "airports.json"
+
+# Binary layout written by scripts/build_airport_db.py:
+#   header  magic, version, record count, offset of the string table
+#   index   record count x 4-byte ICAO codes, sorted
+#   records iata, name/city/country string offsets, lat, lon, elevation (ft)
+#   strings deduplicated NUL-terminated UTF-8 strings
+DB_MAGIC = b"AVAP"
+DB_VERSION = 1
+HEADER = struct.Struct("<4sHxxII")
+RECORD = struct.Struct("<3sxIIIffi")
+ICAO_SIZE = 4
+
+_AIRPORTS_CACHE: Mapping[str, dict[str, Any]] | None = None
+
+
+class AirportDatabase(Mapping[str, dict[str, Any]]):
+    """Read-only view over the memory-mapped compact airport table.
+
+    Lookups binary-search the sorted ICAO index and only decode the record
+    that was asked for. Strings are shared in the file and decoded once.
+    """
+
+    def __init__(self, buffer: mmap.mmap | bytes) -> None:
+        """Initialize the database from the raw table."""
+        magic, version, count, strings_offset = HEADER.unpack_from(buffer, 0)
+        if magic != DB_MAGIC or version != DB_VERSION:
+            raise ValueError(f"Unsupported airport database (magic {magic!r}, version {version})")
+        self._buffer = buffer
+        self._count = count
+        self._index_offset = HEADER.size
+        self._records_offset = self._index_offset + count * ICAO_SIZE
+        self._strings_offset = strings_offset
+        self._string = lru_cache(maxsize=None)(self._decode_string)
+
+    def _icao_at(self, position: int) -> bytes:
+        """Return the ICAO code stored at a position of the index."""
+        start = self._index_offset + position * ICAO_SIZE
+        return self._buffer[start:start + ICAO_SIZE]
+
+    def _find(self, icao: str) -> int | None:
+        """Binary-search the index for an ICAO code."""
+        try:
+            key = icao.upper().encode("ascii")
+        except UnicodeEncodeError:
+            return None
+        if len(key) != ICAO_SIZE:
+            return None
+
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._icao_at(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self._count and self._icao_at(low) == key:
+            return low
+        return None
+
+    def _decode_string(self, offset: int) -> str:
+        """Decode a NUL-terminated string from the string table."""
+        start = self._strings_offset + offset
+        end = self._buffer.find(b"\0", start)
+        return self._buffer[start:end].decode("utf-8")
+
+    def _record(self, position: int) -> dict[str, Any]:
+        """Decode the record at a position of the index."""
+        iata, name, city, country, lat, lon, elevation = RECORD.unpack_from(
+            self._buffer, self._records_offset + position * RECORD.size
+        )
+        return {
+            "icao": self._icao_at(position).decode("ascii"),
+            "iata": iata.rstrip(b"\0 ").decode("ascii"),
+            "name": self._string(name),
+            "city": self._string(city),
+            "country": self._string(country),
+            "lat": round(lat, 4),
+            "lon": round(lon, 4),
+            "elevation": elevation,
+        }
+
+    def __getitem__(self, icao: str) -> dict[str, Any]:
+        """Return the airport with the given ICAO code."""
+        position = self._find(icao)
+        if position is None:
+            raise KeyError(icao)
+        return self._record(position)
+
+    def __contains__(self, icao: object) -> bool:
+        """Return True if the ICAO code exists without decoding its record."""
+        return isinstance(icao, str) and self._find(icao) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the ICAO codes in sorted order."""
+        for position in range(self._count):
+            yield self._icao_at(position).decode("ascii")
+
+    def __len__(self) -> int:
+        """Return the number of airports."""
+        return self._count
+
+
+def _load_airports_sync() -> Mapping[str, dict[str, Any]]:
+    """Load airport data, preferring the compact table over airports.json (synchronous)."""
+    try:
+        with open(AIRPORTS_DB_FILE, "rb") as f:
+            database = AirportDatabase(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+            _LOGGER.debug("Mapped %d airports from %s", len(database), AIRPORTS_DB_FILE.name)
+            return database
+    except FileNotFoundError:
+        _LOGGER.debug("%s not found, falling back to airports.json", AIRPORTS_DB_FILE.name)
+    except (OSError, ValueError, struct.error) as err:
+        _LOGGER.error("Failed to open %s, falling back to airports.json: %s", AIRPORTS_DB_FILE.name, err)
 
-def _load_airports_sync() -> dict[str, dict[str, Any]]:
-    """Load airport data from airports.json file (synchronous)."""
     try:
-        airports_file = Path(__file__).parent / "airports.json"
-        with open(airports_file, "r", encoding="utf-8") as f:
+        with open(AIRPORTS_JSON_FILE, "r", encoding="utf-8") as f:
             data = json.load(f)
             _LOGGER.debug("Loaded %d airports from airports.json", len(data))
             return data
@@ -29,8 +143,8 @@ def _load_airports_sync() -> dict[str, dict[str, Any]]:
         return {}
 
 
-async def load_airports() -> dict[str, dict[str, Any]]:
-    """Load airport data from airports.json file."""
+async def load_airports() -> Mapping[str, dict[str, Any]]:
+    """Load airport data."""
     global _AIRPORTS_CACHE
     
     if _AIRPORTS_CACHE is not None:
@@ -49,10 +163,8 @@ async def get_airport_by_icao(icao: str) -> dict[str, Any] | None:
 
 async def validate_icao_code(icao: str) -> bool:
     """Validate that an ICAO code exists in the airport database."""
-    return await get_airport_by_icao(icao) is not None
-
-
-
+    airports = await load_airports()
+    return icao.upper() in airports
 
 
 async def format_airport_label(icao: str, airport_data: dict[str, Any] | None = None) -> str:
@@ -86,6 +198,3 @@ async def format_airport_label(icao: str, airport_data: dict[str, Any] | None =
         label_parts.append(" - ".join(location_parts))
     
     return " - ".join(label_parts)
-
-
-
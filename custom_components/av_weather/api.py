@@ -1,48 +1,352 @@
-"""API client for AviationWeather.gov."""
+"""API client for AviationWeather.gov.
+
+Responses are cached with their ETag/Last-Modified validators. When a
+response has not changed (HTTP 304, or an identical body) the previously
+decoded list is returned as-is, so callers can skip unchanged data cheaply.
+
+Concurrent requests for a feed are coalesced into batches of ids= requests,
+fetched concurrently through a token bucket limiter. Throttled and transient
+failures pause the limiter and are retried before AviationWeatherApiError
+is raised, so callers can keep their last good data.
+
+Every batch updates an in-memory report cache. With ``use_cache=True``,
+reports past the feed's soft TTL are returned right away and refreshed in
+the background for the listeners. Feeds with more than
+BULK_STATION_THRESHOLD stations are read from the gzipped bulk cache file
+instead, parsed as it streams in.
+"""
 import asyncio
+import hashlib
 import logging
-from typing import Any
+import time
+import zlib
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Iterable
+from typing import TypeVar
+from xml.etree.ElementTree import ParseError
 
 import aiohttp
 from aiohttp.client_exceptions import ClientConnectorError, ClientError
 
-from .const import METAR_API_URL, TAF_API_URL, CUSTOM_USER_AGENT
+from .const import (
+    METAR_API_URL,
+    TAF_API_URL,
+    METAR_CACHE_URL,
+    TAF_CACHE_URL,
+    CUSTOM_USER_AGENT,
+    FEED_METAR,
+    FEED_TAF,
+    MAX_IDS_PER_REQUEST,
+    REQUEST_GATHER_WINDOW,
+    MAX_CONCURRENT_REQUESTS,
+    REQUEST_TIMEOUT,
+    BULK_REQUEST_TIMEOUT,
+    RATE_LIMIT_PER_MINUTE,
+    RATE_LIMIT_BURST,
+    BACKOFF_BASE,
+    BACKOFF_MAX,
+    MAX_FETCH_ATTEMPTS,
+    BULK_STATION_THRESHOLD,
+    BULK_CHUNK_SIZE,
+    RESPONSE_CHUNK_SIZE,
+    METAR_CACHE_TTL,
+    TAF_CACHE_TTL,
+    CACHE_MAX_ENTRIES,
+    RESPONSE_CACHE_MAX_ENTRIES,
+)
+from .bulk import CacheFileReader, MetarCsvParser, TafXmlParser
+from .cache import ReportCache
+from .flight_category import fill_flight_categories
+from .jsonstream import JsonArrayParser
+from .metrics import ApiMetrics, RequestTiming
+from .models import REPORT_TYPES, MetarReport, Report, TafReport
+from .ratelimit import TokenBucketLimiter, parse_retry_after
 
 _LOGGER = logging.getLogger(__name__)
 
+FEED_URLS = {
+    FEED_METAR: METAR_API_URL,
+    FEED_TAF: TAF_API_URL,
+}
+
+CACHE_URLS = {
+    FEED_METAR: METAR_CACHE_URL,
+    FEED_TAF: TAF_CACHE_URL,
+}
+
+CACHE_TTLS = {
+    FEED_METAR: METAR_CACHE_TTL,
+    FEED_TAF: TAF_CACHE_TTL,
+}
+
+CACHE_PARSERS = {
+    FEED_METAR: MetarCsvParser,
+    FEED_TAF: TafXmlParser,
+}
+
+RESPONSE_TYPES = {FEED_URLS[feed]: model for feed, model in REPORT_TYPES.items()}
+FEEDS_BY_URL = {url: feed for feed, url in FEED_URLS.items()}
+
+_T = TypeVar("_T")
+
+
+class AviationWeatherApiError(Exception):
+    """Raised when stations could not be fetched from the API.
+
+    ``data`` holds the reports of any chunks that did succeed and
+    ``failed_stations`` the stations whose last good data should be kept.
+    """
+
+    def __init__(
+        self,
+        message: str,
+        data: dict[str, Report] | None = None,
+        failed_stations: set[str] | None = None,
+    ) -> None:
+        """Initialize the error."""
+        super().__init__(message)
+        self.data = data or {}
+        self.failed_stations = failed_stations or set()
+
+
+class _RetryableError(Exception):
+    """A throttled or transient failure that is worth retrying."""
+
+    def __init__(self, message: str, retry_after: float | None = None) -> None:
+        """Initialize the error."""
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def chunk_station_ids(icao_codes: Iterable[str], size: int = MAX_IDS_PER_REQUEST) -> list[str]:
+    """Split station IDs into comma-separated chunks for the ids= parameter."""
+    codes = sorted({code.strip().upper() for code in icao_codes if code.strip()})
+    return [",".join(codes[i:i + size]) for i in range(0, len(codes), size)]
+
+
+def index_by_station(reports: Iterable[Report]) -> dict[str, Report]:
+    """Index reports by station, keeping only the newest report of each station."""
+    indexed: dict[str, Report] = {}
+    for report in reports:
+        if not report.station:
+            continue
+        current = indexed.get(report.station)
+        if current is None or report.sort_key > current.sort_key:
+            indexed[report.station] = report
+    return indexed
+
+
+def _decode_records(model: type[MetarReport] | type[TafReport], records: Iterable[dict]) -> list[Report]:
+    """Decode parsed records into reports, computing missing METAR flight categories."""
+    data = [model.from_dict(record) for record in records]
+    if model is MetarReport:
+        data = fill_flight_categories(data)
+    return data
+
+
+class _CachedResponse:
+    """Validators and decoded body of the last successful response for a request."""
+
+    __slots__ = ("etag", "last_modified", "digest", "data")
+
+    def __init__(self, etag: str | None, last_modified: str | None, digest: str, data: list[Report]):
+        """Initialize the cached response."""
+        self.etag = etag
+        self.last_modified = last_modified
+        self.digest = digest
+        self.data = data
+
+
+class _Flight:
+    """A batched request for one feed, shared by every caller that joined it."""
+
+    __slots__ = ("stations", "task")
+
+    def __init__(self) -> None:
+        """Initialize an empty flight."""
+        self.stations: set[str] = set()
+        self.task: asyncio.Task[dict[str, Report]] | None = None
+
+
 class AviationWeatherApi:
-    """API client for fetching METAR and TAF data."""
+    """API client for fetching METAR and TAF data.
+
+    Reports are returned decoded and indexed by station. ``cache_urls``
+    overrides the bulk cache file locations, e.g. to point at a local
+    stand-in, and ``max_concurrency`` caps the requests open at once.
+    """
 
-    def __init__(self, session: aiohttp.ClientSession):
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        cache_urls: dict[str, str] | None = None,
+        max_concurrency: int = MAX_CONCURRENT_REQUESTS,
+    ):
         """Initialize the API client."""
         self._session = session
+        self._cache_urls = {**CACHE_URLS, **(cache_urls or {})}
+        self._responses: OrderedDict[tuple[str, str], _CachedResponse] = OrderedDict()
+        self._gathering: dict[str, _Flight] = {}
+        self._in_flight: dict[str, list[_Flight]] = {}
+        self._tasks: set[asyncio.Task] = set()
+        self._requests = asyncio.Semaphore(max_concurrency)
+        self._cache = ReportCache(CACHE_TTLS, CACHE_MAX_ENTRIES)
+        self._revalidating: dict[str, set[str]] = {}
+        self._listeners: list[Callable[[str, dict[str, Report]], None]] = []
+        self.metrics = ApiMetrics()
+        self._limiter = TokenBucketLimiter(
+            rate=RATE_LIMIT_PER_MINUTE / 60,
+            burst=RATE_LIMIT_BURST,
+            backoff_base=BACKOFF_BASE,
+            backoff_max=BACKOFF_MAX,
+        )
+
+    async def _async_fetch_data(self, url: str, icao_codes: str, bbox: str | None = None) -> list[Report]:
+        """Fetch data from the AviationWeather API, retrying throttled requests.
+
+        Stations are selected by the comma-separated ``icao_codes``, or by an
+        area when ``bbox`` ("minLat,minLon,maxLat,maxLon") is given, in which
+        case ``icao_codes`` only describes the request in log messages.
+        """
+        return await self._async_with_retries(
+            f"{icao_codes} from {url}",
+            lambda: self._async_fetch_once(url, icao_codes, bbox),
+        )
+
+    async def _async_with_retries(
+        self,
+        description: str,
+        fetch: Callable[[], Awaitable[_T]],
+    ) -> _T:
+        """Run a request through the rate limiter and concurrency cap, retrying throttled attempts."""
+        for attempt in range(1, MAX_FETCH_ATTEMPTS + 1):
+            try:
+                # Wait for the limiter, and any backoff, before taking a request slot
+                await self._limiter.async_acquire()
+                async with self._requests:
+                    data = await fetch()
+            except _RetryableError as err:
+                if attempt == MAX_FETCH_ATTEMPTS:
+                    # No retry follows, so leave the shared limiter out of backoff
+                    raise AviationWeatherApiError(f"Giving up fetching data for {description}: {err}") from err
+                delay = self._limiter.penalize(err.retry_after)
+                _LOGGER.warning(
+                    "%s for %s (attempt %d of %d), backing off for %.0f seconds",
+                    err,
+                    description,
+                    attempt,
+                    MAX_FETCH_ATTEMPTS,
+                    delay,
+                )
+                continue
+            self._limiter.reset()
+            return data
+
+    def _cached_response(self, key: tuple[str, str]) -> _CachedResponse | None:
+        """Return the last response to a request, marking it recently used."""
+        cached = self._responses.get(key)
+        if cached is not None:
+            self._responses.move_to_end(key)
+        return cached
+
+    def _store_response(self, key: tuple[str, str], response: _CachedResponse) -> None:
+        """Keep a response for conditional requests, evicting the least recently used.
 
-    async def _async_fetch_data(self, url: str, icao_codes: str) -> list[dict[str, Any]]:
-        """Fetch data from the AviationWeather API."""
+        The station sets of coalesced batches and cache misses vary from one
+        request to the next, so the number of kept responses is capped.
+        """
+        self._responses[key] = response
+        self._responses.move_to_end(key)
+        while len(self._responses) > RESPONSE_CACHE_MAX_ENTRIES:
+            self._responses.popitem(last=False)
+
+    def _record(self, timing: RequestTiming) -> None:
+        """Count a finished request and log its timing at debug level."""
+        self.metrics.record(timing)
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug(
+                "%s request to %s: status %s, %d bytes, %s records in %.0f ms (parsing %.1f ms)%s",
+                timing.feed_type,
+                timing.url,
+                timing.status,
+                timing.bytes,
+                timing.records,
+                timing.elapsed_ms,
+                timing.parse_ms,
+                ", timed out" if timing.timed_out else "",
+            )
+
+    async def _async_fetch_once(self, url: str, icao_codes: str, bbox: str | None = None) -> list[Report]:
+        """Send a single request to the AviationWeather API."""
         headers = {"User-Agent": CUSTOM_USER_AGENT}
-        params = {"ids": icao_codes, "format": "json"}
+        if bbox is not None:
+            params = {"bbox": bbox, "format": "json"}
+            key = (url, f"bbox={bbox}")
+            wanted = None
+        else:
+            params = {"ids": icao_codes, "format": "json"}
+            key = (url, icao_codes)
+            wanted = {code.strip() for code in icao_codes.split(",")}
+        cached = self._cached_response(key)
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
         
+        timing = RequestTiming(FEEDS_BY_URL[url], url)
+        start = time.perf_counter()
         try:
-            async with self._session.get(url, headers=headers, params=params, timeout=aiohttp.ClientTimeout(total=15)) as response:
+            async with self._session.get(url, headers=headers, params=params, timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)) as response:
+                timing.status = response.status
+                if response.status == 304 and cached is not None:
+                    _LOGGER.debug("Data unchanged for %s (HTTP 304)", icao_codes)
+                    return cached.data
+
                 if response.status == 200:
-                    data = await response.json()
-                    if not isinstance(data, list):
-                        _LOGGER.error("API response is not a list: %s", data)
-                        return []
-                    
+                    model = RESPONSE_TYPES[url]
+                    parser = JsonArrayParser(wanted, model.API_FIELDS)
+                    digest = hashlib.sha256()
+                    records: list[dict] = []
+                    async for chunk in response.content.iter_chunked(RESPONSE_CHUNK_SIZE):
+                        timing.bytes += len(chunk)
+                        digest.update(chunk)
+                        parse_start = time.perf_counter()
+                        records.extend(parser.feed(chunk))
+                        timing.parse_ms += (time.perf_counter() - parse_start) * 1000
+                    parse_start = time.perf_counter()
+                    records.extend(parser.close())
+                    timing.parse_ms += (time.perf_counter() - parse_start) * 1000
+                    timing.records = len(records)
+
+                    digest_hex = digest.hexdigest()
+                    if cached is not None and cached.digest == digest_hex:
+                        _LOGGER.debug("Data unchanged for %s (identical body)", icao_codes)
+                        cached.etag = response.headers.get("ETag")
+                        cached.last_modified = response.headers.get("Last-Modified")
+                        return cached.data
+
+                    # Reports are only decoded once the body is known to have changed
+                    parse_start = time.perf_counter()
+                    data = _decode_records(model, records)
+                    timing.parse_ms += (time.perf_counter() - parse_start) * 1000
+
                     # Log which stations returned data
-                    station_ids = [item.get("icaoId", "UNKNOWN") for item in data]
-                    requested_stations = [code.strip() for code in icao_codes.split(",")]
-                    missing_stations = set(requested_stations) - set(station_ids)
-                    
+                    missing_stations = (wanted or set()) - parser.seen
                     if missing_stations:
                         _LOGGER.info(
                             "No data available for stations: %s (may not exist or no current reports)",
-                            ", ".join(missing_stations)
+                            ", ".join(sorted(missing_stations))
                         )
-                    
+
+                    self._store_response(key, _CachedResponse(
+                        response.headers.get("ETag"),
+                        response.headers.get("Last-Modified"),
+                        digest_hex,
+                        data,
+                    ))
                     return data
-                    
+
                 if response.status == 204:
                     _LOGGER.info("No data available for ICAO codes: %s (HTTP 204)", icao_codes)
                     return []
@@ -58,37 +362,331 @@ class AviationWeatherApi:
                     return []
                     
                 if response.status == 429:
-                    _LOGGER.warning("Rate limit exceeded. Please increase your update intervals.")
-                    return []
+                    raise _RetryableError(
+                        "Rate limit exceeded",
+                        parse_retry_after(response.headers.get("Retry-After")),
+                    )
+
+                if response.status >= 500:
+                    raise _RetryableError(
+                        f"Server error {response.status}",
+                        parse_retry_after(response.headers.get("Retry-After")),
+                    )
                 
-                _LOGGER.error(
-                    "Failed to fetch data from %s for %s. Status: %d, Response: %s",
-                    url,
-                    icao_codes,
-                    response.status,
-                    await response.text(),
+                raise AviationWeatherApiError(
+                    f"Failed to fetch data from {url} for {icao_codes}. "
+                    f"Status: {response.status}, Response: {await response.text()}"
                 )
-                return []
                 
-        except asyncio.TimeoutError:
-            _LOGGER.error("Timeout while fetching data for %s from %s", icao_codes, url)
-            return []
+        except asyncio.TimeoutError as err:
+            timing.timed_out = True
+            raise _RetryableError(f"Timeout while fetching data from {url}") from err
         except ClientConnectorError as err:
-            _LOGGER.error("Connection error while fetching data for %s: %s", icao_codes, err)
-            return []
+            raise _RetryableError(f"Connection error: {err}") from err
         except ClientError as err:
-            _LOGGER.error("Client error while fetching data for %s: %s", icao_codes, err)
-            return []
-        except Exception as err:
-            _LOGGER.exception("Unexpected error fetching data for %s from %s", icao_codes, url)
-            return []
+            raise AviationWeatherApiError(f"Client error while fetching data for {icao_codes}: {err}") from err
+        except ValueError as err:
+            raise AviationWeatherApiError(f"Invalid JSON received for {icao_codes} from {url}: {err}") from err
+        finally:
+            timing.elapsed_ms = (time.perf_counter() - start) * 1000
+            self._record(timing)
 
-    async def async_get_metar_data(self, icao_codes: str) -> list[dict[str, Any]]:
+    async def async_get_metar_data(self, icao_codes: str) -> list[Report]:
         """Fetch METAR data for given ICAO codes."""
         _LOGGER.debug("Fetching METAR data for: %s", icao_codes)
         return await self._async_fetch_data(METAR_API_URL, icao_codes)
 
-    async def async_get_taf_data(self, icao_codes: str) -> list[dict[str, Any]]:
+    async def async_get_taf_data(self, icao_codes: str) -> list[Report]:
         """Fetch TAF data for given ICAO codes."""
         _LOGGER.debug("Fetching TAF data for: %s", icao_codes)
         return await self._async_fetch_data(TAF_API_URL, icao_codes)
+
+    async def async_get_area_data(
+        self,
+        feed_type: str,
+        min_lat: float,
+        min_lon: float,
+        max_lat: float,
+        max_lon: float,
+    ) -> dict[str, Report]:
+        """Fetch every station inside a bounding box with one area request.
+
+        Returns the newest report of each station, indexed by ICAO code.
+        """
+        bbox = f"{min_lat:.4f},{min_lon:.4f},{max_lat:.4f},{max_lon:.4f}"
+        _LOGGER.debug("Fetching %s data for area: %s", feed_type, bbox)
+        data = await self._async_fetch_data(FEED_URLS[feed_type], f"area {bbox}", bbox)
+        return index_by_station(data)
+
+    @property
+    def cache_stats(self) -> dict[str, int]:
+        """Return the report cache's entry count and hit, stale hit and miss counts."""
+        return self._cache.stats
+
+    def async_add_listener(self, listener: Callable[[str, dict[str, Report]], None]) -> Callable[[], None]:
+        """Call ``listener(feed_type, reports)`` with reports fetched outside a caller's request.
+
+        These are the reports of every background revalidation, and of each
+        chunk of a multi-chunk batch as soon as it arrives.
+        """
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    def _async_notify_listeners(self, feed_type: str, reports: dict[str, Report]) -> None:
+        """Hand reports to every listener, so that a failing one cannot break a fetch."""
+        for listener in list(self._listeners):
+            try:
+                listener(feed_type, reports)
+            except Exception:
+                _LOGGER.exception("Error in %s report listener", feed_type)
+
+    async def async_get_data(
+        self,
+        feed_type: str,
+        icao_codes: Iterable[str],
+        use_cache: bool = False,
+    ) -> dict[str, Report]:
+        """Fetch data for many stations, coalescing concurrent requests per feed.
+
+        Returns the newest report of each requested station, indexed by ICAO
+        code. With ``use_cache`` cached reports are returned without waiting
+        for the API, and stale ones are revalidated in the background.
+        """
+        stations = {code.strip().upper() for code in icao_codes if code.strip()}
+        if not stations:
+            return {}
+        if not use_cache:
+            return await self._async_request(feed_type, stations)
+
+        lookup = self._cache.lookup(feed_type, stations)
+        if lookup.stale:
+            self._async_revalidate(feed_type, lookup.stale)
+        if not lookup.missing:
+            return lookup.reports
+
+        try:
+            fetched = await self._async_request(feed_type, lookup.missing)
+        except AviationWeatherApiError as err:
+            raise AviationWeatherApiError(str(err), {**lookup.reports, **err.data}, err.failed_stations) from err
+        return {**lookup.reports, **fetched}
+
+    def _async_revalidate(self, feed_type: str, stations: set[str]) -> None:
+        """Fetch stale stations in the background, unless they are already being fetched."""
+        revalidating = self._revalidating.setdefault(feed_type, set())
+        stations = stations - revalidating
+        if not stations:
+            return
+        revalidating |= stations
+        _LOGGER.debug("Revalidating stale %s data for: %s", feed_type, ", ".join(sorted(stations)))
+        task = asyncio.create_task(self._async_revalidate_stations(feed_type, stations))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _async_revalidate_stations(self, feed_type: str, stations: set[str]) -> None:
+        """Fetch stale stations and hand the fresh reports to the listeners."""
+        try:
+            data = await self._async_request(feed_type, stations)
+        except AviationWeatherApiError as err:
+            _LOGGER.debug("Revalidating %s data failed: %s", feed_type, err)
+            data = err.data
+        finally:
+            self._revalidating[feed_type] -= stations
+
+        if data:
+            self._async_notify_listeners(feed_type, data)
+
+    async def _async_request(self, feed_type: str, stations: set[str]) -> dict[str, Report]:
+        """Fetch stations through a shared batched request of their feed."""
+        flight = next(
+            (flight for flight in self._in_flight.get(feed_type, []) if stations <= flight.stations),
+            None,
+        )
+        if flight is None:
+            flight = self._gathering.get(feed_type)
+            if flight is None:
+                flight = _Flight()
+                self._gathering[feed_type] = flight
+                flight.task = asyncio.create_task(self._async_fly(feed_type, flight))
+                self._tasks.add(flight.task)
+                flight.task.add_done_callback(self._tasks.discard)
+            flight.stations |= stations
+        else:
+            _LOGGER.debug("Joining in-flight %s request for: %s", feed_type, ", ".join(sorted(stations)))
+
+        # Shield the shared request so one cancelled caller does not cancel it for all
+        try:
+            data = await asyncio.shield(flight.task)
+        except AviationWeatherApiError as err:
+            raise AviationWeatherApiError(
+                str(err),
+                {station: err.data[station] for station in stations if station in err.data},
+                stations & err.failed_stations,
+            ) from err
+        return {station: data[station] for station in stations if station in data}
+
+    async def async_shutdown(self) -> None:
+        """Cancel every request still running, e.g. when the integration unloads."""
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._gathering.clear()
+        self._in_flight.clear()
+        self._revalidating.clear()
+        self._cache.clear()
+
+    async def _async_fly(self, feed_type: str, flight: _Flight) -> dict[str, Report]:
+        """Wait for the gathering window to close, then fetch every joined station."""
+        await asyncio.sleep(REQUEST_GATHER_WINDOW)
+        if self._gathering.get(feed_type) is flight:
+            del self._gathering[feed_type]
+
+        in_flight = self._in_flight.setdefault(feed_type, [])
+        in_flight.append(flight)
+        try:
+            data = await self._async_fetch_stations(feed_type, flight.stations)
+        except AviationWeatherApiError as err:
+            self._cache.store(feed_type, flight.stations - err.failed_stations, err.data)
+            raise
+        finally:
+            in_flight.remove(flight)
+
+        self._cache.store(feed_type, flight.stations, data)
+        return data
+
+    async def _async_fetch_stations(self, feed_type: str, stations: set[str]) -> dict[str, Report]:
+        """Fetch stations using chunked multi-ID requests and index the results."""
+        if len(stations) > BULK_STATION_THRESHOLD:
+            return await self._async_fetch_bulk(feed_type, stations)
+
+        url = FEED_URLS[feed_type]
+        chunks = chunk_station_ids(stations)
+        results: dict[str, Report] = {}
+        failed: set[str] = set()
+
+        async def _async_fetch_chunk(chunk: str) -> None:
+            """Fetch one chunk, recording its stations as failed on error."""
+            _LOGGER.debug("Fetching %s data for: %s", feed_type, chunk)
+            try:
+                reports = index_by_station(await self._async_fetch_data(url, chunk))
+            except AviationWeatherApiError as err:
+                _LOGGER.error("Error fetching %s data: %s", feed_type, err)
+                failed.update(chunk.split(","))
+                return
+            results.update(reports)
+            # Deliver each chunk as it arrives rather than after the slowest one
+            if len(chunks) > 1 and reports:
+                self._async_notify_listeners(feed_type, reports)
+
+        # Chunks hold disjoint stations, so they are fetched side by side
+        async with asyncio.TaskGroup() as group:
+            for chunk in chunks:
+                group.create_task(_async_fetch_chunk(chunk))
+
+        if failed:
+            raise AviationWeatherApiError(
+                f"Failed to fetch {feed_type} data for {len(failed)} station(s)",
+                results,
+                failed,
+            )
+        return results
+
+    async def _async_fetch_bulk(self, feed_type: str, stations: set[str]) -> dict[str, Report]:
+        """Read stations from the feed's bulk cache file and index the results."""
+        url = self._cache_urls[feed_type]
+        _LOGGER.debug("Fetching %s data for %d stations from %s", feed_type, len(stations), url)
+        try:
+            data = await self._async_with_retries(
+                url,
+                lambda: self._async_fetch_bulk_once(url, feed_type, stations),
+            )
+        except AviationWeatherApiError as err:
+            raise AviationWeatherApiError(str(err), {}, set(stations)) from err
+        return index_by_station(data)
+
+    async def _async_fetch_bulk_once(
+        self,
+        url: str,
+        feed_type: str,
+        stations: set[str],
+    ) -> list[Report]:
+        """Stream, decompress and parse a bulk cache file in a single pass."""
+        headers = {"User-Agent": CUSTOM_USER_AGENT}
+        # The extracted reports depend on the stations, so cache per station set
+        key = (url, hashlib.sha256(",".join(sorted(stations)).encode()).hexdigest())
+        cached = self._cached_response(key)
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+
+        timing = RequestTiming(feed_type, url)
+        start = time.perf_counter()
+        try:
+            async with self._session.get(
+                url, headers=headers, auto_decompress=False, timeout=aiohttp.ClientTimeout(total=BULK_REQUEST_TIMEOUT)
+            ) as response:
+                timing.status = response.status
+                if response.status == 304 and cached is not None:
+                    _LOGGER.debug("Bulk %s data unchanged (HTTP 304)", feed_type)
+                    return cached.data
+
+                if response.status == 429 or response.status >= 500:
+                    raise _RetryableError(
+                        f"Bulk cache file error {response.status}",
+                        parse_retry_after(response.headers.get("Retry-After")),
+                    )
+
+                if response.status != 200:
+                    raise AviationWeatherApiError(
+                        f"Failed to fetch bulk cache file {url}. Status: {response.status}"
+                    )
+
+                model = REPORT_TYPES[feed_type]
+                reader = CacheFileReader(CACHE_PARSERS[feed_type](stations))
+                digest = hashlib.sha256()
+                records: list[dict] = []
+                async for chunk in response.content.iter_chunked(BULK_CHUNK_SIZE):
+                    timing.bytes += len(chunk)
+                    digest.update(chunk)
+                    parse_start = time.perf_counter()
+                    records.extend(reader.feed(chunk))
+                    timing.parse_ms += (time.perf_counter() - parse_start) * 1000
+                parse_start = time.perf_counter()
+                records.extend(reader.close())
+                timing.parse_ms += (time.perf_counter() - parse_start) * 1000
+                timing.records = len(records)
+
+                digest_hex = digest.hexdigest()
+                if cached is not None and cached.digest == digest_hex:
+                    _LOGGER.debug("Bulk %s data unchanged (identical body)", feed_type)
+                    cached.etag = response.headers.get("ETag")
+                    cached.last_modified = response.headers.get("Last-Modified")
+                    return cached.data
+
+                parse_start = time.perf_counter()
+                data = _decode_records(model, records)
+                timing.parse_ms += (time.perf_counter() - parse_start) * 1000
+
+                _LOGGER.debug("Extracted %d %s reports from %s", len(data), feed_type, url)
+                self._store_response(key, _CachedResponse(
+                    response.headers.get("ETag"),
+                    response.headers.get("Last-Modified"),
+                    digest_hex,
+                    data,
+                ))
+                return data
+
+        except asyncio.TimeoutError as err:
+            timing.timed_out = True
+            raise _RetryableError(f"Timeout while fetching {url}") from err
+        except ClientConnectorError as err:
+            raise _RetryableError(f"Connection error: {err}") from err
+        except ClientError as err:
+            raise AviationWeatherApiError(f"Client error while fetching {url}: {err}") from err
+        except (zlib.error, ParseError) as err:
+            raise AviationWeatherApiError(f"Invalid bulk cache file received from {url}: {err}") from err
+        finally:
+            timing.elapsed_ms = (time.perf_counter() - start) * 1000
+            self._record(timing)
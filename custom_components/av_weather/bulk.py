@@ -0,0 +1,249 @@
+"""Streaming ingestion of the AviationWeather.gov bulk cache files.
+
+The cache files hold every current METAR (CSV) or TAF (XML) in one gzipped
+download. The parsers here are fed raw gzip chunks as they arrive, keep only
+the wanted stations, and emit records shaped like the JSON API's, so the
+rest of the integration cannot tell where a report came from.
+"""
+import csv
+import zlib
+from collections.abc import Iterable, Iterator
+from datetime import datetime
+from typing import Any
+from xml.etree.ElementTree import Element, XMLPullParser
+
+HPA_PER_INHG = 33.8639
+
+# Columns of the METAR cache CSV that are repeated for each cloud layer
+_CLOUD_COVER = "sky_cover"
+_CLOUD_BASE = "cloud_base_ft_agl"
+
+
+def _number(value: str | None) -> float | int | None:
+    """Convert a cache field to int or float, or None when empty."""
+    if value is None or value == "":
+        return None
+    try:
+        number = float(value)
+    except ValueError:
+        return None
+    return int(number) if number.is_integer() else number
+
+
+def _epoch(value: str | None) -> int | None:
+    """Convert an ISO 8601 cache timestamp to a Unix timestamp."""
+    if not value:
+        return None
+    try:
+        return int(datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp())
+    except ValueError:
+        return None
+
+
+def _visibility(value: str | None) -> str | float | int | None:
+    """Keep "10+" style visibilities as the JSON API reports them."""
+    if value and value.endswith("+"):
+        return value
+    return _number(value)
+
+
+def _wind_direction(value: str | None) -> str | int | float | None:
+    """Keep variable winds ("VRB") as the JSON API reports them."""
+    if value == "VRB":
+        return value
+    return _number(value)
+
+
+class GzipStream:
+    """Incrementally decompress a gzip stream fed in arbitrary chunks."""
+
+    def __init__(self) -> None:
+        """Initialize the decompressor."""
+        self._decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+
+    def feed(self, chunk: bytes) -> bytes:
+        """Decompress a chunk of the gzip stream."""
+        return self._decompressor.decompress(chunk)
+
+    def close(self) -> bytes:
+        """Flush any remaining decompressed data."""
+        return self._decompressor.flush()
+
+
+class MetarCsvParser:
+    """Incremental parser for metars.cache.csv.
+
+    Lines are split as data arrives; the station column is checked before a
+    line is parsed as CSV, so unwanted stations cost a single split.
+    """
+
+    def __init__(self, stations: set[str] | None = None) -> None:
+        """Initialize the parser, keeping only ``stations`` when given."""
+        self._stations = stations
+        self._header: list[str] | None = None
+        self._pending = b""
+
+    def feed(self, data: bytes) -> list[dict[str, Any]]:
+        """Parse the complete lines in a chunk of decompressed CSV."""
+        lines = (self._pending + data).split(b"\n")
+        self._pending = lines.pop()
+        return [record for line in lines if (record := self._parse_line(line)) is not None]
+
+    def close(self) -> list[dict[str, Any]]:
+        """Parse whatever is left after the last newline."""
+        line, self._pending = self._pending, b""
+        record = self._parse_line(line)
+        return [record] if record is not None else []
+
+    def _parse_line(self, raw: bytes) -> dict[str, Any] | None:
+        """Parse one CSV line into a record, or None if it is skipped."""
+        line = raw.decode("utf-8", "replace").rstrip("\r")
+        if self._header is None:
+            # The file may start with a few status lines before the header
+            if line.startswith("raw_text,"):
+                self._header = next(csv.reader([line]))
+            return None
+
+        parts = line.split(",", 2)
+        if len(parts) < 3:
+            return None
+        if self._stations is not None and parts[1] not in self._stations:
+            return None
+        return self._record(next(csv.reader([line])))
+
+    def _record(self, row: list[str]) -> dict[str, Any]:
+        """Map a CSV row to the JSON API's field names."""
+        fields: dict[str, str] = {}
+        clouds: list[dict[str, Any]] = []
+        cover: str | None = None
+        for name, value in zip(self._header, row):
+            if name == _CLOUD_COVER:
+                cover = value
+            elif name == _CLOUD_BASE:
+                if cover:
+                    clouds.append({"cover": cover, "base": _number(value)})
+                cover = None
+            else:
+                fields[name] = value
+
+        altimeter = _number(fields.get("altim_in_hg"))
+        return {
+            "icaoId": fields.get("station_id"),
+            "rawOb": fields.get("raw_text"),
+            # The cache file has no nominal report time; identity and issuance
+            # scheduling use obsTime, which both feeds agree on
+            "reportTime": fields.get("observation_time"),
+            "obsTime": _epoch(fields.get("observation_time")),
+            "metarType": fields.get("metar_type") or "METAR",
+            "temp": _number(fields.get("temp_c")),
+            "dewp": _number(fields.get("dewpoint_c")),
+            "wdir": _wind_direction(fields.get("wind_dir_degrees")),
+            "wspd": _number(fields.get("wind_speed_kt")),
+            "wgst": _number(fields.get("wind_gust_kt")),
+            "visib": _visibility(fields.get("visibility_statute_mi")),
+            # The JSON API reports the altimeter setting in hectopascals
+            "altim": round(altimeter * HPA_PER_INHG, 1) if altimeter is not None else None,
+            "slp": _number(fields.get("sea_level_pressure_mb")),
+            "wxString": fields.get("wx_string") or None,
+            "clouds": clouds,
+            "fltCat": fields.get("flight_category") or None,
+            "lat": _number(fields.get("latitude")),
+            "lon": _number(fields.get("longitude")),
+            "elev": _number(fields.get("elevation_m")),
+        }
+
+
+class TafXmlParser:
+    """Incremental parser for tafs.cache.xml.
+
+    Each <TAF> element is mapped and then cleared as soon as it is complete,
+    so only one forecast is held in memory at a time.
+    """
+
+    def __init__(self, stations: set[str] | None = None) -> None:
+        """Initialize the parser, keeping only ``stations`` when given."""
+        self._stations = stations
+        self._parser = XMLPullParser(events=("end",))
+
+    def feed(self, data: bytes) -> list[dict[str, Any]]:
+        """Parse a chunk of decompressed XML."""
+        self._parser.feed(data)
+        return self._drain()
+
+    def close(self) -> list[dict[str, Any]]:
+        """Finish parsing."""
+        self._parser.close()
+        return self._drain()
+
+    def _drain(self) -> list[dict[str, Any]]:
+        """Collect the TAF elements completed so far."""
+        records = []
+        for _, element in self._parser.read_events():
+            if element.tag != "TAF":
+                continue
+            station = element.findtext("station_id")
+            if self._stations is None or station in self._stations:
+                records.append(self._record(element))
+            element.clear()
+        return records
+
+    @staticmethod
+    def _record(element: Element) -> dict[str, Any]:
+        """Map a <TAF> element to the JSON API's field names."""
+        forecasts = []
+        for forecast in element.iter("forecast"):
+            forecasts.append({
+                "timeFrom": _epoch(forecast.findtext("fcst_time_from")),
+                "timeTo": _epoch(forecast.findtext("fcst_time_to")),
+                "fcstChange": forecast.findtext("change_indicator"),
+                "probability": _number(forecast.findtext("probability")),
+                "wdir": _wind_direction(forecast.findtext("wind_dir_degrees")),
+                "wspd": _number(forecast.findtext("wind_speed_kt")),
+                "wgst": _number(forecast.findtext("wind_gust_kt")),
+                "visib": _visibility(forecast.findtext("visibility_statute_mi")),
+                "wxString": forecast.findtext("wx_string"),
+                "clouds": [
+                    {"cover": sky.get("sky_cover"), "base": _number(sky.get("cloud_base_ft_agl"))}
+                    for sky in forecast.iter("sky_condition")
+                ],
+            })
+
+        return {
+            "icaoId": element.findtext("station_id"),
+            "rawTAF": element.findtext("raw_text"),
+            "issueTime": element.findtext("issue_time"),
+            "validTimeFrom": _epoch(element.findtext("valid_time_from")),
+            "validTimeTo": _epoch(element.findtext("valid_time_to")),
+            "lat": _number(element.findtext("latitude")),
+            "lon": _number(element.findtext("longitude")),
+            "elev": _number(element.findtext("elevation_m")),
+            "fcsts": forecasts,
+        }
+
+
+class CacheFileReader:
+    """Decompress and parse a bulk cache file fed in arbitrary gzip chunks."""
+
+    def __init__(self, parser: MetarCsvParser | TafXmlParser) -> None:
+        """Initialize the reader around a parser."""
+        self._stream = GzipStream()
+        self._parser = parser
+
+    def feed(self, chunk: bytes) -> list[dict[str, Any]]:
+        """Return the records the parser keeps from a chunk of the download."""
+        return self._parser.feed(self._stream.feed(chunk))
+
+    def close(self) -> list[dict[str, Any]]:
+        """Return the records left once the download is complete."""
+        return self._parser.feed(self._stream.close()) + self._parser.close()
+
+
+def iter_cache_records(
+    chunks: Iterable[bytes],
+    parser: MetarCsvParser | TafXmlParser,
+) -> Iterator[dict[str, Any]]:
+    """Decompress gzip chunks and yield the records the parser keeps."""
+    reader = CacheFileReader(parser)
+    for chunk in chunks:
+        yield from reader.feed(chunk)
+    yield from reader.close()
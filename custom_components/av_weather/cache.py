@@ -0,0 +1,102 @@
+"""In-memory report cache for Av Weather."""
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass, field
+from typing import Any
+
+from .models import Report
+
+
+@dataclass(slots=True)
+class CacheLookup:
+    """Result of looking up stations in the cache.
+
+    ``reports`` holds every cached report, fresh or stale. ``stale`` lists
+    the stations past their soft TTL, which are worth revalidating, and
+    ``missing`` those that must be fetched before they can be answered.
+    """
+
+    reports: dict[str, Report] = field(default_factory=dict)
+    stale: set[str] = field(default_factory=set)
+    missing: set[str] = field(default_factory=set)
+
+
+class ReportCache:
+    """LRU cache of the latest report of each station, per feed.
+
+    Each feed has a soft and a hard TTL in seconds. Entries younger than the
+    soft TTL are fresh. Entries past it are still answered, but flagged
+    stale so the caller can refresh them in the background. Entries past the
+    hard TTL are not answered at all. Stations known to have no current
+    report are cached too, so asking for them again does not go upstream.
+    The least recently used entries are evicted once ``max_entries`` is
+    reached.
+    """
+
+    def __init__(
+        self,
+        ttls: Mapping[str, tuple[float, float]],
+        max_entries: int,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the cache with (soft, hard) TTLs per feed."""
+        self._ttls = dict(ttls)
+        self._max_entries = max_entries
+        self._clock = clock
+        self._entries: OrderedDict[tuple[str, str], tuple[Report | None, float]] = OrderedDict()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        """Return the number of cached stations."""
+        return len(self._entries)
+
+    def lookup(self, feed_type: str, stations: Iterable[str]) -> CacheLookup:
+        """Look up stations, counting hits, stale hits and misses."""
+        soft_ttl, hard_ttl = self._ttls[feed_type]
+        now = self._clock()
+        result = CacheLookup()
+        for station in stations:
+            key = (feed_type, station)
+            entry = self._entries.get(key)
+            if entry is None or now - entry[1] > hard_ttl:
+                self.misses += 1
+                result.missing.add(station)
+                continue
+
+            self._entries.move_to_end(key)
+            report, stored = entry
+            if now - stored > soft_ttl:
+                self.stale_hits += 1
+                result.stale.add(station)
+            else:
+                self.hits += 1
+            if report is not None:
+                result.reports[station] = report
+        return result
+
+    def store(self, feed_type: str, stations: Iterable[str], reports: Mapping[str, Report]) -> None:
+        """Cache the outcome of fetching stations; those without a report are cached as such."""
+        now = self._clock()
+        for station in stations:
+            key = (feed_type, station)
+            self._entries[key] = (reports.get(station), now)
+            self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._entries.clear()
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        """Return the entry count and the hit, stale hit and miss counts."""
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+        }
@@ -1,22 +1,44 @@
 """Config flow for Av Weather integration."""
 import logging
+from dataclasses import asdict
 from typing import Any
 
 import voluptuous as vol
 
 from homeassistant import config_entries
+from homeassistant.const import CONF_LATITUDE, CONF_LOCATION, CONF_LONGITUDE, CONF_NAME, CONF_RADIUS
 from homeassistant.core import callback
 from homeassistant.helpers import selector
 import homeassistant.helpers.config_validation as cv
 
 from .const import (
     DOMAIN,
+    CONF_ENTRY_TYPE,
     CONF_ICAO_CODES,
     CONF_FEEDS,
+    CONF_QUERY,
+    CONF_REGION,
+    CONF_METAR_INTERVAL,
+    CONF_TAF_INTERVAL,
+    CONF_ADAPTIVE_POLLING,
+    CONF_CUSTOM_MINIMA,
+    CONF_MINIMA,
+    CONF_RUNWAYS,
+    DEFAULT_METAR_INTERVAL,
+    DEFAULT_TAF_INTERVAL,
+    DEFAULT_ADAPTIVE_POLLING,
+    DEFAULT_REGION_RADIUS_KM,
+    ENTRY_TYPE_REGION,
     FEED_METAR,
     FEED_TAF,
+    SEARCH_RESULT_LIMIT,
+    NEARBY_RADIUS_KM,
 )
 from .airports import validate_icao_code, format_airport_label
+from .flight_category import DEFAULT_MINIMA, minima_from_config
+from .airport_search import async_get_search_index
+from .derived import parse_runways
+from .geo import async_get_geo_index
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -51,52 +73,104 @@ async def validate_icao_codes(value: Any) -> str:
     return ",".join(sorted(list(set(codes))))
 
 
+def _feeds_selector() -> selector.SelectSelector:
+    """Return the selector used to choose the METAR/TAF feeds."""
+    return selector.SelectSelector(
+        selector.SelectSelectorConfig(
+            options=[
+                selector.SelectOptionDict(value=FEED_METAR, label="METAR (Current Conditions)"),
+                selector.SelectOptionDict(value=FEED_TAF, label="TAF (Forecast)"),
+            ],
+            multiple=True,
+            mode=selector.SelectSelectorMode.LIST,
+        )
+    )
+
+
+async def _async_airport_picker_schema(
+    icao_codes: list[str],
+    distances: dict[str, float] | None = None,
+) -> vol.Schema:
+    """Return a form schema to pick airports from a list and choose feeds."""
+    options = []
+    for icao in icao_codes:
+        label = await format_airport_label(icao)
+        if distances is not None:
+            label = f"{label} ({distances[icao]:.0f} km)"
+        options.append(selector.SelectOptionDict(value=icao, label=label))
+
+    return vol.Schema({
+        vol.Required(CONF_ICAO_CODES): selector.SelectSelector(
+            selector.SelectSelectorConfig(
+                options=options,
+                multiple=True,
+                mode=selector.SelectSelectorMode.LIST,
+            )
+        ),
+        vol.Required(CONF_FEEDS, default=[FEED_METAR, FEED_TAF]): _feeds_selector(),
+    })
+
+
 class AvWeatherConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Av Weather."""
 
     VERSION = 1
 
+    def __init__(self) -> None:
+        """Initialize the config flow."""
+        self._search_results: list[str] = []
+
     async def async_step_user(self, user_input: dict[str, Any] | None = None) -> config_entries.ConfigFlowResult:
         """Handle the initial step."""
+        return self.async_show_menu(
+            step_id="user",
+            menu_options=["manual", "search", "nearby", "region"],
+        )
+
+    async def _async_create_airport_entries(self, codes_list: list[str], feeds: list[str]) -> config_entries.ConfigFlowResult:
+        """Create one entry per airport; all but the first go through the import flow."""
+        # Create a separate entry for each airport after the first one
+        for icao_code in codes_list[1:]:  # Skip the first airport
+            # Check if this airport is already configured
+            for entry in self._async_current_entries():
+                if entry.data.get(CONF_ICAO_CODES) == icao_code:
+                    _LOGGER.warning("Airport %s is already configured, skipping", icao_code)
+                    continue
+            
+            # Create entry for this airport
+            self.hass.async_create_task(
+                self.hass.config_entries.flow.async_init(
+                    DOMAIN,
+                    context={"source": "import"},
+                    data={
+                        CONF_ICAO_CODES: icao_code,
+                        CONF_FEEDS: feeds,
+                    },
+                )
+            )
+        
+        # Create entry for the first airport and return
+        # (the others will be created via the import flow)
+        first_code = codes_list[0]
+        title = await format_airport_label(first_code)
+        return self.async_create_entry(
+            title=title,
+            data={
+                CONF_ICAO_CODES: first_code,
+                CONF_FEEDS: feeds,
+            }
+        )
+
+    async def async_step_manual(self, user_input: dict[str, Any] | None = None) -> config_entries.ConfigFlowResult:
+        """Handle entering ICAO codes directly."""
         errors: dict[str, str] = {}
 
         if user_input is not None:
             try:
                 # Validate and process ICAO codes
                 validated_icao_codes = await validate_icao_codes(user_input[CONF_ICAO_CODES])
-                codes_list = validated_icao_codes.split(",")
-                
-                # Create a separate entry for each airport after the first one
-                for icao_code in codes_list[1:]:  # Skip the first airport
-                    # Check if this airport is already configured
-                    for entry in self._async_current_entries():
-                        if entry.data.get(CONF_ICAO_CODES) == icao_code:
-                            _LOGGER.warning("Airport %s is already configured, skipping", icao_code)
-                            continue
-                    
-                    # Create entry for this airport
-                    title = await format_airport_label(icao_code)
-                    self.hass.async_create_task(
-                        self.hass.config_entries.flow.async_init(
-                            DOMAIN,
-                            context={"source": "import"},
-                            data={
-                                CONF_ICAO_CODES: icao_code,
-                                CONF_FEEDS: user_input[CONF_FEEDS],
-                            },
-                        )
-                    )
-                
-                # Create entry for the first airport and return
-                # (the others will be created via the import flow)
-                first_code = codes_list[0]
-                title = await format_airport_label(first_code)
-                return self.async_create_entry(
-                    title=title,
-                    data={
-                        CONF_ICAO_CODES: first_code,
-                        CONF_FEEDS: user_input[CONF_FEEDS],
-                    }
+                return await self._async_create_airport_entries(
+                    validated_icao_codes.split(","), user_input[CONF_FEEDS]
                 )
             except vol.Invalid as err:
                 errors["base"] = str(err)
@@ -105,31 +179,137 @@ class AvWeatherConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 errors["base"] = "An unknown error occurred."
 
 
-        # Schema for the user form
+        # Schema for the manual entry form
         data_schema = vol.Schema({
             vol.Required(CONF_ICAO_CODES): selector.TextSelector(
                 selector.TextSelectorConfig(
                     multiline=False,
                 )
             ),
-            vol.Required(CONF_FEEDS, default=[FEED_METAR, FEED_TAF]): selector.SelectSelector(
-                selector.SelectSelectorConfig(
-                    options=[
-                        selector.SelectOptionDict(value=FEED_METAR, label="METAR (Current Conditions)"),
-                        selector.SelectOptionDict(value=FEED_TAF, label="TAF (Forecast)"),
-                    ],
-                    multiple=True,
-                    mode=selector.SelectSelectorMode.LIST,
-                )
-            ),
+            vol.Required(CONF_FEEDS, default=[FEED_METAR, FEED_TAF]): _feeds_selector(),
         })
         
         return self.async_show_form(
-            step_id="user", 
+            step_id="manual", 
             data_schema=data_schema, 
             errors=errors,
         )
 
+    async def async_step_search(self, user_input: dict[str, Any] | None = None) -> config_entries.ConfigFlowResult:
+        """Search airports by ICAO, IATA, name or city."""
+        errors: dict[str, str] = {}
+
+        if user_input is not None:
+            index = await async_get_search_index()
+            self._search_results = index.search(user_input[CONF_QUERY], limit=SEARCH_RESULT_LIMIT)
+            if self._search_results:
+                return await self.async_step_search_results()
+            errors["base"] = "no_airports_found"
+
+        data_schema = vol.Schema({
+            vol.Required(CONF_QUERY): selector.TextSelector(
+                selector.TextSelectorConfig(
+                    multiline=False,
+                )
+            ),
+        })
+
+        return self.async_show_form(
+            step_id="search",
+            data_schema=data_schema,
+            errors=errors,
+        )
+
+    async def async_step_search_results(self, user_input: dict[str, Any] | None = None) -> config_entries.ConfigFlowResult:
+        """Pick airports from the search results."""
+        errors: dict[str, str] = {}
+
+        if user_input is not None:
+            if user_input[CONF_ICAO_CODES]:
+                return await self._async_create_airport_entries(
+                    sorted(user_input[CONF_ICAO_CODES]), user_input[CONF_FEEDS]
+                )
+            errors["base"] = "no_airports_selected"
+
+        data_schema = await _async_airport_picker_schema(self._search_results)
+
+        return self.async_show_form(
+            step_id="search_results",
+            data_schema=data_schema,
+            errors=errors,
+        )
+
+    async def async_step_nearby(self, user_input: dict[str, Any] | None = None) -> config_entries.ConfigFlowResult:
+        """Pick from the airports nearest the Home Assistant home location."""
+        errors: dict[str, str] = {}
+
+        if user_input is not None:
+            if user_input[CONF_ICAO_CODES]:
+                return await self._async_create_airport_entries(
+                    sorted(user_input[CONF_ICAO_CODES]), user_input[CONF_FEEDS]
+                )
+            errors["base"] = "no_airports_selected"
+
+        index = await async_get_geo_index()
+        nearby = index.nearest(
+            self.hass.config.latitude,
+            self.hass.config.longitude,
+            SEARCH_RESULT_LIMIT,
+            NEARBY_RADIUS_KM,
+        )
+        if not nearby:
+            return self.async_abort(reason="no_airports_nearby")
+
+        return self.async_show_form(
+            step_id="nearby",
+            data_schema=await _async_airport_picker_schema(
+                [icao for icao, _ in nearby], dict(nearby)
+            ),
+            errors=errors,
+        )
+
+    async def async_step_region(self, user_input: dict[str, Any] | None = None) -> config_entries.ConfigFlowResult:
+        """Monitor every reporting station inside a region."""
+        if user_input is not None:
+            location = user_input[CONF_LOCATION]
+            region = {
+                CONF_LATITUDE: location[CONF_LATITUDE],
+                CONF_LONGITUDE: location[CONF_LONGITUDE],
+                # The location selector reports the radius in metres
+                CONF_RADIUS: round(location.get(CONF_RADIUS, DEFAULT_REGION_RADIUS_KM * 1000) / 1000, 1),
+            }
+            await self.async_set_unique_id(
+                f"region_{region[CONF_LATITUDE]:.3f}_{region[CONF_LONGITUDE]:.3f}_{region[CONF_RADIUS]:.0f}"
+            )
+            self._abort_if_unique_id_configured()
+            return self.async_create_entry(
+                title=user_input[CONF_NAME],
+                data={
+                    CONF_ENTRY_TYPE: ENTRY_TYPE_REGION,
+                    CONF_NAME: user_input[CONF_NAME],
+                    CONF_REGION: region,
+                    CONF_FEEDS: user_input[CONF_FEEDS],
+                },
+            )
+
+        data_schema = vol.Schema({
+            vol.Required(CONF_NAME, default=self.hass.config.location_name): selector.TextSelector(),
+            vol.Required(
+                CONF_LOCATION,
+                default={
+                    CONF_LATITUDE: self.hass.config.latitude,
+                    CONF_LONGITUDE: self.hass.config.longitude,
+                    CONF_RADIUS: DEFAULT_REGION_RADIUS_KM * 1000,
+                },
+            ): selector.LocationSelector(selector.LocationSelectorConfig(radius=True)),
+            vol.Required(CONF_FEEDS, default=[FEED_METAR]): _feeds_selector(),
+        })
+
+        return self.async_show_form(
+            step_id="region",
+            data_schema=data_schema,
+        )
+
     async def async_step_import(self, import_data: dict[str, Any]) -> config_entries.ConfigFlowResult:
         """Handle import of additional airports."""
         icao_code = import_data[CONF_ICAO_CODES]
@@ -157,37 +337,126 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
     def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
         """Initialize options flow."""
         self.config_entry = config_entry
+        self._data: dict[str, Any] = {}
 
     async def async_step_init(self, user_input: dict[str, Any] | None = None) -> config_entries.ConfigFlowResult:
         """Manage the options."""
         errors: dict[str, str] = {}
 
+        is_region = self.config_entry.data.get(CONF_ENTRY_TYPE) == ENTRY_TYPE_REGION
+
         if user_input is not None:
+            runways = user_input.get(CONF_RUNWAYS, "").strip()
+            try:
+                parse_runways(runways)
+            except ValueError:
+                errors[CONF_RUNWAYS] = "invalid_runways"
+
+        if user_input is not None and not errors:
             # Update the config entry's data (not options)
-            self.hass.config_entries.async_update_entry(
-                self.config_entry,
-                data={
-                    CONF_ICAO_CODES: self.config_entry.data[CONF_ICAO_CODES],
-                    CONF_FEEDS: user_input[CONF_FEEDS],
-                },
-            )
-            return self.async_create_entry(title="", data={})
+            self._data = {
+                **self.config_entry.data,
+                CONF_FEEDS: user_input[CONF_FEEDS],
+                CONF_METAR_INTERVAL: int(user_input[CONF_METAR_INTERVAL]),
+                CONF_TAF_INTERVAL: int(user_input[CONF_TAF_INTERVAL]),
+                CONF_ADAPTIVE_POLLING: user_input[CONF_ADAPTIVE_POLLING],
+            }
+            if not is_region:
+                self._data[CONF_RUNWAYS] = runways
+            if user_input[CONF_CUSTOM_MINIMA]:
+                return await self.async_step_minima()
+
+            self._data.pop(CONF_MINIMA, None)
+            return self._async_save()
 
         options_schema = vol.Schema({
-            vol.Required(CONF_FEEDS, default=self.config_entry.data.get(CONF_FEEDS, [FEED_METAR, FEED_TAF])): selector.SelectSelector(
-                selector.SelectSelectorConfig(
-                    options=[
-                        selector.SelectOptionDict(value=FEED_METAR, label="METAR (Current Conditions)"),
-                        selector.SelectOptionDict(value=FEED_TAF, label="TAF (Forecast)"),
-                    ],
-                    multiple=True,
-                    mode=selector.SelectSelectorMode.LIST,
+            vol.Required(CONF_FEEDS, default=self.config_entry.data.get(CONF_FEEDS, [FEED_METAR, FEED_TAF])): _feeds_selector(),
+            vol.Required(CONF_METAR_INTERVAL, default=self.config_entry.data.get(CONF_METAR_INTERVAL, DEFAULT_METAR_INTERVAL)): selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    min=0,
+                    max=1440,
+                    step=1,
+                    unit_of_measurement="min",
+                    mode=selector.NumberSelectorMode.BOX,
                 )
             ),
+            vol.Required(CONF_TAF_INTERVAL, default=self.config_entry.data.get(CONF_TAF_INTERVAL, DEFAULT_TAF_INTERVAL)): selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    min=0,
+                    max=1440,
+                    step=1,
+                    unit_of_measurement="min",
+                    mode=selector.NumberSelectorMode.BOX,
+                )
+            ),
+            vol.Required(CONF_ADAPTIVE_POLLING, default=self.config_entry.data.get(CONF_ADAPTIVE_POLLING, DEFAULT_ADAPTIVE_POLLING)): selector.BooleanSelector(),
+            vol.Required(CONF_CUSTOM_MINIMA, default=bool(self.config_entry.data.get(CONF_MINIMA))): selector.BooleanSelector(),
         })
+        if not is_region:
+            options_schema = options_schema.extend({
+                vol.Optional(
+                    CONF_RUNWAYS,
+                    description={"suggested_value": self.config_entry.data.get(CONF_RUNWAYS, "")},
+                ): selector.TextSelector(selector.TextSelectorConfig(multiline=True)),
+            })
 
         return self.async_show_form(
             step_id="init", 
             data_schema=options_schema, 
             errors=errors,
         )
+
+    async def async_step_minima(self, user_input: dict[str, Any] | None = None) -> config_entries.ConfigFlowResult:
+        """Set custom ceiling and visibility minima for an extra flight category."""
+        errors: dict[str, str] = {}
+
+        if user_input is not None:
+            minima = minima_from_config(user_input)
+            if not (
+                minima.lifr_ceiling <= minima.ifr_ceiling <= minima.mvfr_ceiling
+                and minima.lifr_visibility <= minima.ifr_visibility <= minima.mvfr_visibility
+            ):
+                errors["base"] = "invalid_minima"
+            else:
+                self._data[CONF_MINIMA] = asdict(minima)
+                return self._async_save()
+
+        current = minima_from_config(self.config_entry.data.get(CONF_MINIMA)) or DEFAULT_MINIMA
+        ceiling = selector.NumberSelector(
+            selector.NumberSelectorConfig(
+                min=0,
+                max=20000,
+                step=100,
+                unit_of_measurement="ft",
+                mode=selector.NumberSelectorMode.BOX,
+            )
+        )
+        visibility = selector.NumberSelector(
+            selector.NumberSelectorConfig(
+                min=0,
+                max=10,
+                step=0.25,
+                unit_of_measurement="sm",
+                mode=selector.NumberSelectorMode.BOX,
+            )
+        )
+        minima_schema = vol.Schema({
+            vol.Required("mvfr_ceiling", default=current.mvfr_ceiling): ceiling,
+            vol.Required("mvfr_visibility", default=current.mvfr_visibility): visibility,
+            vol.Required("ifr_ceiling", default=current.ifr_ceiling): ceiling,
+            vol.Required("ifr_visibility", default=current.ifr_visibility): visibility,
+            vol.Required("lifr_ceiling", default=current.lifr_ceiling): ceiling,
+            vol.Required("lifr_visibility", default=current.lifr_visibility): visibility,
+        })
+
+        return self.async_show_form(
+            step_id="minima",
+            data_schema=minima_schema,
+            errors=errors,
+        )
+
+    @callback
+    def _async_save(self) -> config_entries.ConfigFlowResult:
+        """Store the updated settings in the config entry."""
+        self.hass.config_entries.async_update_entry(self.config_entry, data=self._data)
+        return self.async_create_entry(title="", data={})
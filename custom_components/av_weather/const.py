@@ -6,20 +6,110 @@ DOMAIN = "av_weather"
 METAR_API_URL = "https://aviationweather.gov/api/data/metar"
 TAF_API_URL = "https://aviationweather.gov/api/data/taf"
 
+# Bulk cache files holding every current report of a feed
+METAR_CACHE_URL = "https://aviationweather.gov/data/cache/metars.cache.csv.gz"
+TAF_CACHE_URL = "https://aviationweather.gov/data/cache/tafs.cache.xml.gz"
+
 # Configuration keys
+CONF_ENTRY_TYPE = "entry_type"
 CONF_ICAO_CODES = "icao_codes"
 CONF_FEEDS = "feeds"
+CONF_METAR_INTERVAL = "metar_interval"
+CONF_TAF_INTERVAL = "taf_interval"
+CONF_ADAPTIVE_POLLING = "adaptive_polling"
+CONF_CUSTOM_MINIMA = "custom_minima"
+CONF_MINIMA = "minima"
+CONF_RUNWAYS = "runways"
+CONF_QUERY = "query"
+CONF_REGION = "region"
+
+# Config entry types: a list of airports, or every station inside a region
+ENTRY_TYPE_AIRPORTS = "airports"
+ENTRY_TYPE_REGION = "region"
+
+# Maximum number of airports offered by the config flow search and discovery
+SEARCH_RESULT_LIMIT = 15
+
+# Radius of the "airports near me" discovery step in kilometres
+NEARBY_RADIUS_KM = 150
+
+# Default radius of a monitored region in kilometres
+DEFAULT_REGION_RADIUS_KM = 100
+
+# Default polling intervals in minutes (0 disables polling)
+DEFAULT_METAR_INTERVAL = 5
+DEFAULT_TAF_INTERVAL = 30
+DEFAULT_ADAPTIVE_POLLING = True
+
+# Adaptive polling: issuance cycle and polling window per feed, in minutes
+METAR_ISSUANCE_CYCLE = 60
+METAR_WINDOW_BEFORE = 2
+METAR_WINDOW_AFTER = 10
+METAR_FAST_INTERVAL = 1
+TAF_ISSUANCE_CYCLE = 360
+TAF_WINDOW_BEFORE = 10
+TAF_WINDOW_AFTER = 30
+TAF_FAST_INTERVAL = 5
 
 # Feed types
 FEED_METAR = "METAR"
 FEED_TAF = "TAF"
 
+# Report cache: (soft, hard) TTLs in seconds per feed, and the most stations kept
+METAR_CACHE_TTL = (120, 3600)
+TAF_CACHE_TTL = (600, 6 * 3600)
+CACHE_MAX_ENTRIES = 10000
+
+# Most requests whose validators and decoded body are kept for conditional requests
+RESPONSE_CACHE_MAX_ENTRIES = 128
+
+# Maximum number of station IDs sent in a single ids= request
+MAX_IDS_PER_REQUEST = 40
+
+# Bytes read at a time while a response is parsed
+RESPONSE_CHUNK_SIZE = 16 * 1024
+
+# Station count above which a feed is read from its bulk cache file instead
+BULK_STATION_THRESHOLD = 1000
+BULK_CHUNK_SIZE = 64 * 1024
+
+# Seconds to gather concurrent requests for a feed into one batched call
+REQUEST_GATHER_WINDOW = 0.05
+
+# Requests sent to the API at once, and the timeouts of a single request in seconds
+MAX_CONCURRENT_REQUESTS = 4
+REQUEST_TIMEOUT = 15
+BULK_REQUEST_TIMEOUT = 60
+
+# Rate limiting shared by every request to the API
+RATE_LIMIT_PER_MINUTE = 60
+RATE_LIMIT_BURST = 10
+BACKOFF_BASE = 5
+BACKOFF_MAX = 300
+MAX_FETCH_ATTEMPTS = 3
+
 # User-Agent for requests
 CUSTOM_USER_AGENT = "HomeAssistant-AviationWeather/1.0.0"
 
+# Persistent storage of the last known reports
+STORAGE_KEY = f"{DOMAIN}.reports"
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 30
+
+# Recent METAR history kept per station for trends, persisted separately
+HISTORY_STORAGE_KEY = f"{DOMAIN}.history"
+HISTORY_SIZE = 48
+HISTORY_HOURS = 12
+TREND_HOURS = 3
+
 # Sensor names
 METAR_SENSOR_NAME = "METAR"
 TAF_SENSOR_NAME = "TAF"
+TAF_CATEGORY_SENSOR_NAME = "Forecast Category"
+TAF_CHANGE_SENSOR_NAME = "Next Category Change"
+REGION_SENSOR_NAME = "Stations"
+API_SENSOR_NAME = "API Requests"
 
 # Service names
 SERVICE_UPDATE_WEATHER = "update_weather"
+SERVICE_FIND_NEARBY_STATIONS = "find_nearby_stations"
@@ -0,0 +1,395 @@
+"""Shared data update coordinators for Av Weather."""
+import asyncio
+import logging
+from datetime import timedelta
+
+from homeassistant.core import CALLBACK_TYPE, CoreState, HomeAssistant, callback
+from homeassistant.helpers.start import async_at_started
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
+
+from .api import AviationWeatherApi, AviationWeatherApiError
+from .const import (
+    DOMAIN,
+    FEED_METAR,
+    METAR_ISSUANCE_CYCLE,
+    METAR_WINDOW_BEFORE,
+    METAR_WINDOW_AFTER,
+    METAR_FAST_INTERVAL,
+    TAF_ISSUANCE_CYCLE,
+    TAF_WINDOW_BEFORE,
+    TAF_WINDOW_AFTER,
+    TAF_FAST_INTERVAL,
+)
+from .geo import bounding_box, haversine_km
+from .models import MetarReport, Report
+from .scheduler import IssuanceScheduler
+from .store import AvWeatherHistoryStore, AvWeatherReportStore
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _build_scheduler(feed_type: str) -> IssuanceScheduler:
+    """Create the issuance scheduler matching a feed's reporting cycle."""
+    if feed_type == FEED_METAR:
+        return IssuanceScheduler(
+            cycle=timedelta(minutes=METAR_ISSUANCE_CYCLE),
+            window_before=timedelta(minutes=METAR_WINDOW_BEFORE),
+            window_after=timedelta(minutes=METAR_WINDOW_AFTER),
+            fast_interval=timedelta(minutes=METAR_FAST_INTERVAL),
+        )
+    return IssuanceScheduler(
+        cycle=timedelta(minutes=TAF_ISSUANCE_CYCLE),
+        window_before=timedelta(minutes=TAF_WINDOW_BEFORE),
+        window_after=timedelta(minutes=TAF_WINDOW_AFTER),
+        fast_interval=timedelta(minutes=TAF_FAST_INTERVAL),
+    )
+
+
+class AvWeatherFeedCoordinator(DataUpdateCoordinator[dict[str, Report]]):
+    """Coordinate batched polling of one feed for every configured station.
+
+    A single coordinator per feed is shared by all config entries. Each entry
+    registers its stations and polling interval; the coordinator polls at the
+    shortest interval requested and fetches every station in one batch.
+
+    When adaptive polling is enabled the configured interval is only the
+    idle rate: the scheduler speeds up around each station's expected
+    issuance time and backs off once the fresh report has arrived.
+
+    The data is the newest decoded report of each station indexed by ICAO
+    code, and listeners are only notified when it differs from what the
+    sensors hold.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        api: AviationWeatherApi,
+        feed_type: str,
+        store: AvWeatherReportStore | None = None,
+        history: AvWeatherHistoryStore | None = None,
+    ) -> None:
+        """Initialize the coordinator."""
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=f"{DOMAIN} {feed_type}",
+            update_interval=None,
+            always_update=False,
+        )
+        self.api = api
+        self.feed_type = feed_type
+        self.data = {}
+        self._store = store
+        self.history = history
+        self._entry_stations: dict[str, set[str]] = {}
+        self._entry_intervals: dict[str, int] = {}
+        self._entry_adaptive: dict[str, bool] = {}
+        self._idle_interval: timedelta | None = None
+        self._scheduler = _build_scheduler(feed_type)
+        self._unsub_reports: CALLBACK_TYPE | None = api.async_add_listener(self._async_handle_reports)
+
+    @callback
+    def async_set_cached_data(self, reports: dict[str, Report]) -> None:
+        """Seed the data with reports restored from disk, without notifying listeners."""
+        if not self.data:
+            self.data = dict(reports)
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Persist changed data and record its history, then update all registered listeners."""
+        if self._store is not None and self.data is not None:
+            self._store.async_update(self.feed_type, self.data)
+        if self.history is not None and self.data:
+            self.history.async_add(self.data.values())
+        super().async_update_listeners()
+
+    @property
+    def stations(self) -> set[str]:
+        """Return every station registered by any config entry."""
+        stations: set[str] = set()
+        for entry_stations in self._entry_stations.values():
+            stations |= entry_stations
+        return stations
+
+    @property
+    def has_entries(self) -> bool:
+        """Return True while at least one config entry uses this feed."""
+        return bool(self._entry_stations)
+
+    @callback
+    def async_register_entry(
+        self,
+        entry_id: str,
+        stations: set[str],
+        interval_minutes: int,
+        adaptive: bool = False,
+    ) -> None:
+        """Register the stations and polling interval of a config entry."""
+        self._entry_stations[entry_id] = {code.upper() for code in stations}
+        self._entry_intervals[entry_id] = interval_minutes
+        self._entry_adaptive[entry_id] = adaptive
+        self._async_update_interval()
+
+    @callback
+    def async_unregister_entry(self, entry_id: str) -> None:
+        """Remove the stations of a config entry."""
+        removed = self._entry_stations.pop(entry_id, set())
+        self._entry_intervals.pop(entry_id, None)
+        self._entry_adaptive.pop(entry_id, None)
+        self._scheduler.forget(removed - self.stations)
+        self._async_update_interval()
+
+    @property
+    def adaptive(self) -> bool:
+        """Return True if any config entry asked for adaptive polling."""
+        return any(self._entry_adaptive.values())
+
+    @callback
+    def _async_update_interval(self) -> None:
+        """Poll at the shortest interval any entry asked for (0 disables polling)."""
+        intervals = [minutes for minutes in self._entry_intervals.values() if minutes > 0]
+        self._idle_interval = timedelta(minutes=min(intervals)) if intervals else None
+        self.update_interval = self._idle_interval
+
+    @callback
+    def _async_schedule_next_poll(self, data: dict[str, Report]) -> None:
+        """Learn issuance times from new data and plan the next poll."""
+        for station, report in data.items():
+            if not report.issued:
+                continue
+            issued_dt = dt_util.parse_datetime(report.issued)
+            if issued_dt is not None:
+                routine = not isinstance(report, MetarReport) or report.routine
+                self._scheduler.observe(station, issued_dt, routine)
+
+        if self._idle_interval is None or not self.adaptive:
+            return
+        self.update_interval = self._scheduler.next_delay(dt_util.utcnow(), self._idle_interval)
+        _LOGGER.debug("Next %s poll in %s", self.feed_type, self.update_interval)
+
+    async def _async_fetch(self, stations: set[str], use_cache: bool = False) -> dict[str, Report]:
+        """Fetch stations, keeping the last good report of any that failed."""
+        try:
+            return await self.api.async_get_data(self.feed_type, stations, use_cache)
+        except AviationWeatherApiError as err:
+            if not err.data:
+                raise UpdateFailed(str(err)) from err
+            _LOGGER.warning(
+                "%s; keeping last known data for %s",
+                err,
+                ", ".join(sorted(err.failed_stations)),
+            )
+            current = self.data or {}
+            data = {station: current[station] for station in err.failed_stations if station in current}
+            data.update(err.data)
+            return data
+
+    async def _async_update_data(self) -> dict[str, Report]:
+        """Fetch the feed for every registered station."""
+        stations = self.stations
+        if not stations:
+            return {}
+        data = await self._async_fetch(stations)
+        self._async_schedule_next_poll(data)
+        return data
+
+    async def async_refresh_stations(self, stations: set[str]) -> None:
+        """Fetch a subset of stations and merge the results into the shared data.
+
+        Unlike scheduled polls, these on-demand refreshes are answered from
+        the API's report cache when it holds the stations.
+        """
+        stations = {code.upper() for code in stations}
+        if not stations:
+            return
+
+        fresh = await self._async_fetch(stations, use_cache=True)
+        self._async_schedule_next_poll(fresh)
+
+        current = self.data or {}
+        previous = {station: current[station] for station in stations if station in current}
+        if fresh == previous:
+            # The API hands back the same decoded objects when nothing changed
+            _LOGGER.debug("%s data unchanged for %s", self.feed_type, ", ".join(sorted(stations)))
+            return
+
+        merged = {station: report for station, report in current.items() if station not in stations}
+        merged.update(fresh)
+        self.async_set_updated_data(merged)
+
+    @callback
+    def _async_handle_reports(self, feed_type: str, reports: dict[str, Report]) -> None:
+        """Merge reports the API fetched outside a refresh's result into the shared data.
+
+        These are background revalidations, and the chunks of a large batch
+        as each arrives, so sensors update before the slowest chunk is in.
+        """
+        if feed_type != self.feed_type:
+            return
+        current = self.data or {}
+        stations = self.stations
+        fresh = {
+            station: report
+            for station, report in reports.items()
+            if station in stations and current.get(station) is not report
+        }
+        if fresh:
+            self.async_set_updated_data({**current, **fresh})
+
+    async def async_shutdown(self) -> None:
+        """Stop listening for reports fetched by the API, then shut down."""
+        if self._unsub_reports is not None:
+            self._unsub_reports()
+            self._unsub_reports = None
+        await super().async_shutdown()
+
+
+class AvWeatherRegionCoordinator(DataUpdateCoordinator[dict[str, Report]]):
+    """Poll one feed for every station inside a region with a single area request.
+
+    The region is a circle; it is fetched with its bounding box and stations
+    outside the circle are dropped. The set of stations follows whatever the
+    area request returns, so stations appear and disappear as they report.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        api: AviationWeatherApi,
+        feed_type: str,
+        latitude: float,
+        longitude: float,
+        radius_km: float,
+        interval_minutes: int,
+    ) -> None:
+        """Initialize the coordinator."""
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=f"{DOMAIN} {feed_type} region {latitude:.2f},{longitude:.2f}",
+            update_interval=timedelta(minutes=interval_minutes) if interval_minutes > 0 else None,
+            always_update=False,
+        )
+        self.api = api
+        self.feed_type = feed_type
+        self.latitude = latitude
+        self.longitude = longitude
+        self.radius_km = radius_km
+        self.data = {}
+
+    async def _async_update_data(self) -> dict[str, Report]:
+        """Fetch every station in the region."""
+        try:
+            data = await self.api.async_get_area_data(
+                self.feed_type, *bounding_box(self.latitude, self.longitude, self.radius_km)
+            )
+        except AviationWeatherApiError as err:
+            raise UpdateFailed(str(err)) from err
+
+        return {
+            station: report
+            for station, report in data.items()
+            if report.latitude is None
+            or report.longitude is None
+            or haversine_km(self.latitude, self.longitude, report.latitude, report.longitude) <= self.radius_km
+        }
+
+
+class AvWeatherInitialRefresh:
+    """Make the first fetch of every config entry in one pass.
+
+    Entries queue their stations while they are set up. Once Home Assistant
+    has started, the queued stations are fetched with one batched request per
+    feed, however many entries asked for them, and queued region coordinators
+    are refreshed alongside. Entries set up later are fetched right away.
+    """
+
+    def __init__(self, hass: HomeAssistant, coordinators: dict[str, AvWeatherFeedCoordinator]) -> None:
+        """Initialize the initial refresh."""
+        self.hass = hass
+        self._coordinators = coordinators
+        self._stations: dict[str, set[str]] = {}
+        self._regions: list[AvWeatherRegionCoordinator] = []
+        self._unsub_started: CALLBACK_TYPE | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    @callback
+    def async_add_stations(self, feed_type: str, stations: set[str]) -> None:
+        """Queue the stations of an entry for the initial fetch of a feed."""
+        self._stations.setdefault(feed_type, set()).update(stations)
+        self._async_schedule()
+
+    @callback
+    def async_add_region(self, coordinator: AvWeatherRegionCoordinator) -> None:
+        """Queue a region coordinator for its initial refresh."""
+        self._regions.append(coordinator)
+        self._async_schedule()
+
+    @callback
+    def _async_schedule(self) -> None:
+        """Run the refresh once Home Assistant has started, unless already scheduled."""
+        if self._unsub_started is not None:
+            return
+        if self.hass.state is CoreState.running:
+            # async_at_started would run the refresh before returning its
+            # unsubscribe callback, so entries set up later are fetched here
+            self._async_started(self.hass)
+            return
+        self._unsub_started = async_at_started(self.hass, self._async_started)
+
+    @callback
+    def _async_started(self, hass: HomeAssistant) -> None:
+        """Start fetching everything queued so far."""
+        self._unsub_started = None
+        stations, self._stations = self._stations, {}
+        regions, self._regions = self._regions, []
+        task = hass.async_create_background_task(
+            self._async_refresh(stations, regions), f"{DOMAIN} initial refresh"
+        )
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _async_refresh(
+        self,
+        stations: dict[str, set[str]],
+        regions: list[AvWeatherRegionCoordinator],
+    ) -> None:
+        """Fetch the queued stations of every feed and the queued regions concurrently.
+
+        Errors are logged per feed and region, so one failing does not cancel
+        the others running in the same task group.
+        """
+        async def _async_refresh_feed(feed_type: str, feed_stations: set[str]) -> None:
+            """Fetch one feed, logging rather than raising its errors."""
+            _LOGGER.info("Fetching initial %s data for %d station(s)", feed_type, len(feed_stations))
+            try:
+                await self._coordinators[feed_type].async_refresh_stations(feed_stations)
+            except UpdateFailed as err:
+                _LOGGER.warning("Initial %s fetch failed: %s", feed_type, err)
+            except Exception:
+                _LOGGER.exception("Unexpected error during the initial %s fetch", feed_type)
+
+        async def _async_refresh_region(coordinator: AvWeatherRegionCoordinator) -> None:
+            """Refresh one region, logging rather than raising its errors."""
+            try:
+                await coordinator.async_refresh()
+            except Exception:
+                _LOGGER.exception("Unexpected error during the initial refresh of %s", coordinator.name)
+
+        async with asyncio.TaskGroup() as group:
+            for feed_type, feed_stations in stations.items():
+                group.create_task(_async_refresh_feed(feed_type, feed_stations))
+            for coordinator in regions:
+                group.create_task(_async_refresh_region(coordinator))
+
+    async def async_shutdown(self) -> None:
+        """Stop waiting for startup and cancel a refresh still running."""
+        if self._unsub_started is not None:
+            self._unsub_started()
+            self._unsub_started = None
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
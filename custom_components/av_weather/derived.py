@@ -0,0 +1,217 @@
+"""Derived aviation metrics for Av Weather.
+
+Density altitude, relative humidity, runway wind components and the
+estimated cloud base are computed natively from a decoded METAR. Results are
+cached per report, so every sensor showing a report shares one computation
+and nothing is recomputed until a new report arrives.
+"""
+import math
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any
+
+from .models import MetarReport
+
+FT_PER_M = 3.28084
+
+# ISA sea level pressure (hPa) and temperature lapse rate (°C per foot)
+ISA_PRESSURE = 1013.25
+ISA_LAPSE_RATE = 0.0019812
+
+# Density altitude change per °C of deviation from ISA temperature
+DENSITY_ALTITUDE_FT_PER_C = 118.8
+
+# Magnus formula coefficients for saturation vapour pressure over water
+MAGNUS_A = 17.625
+MAGNUS_B = 243.04
+
+# Convective cloud base rises about 1000 ft per 2.5 °C of temperature/dewpoint spread
+CLOUD_BASE_FT_PER_C = 400
+
+_RUNWAY_RE = re.compile(r"(?P<designator>(?P<number>0[1-9]|[1-2]\d|3[0-6])[LCR]?)(?:@(?P<true_heading>\d{1,3}))?")
+_VARIATION_RE = re.compile(r"(?P<degrees>\d{1,2})(?P<side>[EW])")
+
+
+@dataclass(slots=True, frozen=True)
+class Runway:
+    """A runway end: its designator and heading in degrees.
+
+    Headings taken from the designator are magnetic; METAR winds are true, so
+    they are only exact once corrected for the magnetic variation.
+    """
+
+    designator: str
+    heading: int
+    true_heading: bool = False
+
+
+@dataclass(slots=True, frozen=True)
+class RunwayWind:
+    """Wind components along a runway, in knots.
+
+    Crosswind is positive from the right and negative from the left.
+    """
+
+    runway: str
+    headwind: int
+    crosswind: int
+    gust_crosswind: int | None = None
+    heading: int | None = None
+    true_heading: bool = False
+
+    def as_dict(self) -> dict[str, int | str | None]:
+        """Return the components as an attribute value."""
+        return {
+            "runway": self.runway,
+            "heading_deg": self.heading,
+            # Magnetic headings are not corrected for variation, so the components are approximate
+            "heading_reference": "true" if self.true_heading else "magnetic",
+            "headwind_kts": self.headwind,
+            "crosswind_kts": self.crosswind,
+            "gust_crosswind_kts": self.gust_crosswind,
+        }
+
+
+@dataclass(slots=True, frozen=True)
+class DerivedMetrics:
+    """Values derived from a METAR; None where an input is missing."""
+
+    relative_humidity: float | None = None
+    dewpoint_spread: float | None = None
+    estimated_cloud_base: int | None = None
+    pressure_altitude: int | None = None
+    density_altitude: int | None = None
+    runway_winds: tuple[RunwayWind, ...] = ()
+
+    def as_attributes(self) -> dict[str, Any]:
+        """Return the metrics that could be computed as state attributes."""
+        attributes: dict[str, Any] = {}
+        if self.relative_humidity is not None:
+            attributes["relative_humidity_pct"] = self.relative_humidity
+        if self.dewpoint_spread is not None:
+            attributes["dewpoint_spread_c"] = self.dewpoint_spread
+            attributes["estimated_cloud_base_ft"] = self.estimated_cloud_base
+        if self.pressure_altitude is not None:
+            attributes["pressure_altitude_ft"] = self.pressure_altitude
+        if self.density_altitude is not None:
+            attributes["density_altitude_ft"] = self.density_altitude
+        if self.runway_winds:
+            attributes["runway_winds"] = [wind.as_dict() for wind in self.runway_winds]
+            # The runway end with the strongest headwind, ties broken by the lighter crosswind
+            attributes["favored_runway"] = max(
+                self.runway_winds, key=lambda wind: (wind.headwind, -abs(wind.crosswind))
+            ).runway
+        return attributes
+
+
+def parse_runways(text: str | None) -> dict[str, tuple[Runway, ...]]:
+    """Parse configured runway ends, such as "04L 22R" or "KJFK 13W: 04L, 22R".
+
+    Each line lists runway designators, optionally prefixed by the ICAO code
+    of the airport they belong to. Lines without a code apply to every
+    airport and are returned under the "" key. Headings are the designator
+    times ten, which is magnetic. A magnetic variation in the prefix, such
+    as "13W", corrects them to true, and "28L@298" gives one end's true
+    heading. Raises ValueError on anything that is not understood.
+    """
+    runways: dict[str, tuple[Runway, ...]] = {}
+    for line in (text or "").splitlines():
+        prefix, _, designators = line.rpartition(":")
+        station = ""
+        variation: int | None = None
+        for part in prefix.upper().split():
+            if (match := _VARIATION_RE.fullmatch(part)) is not None and variation is None:
+                variation = int(match["degrees"]) * (1 if match["side"] == "E" else -1)
+            elif not station:
+                station = part
+            else:
+                raise ValueError(f"Invalid runway line prefix {prefix!r}")
+
+        ends = []
+        for designator in designators.replace(",", " ").split():
+            match = _RUNWAY_RE.fullmatch(designator.upper())
+            if match is None:
+                raise ValueError(f"Invalid runway designator {designator!r}")
+            if match["true_heading"] is not None:
+                heading = int(match["true_heading"])
+                if not 1 <= heading <= 360:
+                    raise ValueError(f"Invalid runway heading {designator!r}")
+                ends.append(Runway(match["designator"], heading, True))
+            elif variation is not None:
+                # True heading = magnetic heading + easterly variation
+                heading = (int(match["number"]) * 10 + variation - 1) % 360 + 1
+                ends.append(Runway(match["designator"], heading, True))
+            else:
+                ends.append(Runway(match["designator"], int(match["number"]) * 10))
+        if ends:
+            runways[station] = runways.get(station, ()) + tuple(ends)
+    return runways
+
+
+def relative_humidity(temperature: float, dewpoint: float) -> float:
+    """Return the relative humidity in percent from the Magnus formula."""
+    def vapour_pressure(celsius: float) -> float:
+        return math.exp(MAGNUS_A * celsius / (MAGNUS_B + celsius))
+
+    return round(min(100.0, 100 * vapour_pressure(dewpoint) / vapour_pressure(temperature)), 1)
+
+
+def pressure_altitude(elevation_ft: float, altimeter_hpa: float) -> int:
+    """Return the pressure altitude in feet of a field from its QNH."""
+    return round(elevation_ft + 145366.45 * (1 - (altimeter_hpa / ISA_PRESSURE) ** 0.190284))
+
+
+def density_altitude(pressure_altitude_ft: float, temperature: float) -> int:
+    """Return the density altitude in feet from the pressure altitude and temperature."""
+    isa_temperature = 15 - ISA_LAPSE_RATE * pressure_altitude_ft
+    return round(pressure_altitude_ft + DENSITY_ALTITUDE_FT_PER_C * (temperature - isa_temperature))
+
+
+def runway_wind(runway: Runway, direction: float, speed: float, gust: float | None = None) -> RunwayWind:
+    """Resolve a wind into head- and crosswind components along a runway."""
+    angle = math.radians(direction - runway.heading)
+    return RunwayWind(
+        runway=runway.designator,
+        headwind=round(speed * math.cos(angle)),
+        crosswind=round(speed * math.sin(angle)),
+        gust_crosswind=round(gust * math.sin(angle)) if gust is not None else None,
+        heading=runway.heading,
+        true_heading=runway.true_heading,
+    )
+
+
+@lru_cache(maxsize=512)
+def derive_metrics(report: MetarReport, runways: tuple[Runway, ...] = ()) -> DerivedMetrics:
+    """Return the metrics derived from a report, computed once per report."""
+    temperature = report.temperature
+    dewpoint = report.dewpoint
+
+    humidity = spread = cloud_base = None
+    if temperature is not None and dewpoint is not None:
+        humidity = relative_humidity(temperature, dewpoint)
+        spread = round(temperature - dewpoint, 1)
+        cloud_base = round(max(spread, 0) * CLOUD_BASE_FT_PER_C)
+
+    pressure_alt = density_alt = None
+    if report.elevation is not None and report.altimeter is not None:
+        pressure_alt = pressure_altitude(report.elevation * FT_PER_M, report.altimeter)
+        if temperature is not None:
+            density_alt = density_altitude(pressure_alt, temperature)
+
+    winds: tuple[RunwayWind, ...] = ()
+    direction = report.wind_direction
+    if runways and isinstance(direction, (int, float)) and report.wind_speed is not None:
+        winds = tuple(
+            runway_wind(runway, direction, report.wind_speed, report.wind_gust)
+            for runway in runways
+        )
+
+    return DerivedMetrics(
+        relative_humidity=humidity,
+        dewpoint_spread=spread,
+        estimated_cloud_base=cloud_base,
+        pressure_altitude=pressure_alt,
+        density_altitude=density_alt,
+        runway_winds=winds,
+    )
@@ -0,0 +1,41 @@
+"""Diagnostics support for Av Weather."""
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_LATITUDE, CONF_LONGITUDE
+from homeassistant.core import HomeAssistant
+
+from .api import AviationWeatherApi
+from .const import DOMAIN
+from .coordinator import AvWeatherFeedCoordinator
+
+# A region's centre is usually the user's home
+TO_REDACT = {CONF_LATITUDE, CONF_LONGITUDE}
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any]:
+    """Return diagnostics for a config entry.
+
+    The API client and the feed coordinators are shared by every entry, so
+    their request metrics and polling state cover the whole integration.
+    """
+    domain_data = hass.data[DOMAIN]
+    api: AviationWeatherApi = domain_data["api"]
+    coordinators: dict[str, AvWeatherFeedCoordinator] = domain_data["coordinators"]
+
+    return {
+        "entry": async_redact_data(dict(entry.data), TO_REDACT),
+        "requests": api.metrics.as_dict(),
+        "cache": api.cache_stats,
+        "coordinators": {
+            feed_type: {
+                "stations": len(coordinator.stations),
+                "reports": len(coordinator.data or {}),
+                "update_interval": str(coordinator.update_interval) if coordinator.update_interval else None,
+                "adaptive": coordinator.adaptive,
+                "last_update_success": coordinator.last_update_success,
+            }
+            for feed_type, coordinator in coordinators.items()
+        },
+    }
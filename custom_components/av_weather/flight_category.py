@@ -0,0 +1,169 @@
+"""Flight category computation for Av Weather."""
+import math
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass, fields, replace
+from typing import Any
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, the batch path falls back to plain Python
+    np = None
+
+from .models import CloudLayer, MetarReport
+
+CATEGORY_VFR = "VFR"
+CATEGORY_MVFR = "MVFR"
+CATEGORY_IFR = "IFR"
+CATEGORY_LIFR = "LIFR"
+
+# Smallest batch worth converting to NumPy arrays
+NUMPY_MIN_BATCH = 300
+
+# Cloud covers that form a ceiling; the API reports vertical visibility as OVX
+CEILING_COVERS = frozenset({"BKN", "OVC", "OVX", "VV"})
+
+# Categories by the code the NumPy batch path assigns them
+_CATEGORY_CODES = (
+    np.array((None, CATEGORY_LIFR, CATEGORY_IFR, CATEGORY_MVFR, CATEGORY_VFR), dtype=object)
+    if np is not None
+    else None
+)
+
+
+@dataclass(slots=True, frozen=True)
+class CategoryMinima:
+    """Ceiling (ft AGL) and visibility (statute miles) limits of each category.
+
+    A report is LIFR below the LIFR limits, IFR below the IFR limits and
+    MVFR at or below the MVFR limits, as the FAA defines them.
+    """
+
+    mvfr_ceiling: float = 3000
+    mvfr_visibility: float = 5
+    ifr_ceiling: float = 1000
+    ifr_visibility: float = 3
+    lifr_ceiling: float = 500
+    lifr_visibility: float = 1
+
+
+DEFAULT_MINIMA = CategoryMinima()
+
+
+def minima_from_config(config: Mapping[str, Any] | None) -> CategoryMinima | None:
+    """Return the custom minima stored in a config entry, or None when there are none."""
+    if not config:
+        return None
+    return CategoryMinima(**{
+        field.name: float(config[field.name])
+        for field in fields(CategoryMinima)
+        if config.get(field.name) is not None
+    })
+
+
+def ceiling_ft(clouds: Iterable[CloudLayer]) -> float | None:
+    """Return the base of the lowest broken or overcast layer, or None if there is no ceiling."""
+    bases = [layer.base for layer in clouds if layer.cover in CEILING_COVERS and layer.base is not None]
+    return min(bases) if bases else None
+
+
+def visibility_sm(value: float | str | None) -> float | None:
+    """Return a visibility in statute miles, reading "10+" style values as their bound."""
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(value.rstrip("+"))
+    except ValueError:
+        return None
+
+
+def _ceiling_input(clouds: tuple[CloudLayer, ...]) -> float | None:
+    """Return the ceiling to classify: unlimited when clouds were reported without one."""
+    ceiling = ceiling_ft(clouds)
+    if ceiling is None and clouds:
+        return math.inf
+    return ceiling
+
+
+def classify(
+    visibility: float | None,
+    ceiling: float | None,
+    minima: CategoryMinima = DEFAULT_MINIMA,
+) -> str | None:
+    """Return the category of a visibility (sm) and ceiling (ft), None when both are unknown."""
+    if visibility is None and ceiling is None:
+        return None
+
+    # A missing ceiling or visibility never restricts the category
+    ceiling = math.inf if ceiling is None else ceiling
+    visibility = math.inf if visibility is None else visibility
+    if ceiling < minima.lifr_ceiling or visibility < minima.lifr_visibility:
+        return CATEGORY_LIFR
+    if ceiling < minima.ifr_ceiling or visibility < minima.ifr_visibility:
+        return CATEGORY_IFR
+    if ceiling <= minima.mvfr_ceiling or visibility <= minima.mvfr_visibility:
+        return CATEGORY_MVFR
+    return CATEGORY_VFR
+
+
+def flight_category(
+    visibility: float | str | None,
+    clouds: Iterable[CloudLayer],
+    minima: CategoryMinima = DEFAULT_MINIMA,
+) -> str | None:
+    """Return VFR, MVFR, IFR or LIFR, or None when neither ceiling nor visibility is known."""
+    return classify(visibility_sm(visibility), _ceiling_input(tuple(clouds)), minima)
+
+
+def classify_batch(
+    visibilities: Sequence[float | None],
+    ceilings: Sequence[float | None],
+    minima: CategoryMinima = DEFAULT_MINIMA,
+) -> list[str | None]:
+    """Classify many visibility (sm) and ceiling (ft) pairs at once.
+
+    Large batches are classified with vectorized NumPy comparisons when
+    NumPy is installed; otherwise, and for small batches where the array
+    conversion would cost more than it saves, each pair is classified in turn.
+    """
+    if np is None or len(visibilities) < NUMPY_MIN_BATCH:
+        return [
+            classify(visibility, ceiling, minima)
+            for visibility, ceiling in zip(visibilities, ceilings)
+        ]
+
+    # NumPy reads None as NaN, and NaN compares False, so unknowns never restrict
+    visibility = np.array(visibilities, dtype=float)
+    ceiling = np.array(ceilings, dtype=float)
+    codes = np.select(
+        [
+            np.isnan(visibility) & np.isnan(ceiling),
+            (ceiling < minima.lifr_ceiling) | (visibility < minima.lifr_visibility),
+            (ceiling < minima.ifr_ceiling) | (visibility < minima.ifr_visibility),
+            (ceiling <= minima.mvfr_ceiling) | (visibility <= minima.mvfr_visibility),
+        ],
+        [0, 1, 2, 3],
+        default=4,
+    )
+    return _CATEGORY_CODES[codes].tolist()
+
+
+def fill_flight_categories(reports: list[MetarReport]) -> list[MetarReport]:
+    """Compute the flight category of every report the API left without one.
+
+    The reports missing a category are classified together in one batch.
+    """
+    missing = [index for index, report in enumerate(reports) if report.flight_category is None]
+    if not missing:
+        return reports
+
+    categories = classify_batch(
+        [visibility_sm(reports[index].visibility) for index in missing],
+        [_ceiling_input(reports[index].clouds) for index in missing],
+    )
+    filled = list(reports)
+    for index, category in zip(missing, categories):
+        if category is not None:
+            filled[index] = replace(reports[index], flight_category=category)
+    return filled
@@ -0,0 +1,160 @@
+"""Geospatial airport index for Av Weather."""
+import asyncio
+import logging
+import math
+from array import array
+from collections.abc import Mapping
+from typing import Any
+
+from .airports import load_airports
+
+_LOGGER = logging.getLogger(__name__)
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+# Size of a grid cell in degrees
+CELL_SIZE = 1.0
+
+# First search radius of a nearest-N query; it doubles until enough are found
+INITIAL_RADIUS_KM = 50.0
+MAX_RADIUS_KM = math.pi * EARTH_RADIUS_KM
+
+_GEO_INDEX: "AirportGeoIndex | None" = None
+# Created on first use, so that it belongs to the running event loop
+_GEO_INDEX_LOCK: asyncio.Lock | None = None
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Return the great-circle distance between two points in kilometres."""
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    half_dphi = (phi2 - phi1) / 2
+    half_dlambda = math.radians(lon2 - lon1) / 2
+    a = math.sin(half_dphi) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(half_dlambda) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def bounding_box(lat: float, lon: float, radius_km: float) -> tuple[float, float, float, float]:
+    """Return (min_lat, min_lon, max_lat, max_lon) enclosing a circle.
+
+    The box is clamped to -180..180 longitude rather than wrapped, so a
+    circle crossing the antimeridian is cut at it.
+    """
+    dlat = radius_km / KM_PER_DEGREE
+    min_lat = max(-90.0, lat - dlat)
+    max_lat = min(90.0, lat + dlat)
+    widest = max(abs(min_lat), abs(max_lat))
+    if widest >= 89.9:
+        return (min_lat, -180.0, max_lat, 180.0)
+    dlon = min(180.0, dlat / math.cos(math.radians(widest)))
+    return (min_lat, max(-180.0, lon - dlon), max_lat, min(180.0, lon + dlon))
+
+
+def _cell(lat: float, lon: float) -> tuple[int, int]:
+    """Return the grid cell containing a point."""
+    return (math.floor(lat / CELL_SIZE), math.floor(lon / CELL_SIZE))
+
+
+class AirportGeoIndex:
+    """Grid-bucketed index of airport coordinates.
+
+    Airports are bucketed into fixed-size latitude/longitude cells, and
+    coordinates are kept in flat arrays. A radius query only visits the
+    cells overlapping the query's bounding box, and a nearest-N query widens
+    its radius until it has enough airports.
+    """
+
+    def __init__(self, airports: Mapping[str, dict[str, Any]]) -> None:
+        """Build the index from the airport database."""
+        self._icaos: list[str] = []
+        self._lats = array("d")
+        self._lons = array("d")
+        self._cells: dict[tuple[int, int], array] = {}
+
+        for icao in airports:
+            airport = airports[icao]
+            lat = airport.get("lat")
+            lon = airport.get("lon")
+            if lat is None or lon is None or (lat == 0 and lon == 0):
+                continue
+            position = len(self._icaos)
+            self._icaos.append(icao)
+            self._lats.append(float(lat))
+            self._lons.append(float(lon))
+            # Longitude 180 is the -180 meridian the grid's cells start at
+            self._cells.setdefault(_cell(lat, (lon + 180) % 360 - 180), array("I")).append(position)
+
+    def __len__(self) -> int:
+        """Return the number of indexed airports."""
+        return len(self._icaos)
+
+    def _cells_within(self, lat: float, lon: float, radius_km: float) -> list[tuple[int, int]]:
+        """Return the grid cells overlapping a circle's bounding box."""
+        dlat = radius_km / KM_PER_DEGREE
+        lat_min = max(-90.0, lat - dlat)
+        lat_max = min(90.0, lat + dlat)
+        widest = max(abs(lat_min), abs(lat_max))
+        if widest >= 89.9 or radius_km >= MAX_RADIUS_KM:
+            lon_cells = range(math.floor(-180 / CELL_SIZE), math.ceil(180 / CELL_SIZE))
+        else:
+            dlon = min(180.0, dlat / math.cos(math.radians(widest)))
+            low, high = _cell(0, lon - dlon)[1], _cell(0, lon + dlon)[1]
+            span = math.ceil(360 / CELL_SIZE)
+            # Wrap around the antimeridian onto the -180..180 cell range
+            offset = math.floor(-180 / CELL_SIZE)
+            lon_cells = sorted({(x - offset) % span + offset for x in range(low, high + 1)})
+
+        lat_cells = range(_cell(lat_min, 0)[0], _cell(lat_max, 0)[0] + 1)
+        return [(y, x) for y in lat_cells for x in lon_cells]
+
+    def within_radius(self, lat: float, lon: float, radius_km: float) -> list[tuple[str, float]]:
+        """Return (ICAO, distance km) of every airport within a radius, nearest first."""
+        found: list[tuple[str, float]] = []
+        for cell in self._cells_within(lat, lon, radius_km):
+            for position in self._cells.get(cell, ()):
+                distance = haversine_km(lat, lon, self._lats[position], self._lons[position])
+                if distance <= radius_km:
+                    found.append((self._icaos[position], distance))
+        found.sort(key=lambda item: item[1])
+        return found
+
+    def nearest(
+        self,
+        lat: float,
+        lon: float,
+        count: int,
+        max_radius_km: float = MAX_RADIUS_KM,
+    ) -> list[tuple[str, float]]:
+        """Return (ICAO, distance km) of the nearest airports, nearest first.
+
+        Fewer than ``count`` airports are returned when the index holds fewer
+        within ``max_radius_km``, which is capped at half the Earth's
+        circumference, beyond which the whole grid has been searched.
+        """
+        max_radius_km = min(max_radius_km, MAX_RADIUS_KM)
+        radius = min(INITIAL_RADIUS_KM, max_radius_km)
+        while True:
+            found = self.within_radius(lat, lon, radius)
+            # Everything outside the radius is farther than what was found
+            if len(found) >= min(count, len(self)) or radius >= max_radius_km:
+                return found[:count]
+            radius = min(radius * 2, max_radius_km)
+
+
+async def async_get_geo_index() -> AirportGeoIndex:
+    """Return the shared geospatial index, building it on first use."""
+    global _GEO_INDEX, _GEO_INDEX_LOCK
+
+    if _GEO_INDEX is not None:
+        return _GEO_INDEX
+
+    if _GEO_INDEX_LOCK is None:
+        _GEO_INDEX_LOCK = asyncio.Lock()
+    async with _GEO_INDEX_LOCK:
+        if _GEO_INDEX is None:
+            airports = await load_airports()
+            # Building touches every airport record, keep it off the event loop
+            _GEO_INDEX = await asyncio.to_thread(AirportGeoIndex, airports)
+            _LOGGER.debug("Built airport geo index for %d airports", len(_GEO_INDEX))
+    return _GEO_INDEX
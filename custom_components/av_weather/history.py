@@ -0,0 +1,264 @@
+"""Recent observation history and trends for Av Weather.
+
+Each station keeps its recent METARs in a fixed-size ring buffer of typed
+arrays: one column per value, a few bytes per observation, with missing
+values stored as NaN. Old observations fall out by age or when the buffer is
+full. Trends are computed once per new observation and cached until the
+next one arrives.
+"""
+import math
+from array import array
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any
+
+from .flight_category import (
+    CATEGORY_IFR,
+    CATEGORY_LIFR,
+    CATEGORY_MVFR,
+    CATEGORY_VFR,
+    visibility_sm,
+)
+from .models import MetarReport
+
+# Categories by the code stored in the buffer; 0 is unknown
+_CATEGORIES = (None, CATEGORY_VFR, CATEGORY_MVFR, CATEGORY_IFR, CATEGORY_LIFR)
+_CATEGORY_CODES = {category: code for code, category in enumerate(_CATEGORIES)}
+
+# Pressure changes smaller than this over the trend window count as steady (hPa)
+STEADY_PRESSURE_CHANGE = 1.0
+
+
+@dataclass(slots=True, frozen=True)
+class Observation:
+    """One buffered observation; None where a value was not reported."""
+
+    time: int
+    altimeter: float | None
+    temperature: float | None
+    dewpoint: float | None
+    visibility: float | None
+    category: str | None
+
+    @classmethod
+    def from_report(cls, report: MetarReport) -> "Observation | None":
+        """Return the observation of a report, or None without an observation time."""
+        if report.obs_time is None:
+            return None
+        return cls(
+            time=int(report.obs_time),
+            altimeter=report.altimeter,
+            temperature=report.temperature,
+            dewpoint=report.dewpoint,
+            visibility=visibility_sm(report.visibility),
+            category=report.flight_category,
+        )
+
+    def as_list(self) -> list[Any]:
+        """Encode the observation as a compact list for storage."""
+        return [self.time, self.altimeter, self.temperature, self.dewpoint, self.visibility, self.category]
+
+    @classmethod
+    def from_list(cls, values: list[Any]) -> "Observation":
+        """Decode an observation stored by as_list."""
+        time, altimeter, temperature, dewpoint, visibility, category = values
+        return cls(int(time), altimeter, temperature, dewpoint, visibility, category)
+
+
+def _nan(value: float | None) -> float:
+    """Store a missing value as NaN."""
+    return math.nan if value is None else value
+
+
+def _value(value: float) -> float | None:
+    """Read NaN back as a missing value."""
+    return None if math.isnan(value) else value
+
+
+class StationHistory:
+    """Ring buffer of one station's recent observations, oldest first."""
+
+    def __init__(self, capacity: int, max_age: int) -> None:
+        """Initialize an empty buffer of ``capacity`` observations kept ``max_age`` seconds."""
+        self._capacity = capacity
+        self._max_age = max_age
+        self._times = array("q", [0]) * capacity
+        self._altimeter = array("d", [math.nan]) * capacity
+        self._temperature = array("d", [math.nan]) * capacity
+        self._dewpoint = array("d", [math.nan]) * capacity
+        self._visibility = array("d", [math.nan]) * capacity
+        self._category = array("b", [0]) * capacity
+        self._start = 0
+        self._count = 0
+        self._trends: dict[float, dict[str, Any]] = {}
+
+    def __len__(self) -> int:
+        """Return the number of buffered observations."""
+        return self._count
+
+    def _slot(self, index: int) -> int:
+        """Return the array position of the index-th oldest observation."""
+        return (self._start + index) % self._capacity
+
+    @property
+    def latest_time(self) -> int | None:
+        """Return the time of the newest observation."""
+        return self._times[self._slot(self._count - 1)] if self._count else None
+
+    def add(self, observation: Observation) -> bool:
+        """Append an observation newer than the last one; return False otherwise."""
+        latest = self.latest_time
+        if latest is not None and observation.time <= latest:
+            return False
+
+        if self._count == self._capacity:
+            # Full: the new observation overwrites the oldest
+            self._start = self._slot(1)
+            self._count -= 1
+        slot = self._slot(self._count)
+        self._times[slot] = observation.time
+        self._altimeter[slot] = _nan(observation.altimeter)
+        self._temperature[slot] = _nan(observation.temperature)
+        self._dewpoint[slot] = _nan(observation.dewpoint)
+        self._visibility[slot] = _nan(observation.visibility)
+        self._category[slot] = _CATEGORY_CODES.get(observation.category, 0)
+        self._count += 1
+
+        self.evict(observation.time - self._max_age)
+        self._trends.clear()
+        return True
+
+    def evict(self, cutoff: float) -> None:
+        """Drop the observations made before a Unix timestamp."""
+        while self._count and self._times[self._start] < cutoff:
+            self._start = self._slot(1)
+            self._count -= 1
+            self._trends.clear()
+
+    def __iter__(self) -> Iterator[Observation]:
+        """Iterate over the observations from oldest to newest."""
+        for index in range(self._count):
+            slot = self._slot(index)
+            yield Observation(
+                time=self._times[slot],
+                altimeter=_value(self._altimeter[slot]),
+                temperature=_value(self._temperature[slot]),
+                dewpoint=_value(self._dewpoint[slot]),
+                visibility=_value(self._visibility[slot]),
+                category=_CATEGORIES[self._category[slot]],
+            )
+
+    def _change(self, column: array, since: float) -> float | None:
+        """Return the change of a column from its first value at or after ``since`` to its last value.
+
+        Returns None unless at least two values were reported in that time.
+        """
+        values = [
+            column[slot]
+            for slot in map(self._slot, range(self._count))
+            if self._times[slot] >= since and not math.isnan(column[slot])
+        ]
+        if len(values) < 2:
+            return None
+        return round(values[-1] - values[0], 1)
+
+    def trends(self, hours: float) -> dict[str, Any]:
+        """Return the trends over the last ``hours`` before the newest observation.
+
+        Trends are computed once and cached until the next observation.
+        """
+        if hours in self._trends:
+            return self._trends[hours]
+
+        latest = self.latest_time
+        if latest is None:
+            return {}
+        since = latest - hours * 3600
+
+        spread = array(
+            "d",
+            (temperature - dewpoint for temperature, dewpoint in zip(self._temperature, self._dewpoint)),
+        )
+        altimeter_change = self._change(self._altimeter, since)
+
+        changes = []
+        previous = None
+        for index in range(self._count):
+            slot = self._slot(index)
+            code = self._category[slot]
+            if self._times[slot] < since or code == 0:
+                continue
+            if previous is not None and code != previous:
+                changes.append({
+                    "time": datetime.fromtimestamp(self._times[slot], tz=timezone.utc).isoformat(),
+                    "flight_category": _CATEGORIES[code],
+                })
+            previous = code
+
+        trends: dict[str, Any] = {
+            "altimeter_tendency_hpa": altimeter_change,
+            "pressure_trend": None if altimeter_change is None else (
+                "steady" if abs(altimeter_change) < STEADY_PRESSURE_CHANGE
+                else "rising" if altimeter_change > 0
+                else "falling"
+            ),
+            "dewpoint_spread_trend_c": self._change(spread, since),
+            "visibility_trend_mi": self._change(self._visibility, since),
+            "category_changes": changes,
+        }
+        self._trends[hours] = trends
+        return trends
+
+
+class ReportHistory:
+    """Recent observation history of every station."""
+
+    def __init__(self, capacity: int, max_age: int) -> None:
+        """Initialize the history, keeping up to ``capacity`` observations for ``max_age`` seconds."""
+        self._capacity = capacity
+        self._max_age = max_age
+        self._stations: dict[str, StationHistory] = {}
+
+    def get(self, station: str) -> StationHistory | None:
+        """Return the history of a station."""
+        return self._stations.get(station)
+
+    def add(self, station: str, observation: Observation) -> bool:
+        """Record an observation of a station; return True if it was new."""
+        history = self._stations.get(station)
+        if history is None:
+            history = self._stations[station] = StationHistory(self._capacity, self._max_age)
+        return history.add(observation)
+
+    def add_reports(self, reports: Iterable[MetarReport]) -> bool:
+        """Record the observations of many reports; return True if any was new."""
+        added = False
+        for report in reports:
+            observation = Observation.from_report(report)
+            if observation is not None and self.add(report.station, observation):
+                added = True
+        return added
+
+    def evict(self, cutoff: float) -> None:
+        """Drop every observation made before a Unix timestamp, and emptied stations."""
+        for station, history in list(self._stations.items()):
+            history.evict(cutoff)
+            if not history:
+                del self._stations[station]
+
+    def as_dict(self) -> dict[str, list[list[Any]]]:
+        """Encode the history for storage."""
+        return {
+            station: [observation.as_list() for observation in history]
+            for station, history in self._stations.items()
+        }
+
+    def load(self, data: dict[str, Any]) -> None:
+        """Restore a history stored by as_dict, skipping malformed entries."""
+        for station, observations in data.items():
+            if not isinstance(observations, list):
+                continue
+            for values in observations:
+                if isinstance(values, list) and len(values) == 6:
+                    self.add(station, Observation.from_list(values))
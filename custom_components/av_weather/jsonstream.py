@@ -0,0 +1,99 @@
+"""Incremental parsing of JSON array responses."""
+import codecs
+import json
+from collections.abc import Collection, Iterable
+from typing import Any
+
+_WHITESPACE = " \t\n\r"
+
+
+class JsonArrayParser:
+    """Parse a JSON array of report objects fed in arbitrary chunks.
+
+    Each element is decoded as soon as it is complete and immediately
+    dropped unless its ``icaoId`` is wanted, so only the kept reports, projected
+    to ``fields``, outlive the chunk they arrived in.
+    """
+
+    def __init__(
+        self,
+        stations: Collection[str] | None = None,
+        fields: Iterable[str] | None = None,
+    ) -> None:
+        """Initialize the parser.
+
+        ``stations`` limits the reports kept and ``fields`` the keys kept of
+        each report; None keeps everything.
+        """
+        self._stations = stations
+        self._fields = tuple(fields) if fields is not None else None
+        self._decoder = json.JSONDecoder()
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._started = False
+        self._finished = False
+        self.seen: set[str] = set()
+
+    def feed(self, data: bytes) -> list[dict[str, Any]]:
+        """Parse the complete elements in a chunk of the response body."""
+        self._buffer += self._text.decode(data)
+        return self._parse(final=False)
+
+    def close(self) -> list[dict[str, Any]]:
+        """Parse the rest of the body, raising ValueError if it is incomplete."""
+        self._buffer += self._text.decode(b"", final=True)
+        records = self._parse(final=True)
+        if not self._finished:
+            raise ValueError("Truncated JSON array")
+        return records
+
+    def _parse(self, final: bool) -> list[dict[str, Any]]:
+        """Decode every complete element in the buffer."""
+        buffer = self._buffer
+        end = len(buffer)
+        pos = 0
+        records: list[dict[str, Any]] = []
+
+        while not self._finished:
+            while pos < end and buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos == end:
+                break
+
+            char = buffer[pos]
+            if not self._started:
+                if char != "[":
+                    raise ValueError("API response is not a list")
+                self._started = True
+                pos += 1
+                continue
+            if char == "]":
+                self._finished = True
+                pos += 1
+                break
+            if char == ",":
+                pos += 1
+                continue
+
+            try:
+                item, next_pos = self._decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if final:
+                    raise
+                # The element continues in the next chunk
+                break
+            pos = next_pos
+
+            if not isinstance(item, dict):
+                continue
+            station = item.get("icaoId")
+            if station:
+                self.seen.add(station)
+            if self._stations is not None and station not in self._stations:
+                continue
+            if self._fields is not None:
+                item = {field: item[field] for field in self._fields if field in item}
+            records.append(item)
+
+        self._buffer = buffer[pos:]
+        return records
@@ -0,0 +1,129 @@
+"""Request metrics of the Av Weather API client."""
+from bisect import bisect_left
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any
+
+# Upper bounds of the latency histogram buckets in milliseconds; slower requests land in the last bucket
+LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# Upper bounds of the parse time histogram buckets in milliseconds
+PARSE_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 1000)
+
+
+class Histogram:
+    """Count of observed values per bucket, with their total and maximum."""
+
+    __slots__ = ("bounds", "counts", "count", "total", "maximum")
+
+    def __init__(self, bounds: tuple[float, ...]) -> None:
+        """Initialize an empty histogram with the given bucket upper bounds."""
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+
+    def observe(self, value: float) -> None:
+        """Add a value to its bucket."""
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.maximum = max(self.maximum, value)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the histogram as diagnostics data."""
+        labels = [f"<={bound}" for bound in self.bounds] + [f">{self.bounds[-1]}"]
+        return {
+            "count": self.count,
+            "mean": round(self.total / self.count, 1) if self.count else None,
+            "max": round(self.maximum, 1),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+@dataclass(slots=True)
+class RequestTiming:
+    """What one request to the API did and how long it took."""
+
+    feed_type: str
+    url: str
+    status: int | None = None
+    bytes: int = 0
+    records: int | None = None
+    elapsed_ms: float = 0.0
+    parse_ms: float = 0.0
+    timed_out: bool = False
+
+
+@dataclass(slots=True)
+class FeedMetrics:
+    """Counters and histograms of the requests made for one feed."""
+
+    requests: int = 0
+    bytes: int = 0
+    records: int = 0
+    responses: int = 0
+    timeouts: int = 0
+    rate_limited: int = 0
+    errors: int = 0
+    statuses: Counter = field(default_factory=Counter)
+    latency: Histogram = field(default_factory=lambda: Histogram(LATENCY_BUCKETS_MS))
+    parse_time: Histogram = field(default_factory=lambda: Histogram(PARSE_BUCKETS_MS))
+
+    def record(self, timing: RequestTiming) -> None:
+        """Count a finished request."""
+        self.requests += 1
+        self.bytes += timing.bytes
+        self.latency.observe(timing.elapsed_ms)
+        if timing.timed_out:
+            self.timeouts += 1
+        if timing.status is None:
+            if not timing.timed_out:
+                self.errors += 1
+            return
+        self.statuses[timing.status] += 1
+        if timing.status == 429:
+            self.rate_limited += 1
+        if timing.records is not None:
+            self.responses += 1
+            self.records += timing.records
+            self.parse_time.observe(timing.parse_ms)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics as diagnostics data."""
+        return {
+            "requests": self.requests,
+            "bytes": self.bytes,
+            "records": self.records,
+            "records_per_response": round(self.records / self.responses, 1) if self.responses else None,
+            "timeouts": self.timeouts,
+            "rate_limited": self.rate_limited,
+            "errors": self.errors,
+            "statuses": {str(status): count for status, count in sorted(self.statuses.items())},
+            "latency_ms": self.latency.as_dict(),
+            "parse_ms": self.parse_time.as_dict(),
+        }
+
+
+class ApiMetrics:
+    """Request metrics of every feed."""
+
+    def __init__(self) -> None:
+        """Initialize empty metrics."""
+        self.feeds: dict[str, FeedMetrics] = {}
+
+    def feed(self, feed_type: str) -> FeedMetrics:
+        """Return the metrics of a feed."""
+        metrics = self.feeds.get(feed_type)
+        if metrics is None:
+            metrics = self.feeds[feed_type] = FeedMetrics()
+        return metrics
+
+    def record(self, timing: RequestTiming) -> None:
+        """Count a finished request of any feed."""
+        self.feed(timing.feed_type).record(timing)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics of every feed as diagnostics data."""
+        return {feed_type: metrics.as_dict() for feed_type, metrics in self.feeds.items()}
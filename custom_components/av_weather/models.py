@@ -0,0 +1,310 @@
+"""Typed report models for Av Weather.
+
+Reports are decoded from the API's JSON once, in the API layer, into compact
+slotted dataclasses holding only the fields the integration uses. They are
+immutable, so an unchanged report can be shared by the coordinators, the
+store and every sensor showing it.
+"""
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from sys import intern
+from typing import Any, ClassVar
+
+from .const import FEED_METAR, FEED_TAF
+from .metar_decoder import DecodedMetar, RunwayVisualRange, decode_metar
+
+
+def _number(value: Any) -> int | float | None:
+    """Return a numeric field, or None when it is missing or not a number."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return value
+    return None
+
+
+def _text(value: Any) -> str | None:
+    """Return a text field, or None when it is missing or empty."""
+    return value if isinstance(value, str) and value else None
+
+
+def _either(value: Any, fallback: Any) -> Any:
+    """Return a value, or the fallback when the value is missing."""
+    return fallback if value is None else value
+
+
+def _clouds(value: Any) -> tuple["CloudLayer", ...]:
+    """Decode a list of cloud layers."""
+    if not isinstance(value, list):
+        return ()
+    return tuple(CloudLayer.from_dict(layer) for layer in value if isinstance(layer, dict))
+
+
+@dataclass(slots=True, frozen=True)
+class CloudLayer:
+    """A cloud layer: coverage (FEW, SCT, BKN, OVC, ...) and base in feet AGL."""
+
+    cover: str
+    base: int | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "CloudLayer":
+        """Decode a layer from the API's field names."""
+        return cls(intern(str(data.get("cover") or "")), _number(data.get("base")))
+
+    def as_dict(self) -> dict[str, Any]:
+        """Encode the layer with the API's field names."""
+        return {"cover": self.cover, "base": self.base}
+
+
+@dataclass(slots=True, frozen=True)
+class ForecastPeriod:
+    """One period of a TAF: the base forecast, or an FM/TEMPO/BECMG/PROB group."""
+
+    time_from: int | None
+    time_to: int | None
+    change: str | None = None
+    probability: int | None = None
+    wind_direction: float | str | None = None
+    wind_speed: float | None = None
+    wind_gust: float | None = None
+    visibility: float | str | None = None
+    weather: str | None = None
+    clouds: tuple[CloudLayer, ...] = ()
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "ForecastPeriod":
+        """Decode a period from the API's field names."""
+        change = _text(data.get("fcstChange"))
+        return cls(
+            time_from=_number(data.get("timeFrom")),
+            time_to=_number(data.get("timeTo")),
+            change=intern(change) if change else None,
+            probability=_number(data.get("probability")),
+            wind_direction=data.get("wdir"),
+            wind_speed=_number(data.get("wspd")),
+            wind_gust=_number(data.get("wgst")),
+            visibility=data.get("visib"),
+            weather=_text(data.get("wxString")),
+            clouds=_clouds(data.get("clouds")),
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Encode the period with the API's field names."""
+        return {
+            "timeFrom": self.time_from,
+            "timeTo": self.time_to,
+            "fcstChange": self.change,
+            "probability": self.probability,
+            "wdir": self.wind_direction,
+            "wspd": self.wind_speed,
+            "wgst": self.wind_gust,
+            "visib": self.visibility,
+            "wxString": self.weather,
+            "clouds": [layer.as_dict() for layer in self.clouds],
+        }
+
+
+@dataclass(slots=True, frozen=True)
+class MetarReport:
+    """A decoded METAR or SPECI observation."""
+
+    # Fields kept when an API response is parsed
+    API_FIELDS: ClassVar[tuple[str, ...]] = (
+        "icaoId", "rawOb", "reportTime", "obsTime", "metarType", "fltCat",
+        "temp", "dewp", "wdir", "wspd", "wgst", "visib", "altim", "slp",
+        "wxString", "clouds", "lat", "lon", "elev",
+    )
+
+    station: str
+    raw: str | None
+    report_time: str | None
+    obs_time: int | None = None
+    metar_type: str = "METAR"
+    flight_category: str | None = None
+    temperature: float | None = None
+    dewpoint: float | None = None
+    wind_direction: float | str | None = None
+    wind_speed: float | None = None
+    wind_gust: float | None = None
+    visibility: float | str | None = None
+    altimeter: float | None = None
+    sea_level_pressure: float | None = None
+    wind_variable_from: int | None = None
+    wind_variable_to: int | None = None
+    runway_visual_range: tuple[RunwayVisualRange, ...] = ()
+    weather: str | None = None
+    clouds: tuple[CloudLayer, ...] = ()
+    latitude: float | None = None
+    longitude: float | None = None
+    elevation: float | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "MetarReport":
+        """Decode a report from the API's field names.
+
+        Fields the API leaves out are filled in from the raw text, and the
+        tenth-degree T-group temperatures replace rounded ones.
+        """
+        flight_category = _text(data.get("fltCat"))
+        raw = _text(data.get("rawOb"))
+        decoded = decode_metar(raw) if raw else DecodedMetar()
+
+        temperature = _number(data.get("temp"))
+        dewpoint = _number(data.get("dewp"))
+        if decoded.precise_temperature:
+            temperature = decoded.temperature
+            dewpoint = _either(decoded.dewpoint, dewpoint)
+        else:
+            temperature = _either(temperature, decoded.temperature)
+            dewpoint = _either(dewpoint, decoded.dewpoint)
+
+        return cls(
+            station=intern(str(data.get("icaoId") or "")),
+            raw=raw,
+            report_time=_text(data.get("reportTime")),
+            obs_time=_number(data.get("obsTime")),
+            metar_type=intern(_text(data.get("metarType")) or "METAR"),
+            flight_category=intern(flight_category) if flight_category else None,
+            temperature=temperature,
+            dewpoint=dewpoint,
+            wind_direction=_either(data.get("wdir"), decoded.wind_direction),
+            wind_speed=_either(_number(data.get("wspd")), decoded.wind_speed),
+            wind_gust=_either(_number(data.get("wgst")), decoded.wind_gust),
+            visibility=data.get("visib"),
+            altimeter=_either(_number(data.get("altim")), decoded.altimeter),
+            sea_level_pressure=_either(_number(data.get("slp")), decoded.sea_level_pressure),
+            wind_variable_from=decoded.wind_variable_from,
+            wind_variable_to=decoded.wind_variable_to,
+            runway_visual_range=decoded.runway_visual_range,
+            weather=_text(data.get("wxString")),
+            clouds=_clouds(data.get("clouds")),
+            latitude=_number(data.get("lat")),
+            longitude=_number(data.get("lon")),
+            elevation=_number(data.get("elev")),
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Encode the report with the API's field names."""
+        return {
+            "icaoId": self.station,
+            "rawOb": self.raw,
+            "reportTime": self.report_time,
+            "obsTime": self.obs_time,
+            "metarType": self.metar_type,
+            "fltCat": self.flight_category,
+            "temp": self.temperature,
+            "dewp": self.dewpoint,
+            "wdir": self.wind_direction,
+            "wspd": self.wind_speed,
+            "wgst": self.wind_gust,
+            "visib": self.visibility,
+            "altim": self.altimeter,
+            "slp": self.sea_level_pressure,
+            "wxString": self.weather,
+            "clouds": [layer.as_dict() for layer in self.clouds],
+            "lat": self.latitude,
+            "lon": self.longitude,
+            "elev": self.elevation,
+        }
+
+    @property
+    def identity(self) -> tuple:
+        """Return the identity (station, observation time, raw text) of the report.
+
+        The JSON API's report time is the nominal hour of the report, while the
+        bulk cache file only has the observation time. Both agree on the
+        observation time, so a report is the same whichever feed it came from.
+        """
+        return (self.station, self.obs_time or self.report_time, self.raw)
+
+    @property
+    def issued(self) -> str | None:
+        """Return when the report was observed, or its report time if unknown."""
+        if self.obs_time is None:
+            return self.report_time
+        return datetime.fromtimestamp(self.obs_time, timezone.utc).isoformat()
+
+    @property
+    def routine(self) -> bool:
+        """Return True for a scheduled METAR, False for an unscheduled SPECI."""
+        return self.metar_type == "METAR"
+
+    @property
+    def sort_key(self) -> tuple[int, str]:
+        """Return a key ordering reports of one station from oldest to newest."""
+        return (self.obs_time or 0, self.report_time or "")
+
+
+@dataclass(slots=True, frozen=True)
+class TafReport:
+    """A decoded terminal aerodrome forecast."""
+
+    # Fields kept when an API response is parsed
+    API_FIELDS: ClassVar[tuple[str, ...]] = (
+        "icaoId", "rawTAF", "issueTime", "validTimeFrom", "validTimeTo",
+        "lat", "lon", "elev", "fcsts",
+    )
+
+    station: str
+    raw: str | None
+    issue_time: str | None
+    valid_from: int | None = None
+    valid_to: int | None = None
+    latitude: float | None = None
+    longitude: float | None = None
+    elevation: float | None = None
+    periods: tuple[ForecastPeriod, ...] = ()
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "TafReport":
+        """Decode a forecast from the API's field names."""
+        periods = data.get("fcsts")
+        return cls(
+            station=intern(str(data.get("icaoId") or "")),
+            raw=_text(data.get("rawTAF")),
+            issue_time=_text(data.get("issueTime")),
+            valid_from=_number(data.get("validTimeFrom")),
+            valid_to=_number(data.get("validTimeTo")),
+            latitude=_number(data.get("lat")),
+            longitude=_number(data.get("lon")),
+            elevation=_number(data.get("elev")),
+            periods=tuple(
+                ForecastPeriod.from_dict(period) for period in periods if isinstance(period, dict)
+            ) if isinstance(periods, list) else (),
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Encode the forecast with the API's field names."""
+        return {
+            "icaoId": self.station,
+            "rawTAF": self.raw,
+            "issueTime": self.issue_time,
+            "validTimeFrom": self.valid_from,
+            "validTimeTo": self.valid_to,
+            "lat": self.latitude,
+            "lon": self.longitude,
+            "elev": self.elevation,
+            "fcsts": [period.as_dict() for period in self.periods],
+        }
+
+    @property
+    def identity(self) -> tuple:
+        """Return the identity (station, issue time, raw text) of the forecast."""
+        return (self.station, self.issue_time, self.raw)
+
+    @property
+    def issued(self) -> str | None:
+        """Return when the forecast was issued."""
+        return self.issue_time
+
+    @property
+    def sort_key(self) -> tuple[int, str]:
+        """Return a key ordering forecasts of one station from oldest to newest."""
+        return (0, self.issue_time or "")
+
+
+Report = MetarReport | TafReport
+
+REPORT_TYPES: dict[str, type[MetarReport] | type[TafReport]] = {
+    FEED_METAR: MetarReport,
+    FEED_TAF: TafReport,
+}
@@ -0,0 +1,91 @@
+"""Rate limiting for requests to AviationWeather.gov."""
+import asyncio
+import random
+import time
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse a Retry-After header (delay in seconds or HTTP date) into seconds."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class TokenBucketLimiter:
+    """Token bucket shared by every request to the API.
+
+    Callers wait in FIFO order for a token instead of being dropped. After a
+    429 or server error the bucket is paused for the server's Retry-After
+    delay, or for an exponential backoff with jitter when none is given.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int,
+        backoff_base: float,
+        backoff_max: float,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ) -> None:
+        """Initialize the limiter with a refill rate in tokens per second."""
+        self._rate = rate
+        self._burst = burst
+        self._backoff_base = backoff_base
+        self._backoff_max = backoff_max
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._blocked_until = 0.0
+        self._failures = 0
+        self._lock = asyncio.Lock()
+
+    @property
+    def failures(self) -> int:
+        """Return the number of consecutive throttled or failed requests."""
+        return self._failures
+
+    async def async_acquire(self) -> None:
+        """Wait until a request may be sent."""
+        async with self._lock:
+            while True:
+                now = self._clock()
+                if now < self._blocked_until:
+                    await self._sleep(self._blocked_until - now)
+                    continue
+
+                self._tokens = min(self._burst, self._tokens + (now - self._updated) * self._rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await self._sleep((1 - self._tokens) / self._rate)
+
+    def penalize(self, retry_after: float | None = None) -> float:
+        """Pause all requests after a throttled or failed request; return the delay."""
+        self._failures += 1
+        if retry_after is None:
+            delay = min(self._backoff_max, self._backoff_base * 2 ** (self._failures - 1))
+            # Full jitter keeps many waiting callers from retrying in lockstep
+            delay = random.uniform(delay / 2, delay)
+        else:
+            delay = min(self._backoff_max, retry_after)
+        self._blocked_until = max(self._blocked_until, self._clock() + delay)
+        return delay
+
+    def reset(self) -> None:
+        """Clear the backoff after a successful request."""
+        self._failures = 0
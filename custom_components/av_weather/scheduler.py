@@ -0,0 +1,125 @@
+"""Issuance-aware polling scheduler for Av Weather."""
+import math
+from collections import deque
+from datetime import datetime, timedelta
+
+# Number of observed issuances kept per station
+MAX_SAMPLES = 8
+
+# Issuances needed before a station's pattern is trusted
+MIN_SAMPLES = 2
+
+
+class _StationPattern:
+    """Observed issuance history of one station."""
+
+    __slots__ = ("offsets", "last_issued")
+
+    def __init__(self) -> None:
+        """Initialize an empty pattern."""
+        self.offsets: deque[float] = deque(maxlen=MAX_SAMPLES)
+        self.last_issued: float | None = None
+
+
+class IssuanceScheduler:
+    """Learn when stations issue routine reports and plan the next poll.
+
+    Each station's issuance offset within the reporting cycle (for example the
+    minute past the hour for METARs, or the offset within the 6-hourly TAF
+    cycle) is learned from observed report times. Polling is fast inside the
+    window around the expected issuance, and backs off once the report for
+    the current cycle has arrived.
+    """
+
+    def __init__(
+        self,
+        cycle: timedelta,
+        window_before: timedelta,
+        window_after: timedelta,
+        fast_interval: timedelta,
+        backoff_factor: int = 3,
+    ) -> None:
+        """Initialize the scheduler."""
+        self._cycle = cycle.total_seconds()
+        self._before = window_before.total_seconds()
+        self._after = window_after.total_seconds()
+        self._fast = fast_interval
+        self._backoff_factor = backoff_factor
+        self._stations: dict[str, _StationPattern] = {}
+
+    def observe(self, station: str, issued: datetime, routine: bool = True) -> bool:
+        """Record an issuance; return True if it is a routine one newer than the last.
+
+        Unscheduled reports such as SPECIs say nothing about the routine
+        cycle, so they are ignored.
+        """
+        if not routine:
+            return False
+        pattern = self._stations.setdefault(station, _StationPattern())
+        timestamp = issued.timestamp()
+        if pattern.last_issued is not None and timestamp <= pattern.last_issued:
+            return False
+        pattern.last_issued = timestamp
+        pattern.offsets.append(timestamp % self._cycle)
+        return True
+
+    def forget(self, stations: set[str]) -> None:
+        """Drop the patterns of stations that are no longer tracked."""
+        for station in stations:
+            self._stations.pop(station, None)
+
+    def expected_offset(self, station: str) -> float | None:
+        """Return the learned issuance offset (seconds into the cycle) of a station."""
+        pattern = self._stations.get(station)
+        if pattern is None or len(pattern.offsets) < MIN_SAMPLES:
+            return None
+
+        # Circular mean, so offsets either side of the cycle boundary average correctly
+        sin_sum = cos_sum = 0.0
+        for offset in pattern.offsets:
+            angle = 2 * math.pi * offset / self._cycle
+            sin_sum += math.sin(angle)
+            cos_sum += math.cos(angle)
+        angle = math.atan2(sin_sum, cos_sum) % (2 * math.pi)
+        return angle * self._cycle / (2 * math.pi)
+
+    def next_delay(self, now: datetime, idle_interval: timedelta) -> timedelta:
+        """Return how long to wait before the next poll."""
+        delays = [
+            self._station_delay(station, pattern, now.timestamp(), idle_interval)
+            for station, pattern in self._stations.items()
+        ]
+        if not delays:
+            return idle_interval
+        return max(self._fast, min(delays))
+
+    def _station_delay(
+        self,
+        station: str,
+        pattern: _StationPattern,
+        now: float,
+        idle_interval: timedelta,
+    ) -> timedelta:
+        """Return the preferred delay for a single station."""
+        offset = self.expected_offset(station)
+        if offset is None or pattern.last_issued is None:
+            return idle_interval
+
+        # Latest expected issuance whose polling window has already opened
+        reference = now + self._before
+        expected = reference - ((reference - offset) % self._cycle)
+
+        if pattern.last_issued >= expected - self._before:
+            # This cycle's report is in: back off until the next window opens
+            next_window = expected + self._cycle - self._before
+            return min(
+                timedelta(seconds=next_window - now),
+                idle_interval * self._backoff_factor,
+            )
+
+        if now <= expected + self._after:
+            # Inside the window and still waiting for the report
+            return self._fast
+
+        # The report is late; fall back to the regular interval
+        return idle_interval
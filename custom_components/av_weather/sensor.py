@@ -3,28 +3,52 @@ import logging
 from datetime import datetime
 from typing import Any
 
-from homeassistant.components.sensor import SensorEntity
+from homeassistant.components.sensor import SensorDeviceClass, SensorEntity, SensorStateClass
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import CONF_NAME, EntityCategory
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.device_registry import DeviceEntryType
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.util import dt as dt_util
 
 from .const import (
     DOMAIN,
+    CONF_ENTRY_TYPE,
     CONF_ICAO_CODES,
     CONF_FEEDS,
+    CONF_MINIMA,
+    CONF_RUNWAYS,
+    ENTRY_TYPE_REGION,
     FEED_METAR,
     FEED_TAF,
     METAR_SENSOR_NAME,
     TAF_SENSOR_NAME,
+    TAF_CATEGORY_SENSOR_NAME,
+    TAF_CHANGE_SENSOR_NAME,
+    REGION_SENSOR_NAME,
+    API_SENSOR_NAME,
 )
 from .api import AviationWeatherApi
+from .coordinator import AvWeatherFeedCoordinator, AvWeatherRegionCoordinator
 from .airports import get_airport_by_icao
+from .derived import derive_metrics, parse_runways
+from .flight_category import ceiling_ft, flight_category as classify_flight_category, minima_from_config
+from .models import MetarReport, Report, TafReport
+from .taf_timeline import TafTimeline, build_timeline
 
 _LOGGER = logging.getLogger(__name__)
 
+CATEGORY_ICONS = {
+    "VFR": "mdi:weather-sunny",
+    "MVFR": "mdi:weather-partly-cloudy",
+    "IFR": "mdi:weather-cloudy",
+    "LIFR": "mdi:weather-fog",
+}
+DEFAULT_ICON = "mdi:weather-partly-cloudy"
+
 
 def _format_airport_name_sync(icao: str) -> str:
     """Format airport name synchronously for device_info (uses cache)."""
@@ -55,44 +79,60 @@ def _format_airport_name_sync(icao: str) -> str:
     return icao
 
 
+@callback
+def _async_add_api_sensors(hass: HomeAssistant, async_add_entities: AddEntitiesCallback) -> None:
+    """Add the diagnostic sensors of the shared API."""
+    async_add_entities(
+        [ApiMetricsSensor(hass.data[DOMAIN]["api"], feed_type) for feed_type in (FEED_METAR, FEED_TAF)]
+    )
+
+
+@callback
+def async_hand_over_api_sensors(hass: HomeAssistant, entry_id: str) -> None:
+    """Move the API diagnostic sensors away from an entry being unloaded."""
+    domain_data = hass.data[DOMAIN]
+    domain_data.get("entity_adders", {}).pop(entry_id, None)
+    if domain_data.get("diagnostics_entry") != entry_id:
+        return
+    domain_data.pop("diagnostics_entry")
+    for other_entry_id, async_add_entities in domain_data.get("entity_adders", {}).items():
+        domain_data["diagnostics_entry"] = other_entry_id
+        _async_add_api_sensors(hass, async_add_entities)
+        return
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
     async_add_entities: AddEntitiesCallback
 ) -> None:
     """Set up Av Weather sensors from a config entry."""
+    # The API is shared, so its diagnostic sensors belong to one entry at a time.
+    # Every entry keeps its callback so another can take them over on unload.
+    domain_data = hass.data[DOMAIN]
+    domain_data.setdefault("entity_adders", {})[entry.entry_id] = async_add_entities
+    if domain_data.setdefault("diagnostics_entry", entry.entry_id) == entry.entry_id:
+        _async_add_api_sensors(hass, async_add_entities)
+
+    if entry.data.get(CONF_ENTRY_TYPE) == ENTRY_TYPE_REGION:
+        _async_setup_region_entry(hass, entry, async_add_entities)
+        return
+
     icao_codes: str = entry.data[CONF_ICAO_CODES]
     feeds: list = entry.data[CONF_FEEDS]
     
-    session = async_get_clientsession(hass)
-    api = AviationWeatherApi(session)
+    coordinators: dict[str, AvWeatherFeedCoordinator] = hass.data[DOMAIN]["coordinators"]
     
-    # Store API instance and entities in hass.data for service calls
-    if "apis" not in hass.data[DOMAIN]:
-        hass.data[DOMAIN]["apis"] = {}
+    # Store entities in hass.data for service calls
     if "entities" not in hass.data[DOMAIN]:
         hass.data[DOMAIN]["entities"] = {}
     
-    hass.data[DOMAIN]["apis"][entry.entry_id] = api
-    
-    # Fetch initial data
-    initial_metar_data = []
-    initial_taf_data = []
-    
-    if FEED_METAR in feeds:
-        _LOGGER.info("Fetching initial METAR data for %s", icao_codes)
-        initial_metar_data = await api.async_get_metar_data(icao_codes)
-    
-    if FEED_TAF in feeds:
-        _LOGGER.info("Fetching initial TAF data for %s", icao_codes)
-        initial_taf_data = await api.async_get_taf_data(icao_codes)
-    
     # Create entities
     entities = []
     for icao_code in icao_codes.split(","):
         icao_code = icao_code.strip()
         if FEED_METAR in feeds:
-            entity = MetarSensor(hass, entry, api, icao_code, initial_metar_data)
+            entity = MetarSensor(hass, entry, coordinators[FEED_METAR], icao_code)
             entities.append(entity)
             # Store entity reference for service calls
             if icao_code not in hass.data[DOMAIN]["entities"]:
@@ -100,55 +140,100 @@ async def async_setup_entry(
             hass.data[DOMAIN]["entities"][icao_code].append(entity)
             
         if FEED_TAF in feeds:
-            entity = TafSensor(hass, entry, api, icao_code, initial_taf_data)
-            entities.append(entity)
-            # Store entity reference for service calls
-            if icao_code not in hass.data[DOMAIN]["entities"]:
-                hass.data[DOMAIN]["entities"][icao_code] = []
-            hass.data[DOMAIN]["entities"][icao_code].append(entity)
+            for sensor_class in (TafSensor, TafCategorySensor, TafNextChangeSensor):
+                entity = sensor_class(hass, entry, coordinators[FEED_TAF], icao_code)
+                entities.append(entity)
+                # Store entity reference for service calls
+                if icao_code not in hass.data[DOMAIN]["entities"]:
+                    hass.data[DOMAIN]["entities"][icao_code] = []
+                hass.data[DOMAIN]["entities"][icao_code].append(entity)
     
+    # Entities start from the cached reports; fresh data is fetched for all
+    # entries at once after startup (see AvWeatherInitialRefresh)
     async_add_entities(entities, False)
 
 
-class AvWeatherSensor(SensorEntity):
+@callback
+def _async_setup_region_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback
+) -> None:
+    """Set up the aggregate sensors of a region entry."""
+    region_coordinators: dict[str, AvWeatherRegionCoordinator] = hass.data[DOMAIN]["regions"][entry.entry_id]
+    async_add_entities(
+        [RegionSensor(entry, coordinator) for coordinator in region_coordinators.values()],
+        False,
+    )
+
+
+class AvWeatherSensor(CoordinatorEntity[AvWeatherFeedCoordinator], SensorEntity):
     """Base class for Av Weather sensors."""
 
     _attr_should_poll = False
+    _feed_type: str
 
     def __init__(
         self,
         hass: HomeAssistant,
         entry: ConfigEntry,
-        api: AviationWeatherApi,
+        coordinator: AvWeatherFeedCoordinator,
         icao_code: str,
-        initial_data: list[dict[str, Any]]
     ):
         """Initialize the sensor."""
+        super().__init__(coordinator)
         self.hass = hass
         self._entry = entry
-        self._api = api
         self._icao_code = icao_code.upper()
         self._attr_attribution = "Data provided by AviationWeather.gov"
-        self._data: dict[str, Any] | None = None
+        self._data: Report | None = None
+        self._report_id: tuple | None = None
+        self._last_checked: datetime | None = None
         
         # Set initial data
-        self._update_from_data_list(initial_data)
-
-    def _update_from_data_list(self, data_list: list[dict[str, Any]]) -> None:
-        """Update sensor from a list of station data."""
-        if data_list:
-            for station_data in data_list:
-                if station_data.get("icaoId") == self._icao_code:
-                    self._data = station_data
-                    self._update_state()
-                    return
-        # No data found for this station
-        self._data = None
+        self._update_from_station_data(self._station_data())
+
+    def _station_data(self) -> Report | None:
+        """Return this station's report from the station-indexed coordinator data."""
+        return (self.coordinator.data or {}).get(self._icao_code)
+
+    def _update_from_station_data(self, station_data: Report | None) -> bool:
+        """Update sensor from the station's report.
+
+        Returns False when the station's report is the one already shown, in
+        which case only the last checked time is updated.
+        """
+        self._last_checked = dt_util.utcnow()
+        report_id = station_data.identity if station_data else None
+        if report_id == self._report_id:
+            return False
+
+        # No data found for this station leaves _data as None
+        self._data = station_data
+        self._report_id = report_id
         self._update_state()
+        return True
 
-    async def async_update_weather(self, feed_type: str | None = None) -> None:
-        """Update weather data via service call."""
-        raise NotImplementedError
+    @property
+    def feed_type(self) -> str:
+        """Return the feed this sensor reports."""
+        return self._feed_type
+
+    @property
+    def icao_code(self) -> str:
+        """Return the ICAO code of the station."""
+        return self._icao_code
+
+    @property
+    def last_checked(self) -> datetime | None:
+        """Return when the station's report was last checked for changes."""
+        return self._last_checked
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Update the sensor from the shared coordinator data."""
+        if self._update_from_station_data(self._station_data()):
+            self.async_write_ha_state()
 
     @property
     def available(self) -> bool:
@@ -175,30 +260,25 @@ class AvWeatherSensor(SensorEntity):
 class MetarSensor(AvWeatherSensor):
     """Representation of a METAR sensor."""
 
+    _feed_type = FEED_METAR
+
     def __init__(
         self,
         hass: HomeAssistant,
         entry: ConfigEntry,
-        api: AviationWeatherApi,
+        coordinator: AvWeatherFeedCoordinator,
         icao_code: str,
-        initial_data: list[dict[str, Any]]
     ):
         """Initialize the METAR sensor."""
-        super().__init__(hass, entry, api, icao_code, initial_data)
+        # Set before the base class shows the coordinator's current report
+        self._minima = minima_from_config(entry.data.get(CONF_MINIMA))
+        runways = parse_runways(entry.data.get(CONF_RUNWAYS))
+        self._runways = runways.get(icao_code.upper()) or runways.get("", ())
+        super().__init__(hass, entry, coordinator, icao_code)
         self._attr_name = f"{icao_code} {METAR_SENSOR_NAME}"
         self._attr_unique_id = f"{self._icao_code}_{METAR_SENSOR_NAME}"
         self._attr_icon = "mdi:weather-partly-cloudy"
 
-    async def async_update_weather(self, feed_type: str | None = None) -> None:
-        """Update METAR data via service call."""
-        if feed_type and feed_type != FEED_METAR:
-            return
-        
-        _LOGGER.info("Updating METAR data for %s", self._icao_code)
-        data_list = await self._api.async_get_metar_data(self._icao_code)
-        self._update_from_data_list(data_list)
-        self.async_write_ha_state()
-
     def _update_state(self) -> None:
         """Update the state and attributes of the sensor."""
         if not self._data:
@@ -207,23 +287,15 @@ class MetarSensor(AvWeatherSensor):
             self._attr_icon = "mdi:weather-partly-cloudy"
             return
 
-        self._attr_native_value = self._data.get("rawOb")
+        report: MetarReport = self._data
+        self._attr_native_value = report.raw
         
         # Update icon based on flight category
-        flight_category = self._data.get("fltCat")
-        if flight_category == "VFR":
-            self._attr_icon = "mdi:weather-sunny"
-        elif flight_category == "MVFR":
-            self._attr_icon = "mdi:weather-partly-cloudy"
-        elif flight_category == "IFR":
-            self._attr_icon = "mdi:weather-cloudy"
-        elif flight_category == "LIFR":
-            self._attr_icon = "mdi:weather-fog"
-        else:
-            self._attr_icon = "mdi:weather-partly-cloudy"
+        flight_category = report.flight_category
+        self._attr_icon = CATEGORY_ICONS.get(flight_category, DEFAULT_ICON)
         
         # Parse observation time
-        obs_time_str = self._data.get("reportTime")
+        obs_time_str = report.report_time
         if obs_time_str:
             try:
                 obs_time = dt_util.parse_datetime(obs_time_str)
@@ -237,67 +309,79 @@ class MetarSensor(AvWeatherSensor):
             self._attr_extra_state_attributes = {}
 
         # Basic attributes
-        self._attr_extra_state_attributes["raw_report"] = self._data.get("rawOb")
-        self._attr_extra_state_attributes["station_id"] = self._data.get("icaoId")
-        self._attr_extra_state_attributes["temperature_c"] = self._data.get("temp")
-        self._attr_extra_state_attributes["dewpoint_c"] = self._data.get("dewp")
-        self._attr_extra_state_attributes["wind_speed_kts"] = self._data.get("wspd")
-        self._attr_extra_state_attributes["wind_gust_kts"] = self._data.get("wgst")
-        self._attr_extra_state_attributes["wind_direction_deg"] = self._data.get("wdir")
-        self._attr_extra_state_attributes["visibility_mi"] = self._data.get("visib")
-        self._attr_extra_state_attributes["altimeter_in_hg"] = self._data.get("altim")
-        self._attr_extra_state_attributes["sea_level_pressure_mb"] = None  # Not in new API
+        self._attr_extra_state_attributes["raw_report"] = report.raw
+        self._attr_extra_state_attributes["station_id"] = report.station
+        self._attr_extra_state_attributes["temperature_c"] = report.temperature
+        self._attr_extra_state_attributes["dewpoint_c"] = report.dewpoint
+        self._attr_extra_state_attributes["wind_speed_kts"] = report.wind_speed
+        self._attr_extra_state_attributes["wind_gust_kts"] = report.wind_gust
+        self._attr_extra_state_attributes["wind_direction_deg"] = report.wind_direction
+        self._attr_extra_state_attributes["visibility_mi"] = report.visibility
+        self._attr_extra_state_attributes["altimeter_in_hg"] = report.altimeter
+        self._attr_extra_state_attributes["sea_level_pressure_mb"] = report.sea_level_pressure
         self._attr_extra_state_attributes["flight_category"] = flight_category
+        if self._minima is not None:
+            self._attr_extra_state_attributes["custom_flight_category"] = classify_flight_category(
+                report.visibility, report.clouds, self._minima
+            )
+        
+        # Variable wind direction and runway visual range, decoded from the raw report
+        if report.wind_variable_from is not None:
+            self._attr_extra_state_attributes["wind_variable_from_deg"] = report.wind_variable_from
+            self._attr_extra_state_attributes["wind_variable_to_deg"] = report.wind_variable_to
+        if report.runway_visual_range:
+            self._attr_extra_state_attributes["runway_visual_range"] = [
+                rvr.as_dict() for rvr in report.runway_visual_range
+            ]
+        
+        # Density altitude, humidity, cloud base and runway winds, computed once per report
+        self._attr_extra_state_attributes.update(derive_metrics(report, self._runways).as_attributes())
+
+        # Trends over the station's recent observations
+        if self.coordinator.history is not None:
+            self._attr_extra_state_attributes.update(self.coordinator.history.trends(self._icao_code))
         
         # Cloud coverage
-        clouds = self._data.get("clouds", [])
-        if clouds:
+        if report.clouds:
             self._attr_extra_state_attributes["cloud_coverage"] = [
-                f'{c.get("cover", "Unknown")} at {c.get("base", "N/A")} ft AGL' for c in clouds
+                f'{layer.cover or "Unknown"} at {layer.base if layer.base is not None else "N/A"} ft AGL'
+                for layer in report.clouds
             ]
         
         # Weather phenomena
-        wx_string = self._data.get("wxString")
-        if wx_string:
-            self._attr_extra_state_attributes["weather"] = wx_string
+        if report.weather:
+            self._attr_extra_state_attributes["weather"] = report.weather
         
         # Latitude/Longitude
-        if self._data.get("lat") is not None and self._data.get("lon") is not None:
-            self._attr_extra_state_attributes["latitude"] = self._data.get("lat")
-            self._attr_extra_state_attributes["longitude"] = self._data.get("lon")
+        if report.latitude is not None and report.longitude is not None:
+            self._attr_extra_state_attributes["latitude"] = report.latitude
+            self._attr_extra_state_attributes["longitude"] = report.longitude
         
         # Elevation
-        if self._data.get("elev") is not None:
-            self._attr_extra_state_attributes["elevation_m"] = self._data.get("elev")
+        if report.elevation is not None:
+            self._attr_extra_state_attributes["elevation_m"] = report.elevation
 
 
 class TafSensor(AvWeatherSensor):
     """Representation of a TAF sensor."""
 
+    _feed_type = FEED_TAF
+    # The decoded periods are large and only change with the forecast
+    _unrecorded_attributes = frozenset({"forecast_periods"})
+
     def __init__(
         self,
         hass: HomeAssistant,
         entry: ConfigEntry,
-        api: AviationWeatherApi,
+        coordinator: AvWeatherFeedCoordinator,
         icao_code: str,
-        initial_data: list[dict[str, Any]]
     ):
         """Initialize the TAF sensor."""
-        super().__init__(hass, entry, api, icao_code, initial_data)
+        super().__init__(hass, entry, coordinator, icao_code)
         self._attr_name = f"{icao_code} {TAF_SENSOR_NAME}"
         self._attr_unique_id = f"{self._icao_code}_{TAF_SENSOR_NAME}"
         self._attr_icon = "mdi:weather-cloudy-clock"
 
-    async def async_update_weather(self, feed_type: str | None = None) -> None:
-        """Update TAF data via service call."""
-        if feed_type and feed_type != FEED_TAF:
-            return
-        
-        _LOGGER.info("Updating TAF data for %s", self._icao_code)
-        data_list = await self._api.async_get_taf_data(self._icao_code)
-        self._update_from_data_list(data_list)
-        self.async_write_ha_state()
-
     def _update_state(self) -> None:
         """Update the state and attributes of the sensor."""
         if not self._data:
@@ -305,42 +389,297 @@ class TafSensor(AvWeatherSensor):
             self._attr_extra_state_attributes = {}
             return
 
-        self._attr_native_value = self._data.get("rawTAF")
+        report: TafReport = self._data
+        self._attr_native_value = report.raw
         self._attr_extra_state_attributes = {
-            "raw_forecast": self._data.get("rawTAF"),
-            "station_id": self._data.get("icaoId"),
+            "raw_forecast": report.raw,
+            "station_id": report.station,
         }
 
         # Parse issue and valid times
-        issue_time = self._data.get("issueTime")
-        if issue_time:
-            self._attr_extra_state_attributes["issue_time"] = issue_time
+        if report.issue_time:
+            self._attr_extra_state_attributes["issue_time"] = report.issue_time
             
-        valid_from = self._data.get("validTimeFrom")
-        if valid_from:
+        if report.valid_from:
             # Convert Unix timestamp to ISO format
             try:
-                from datetime import datetime
-                valid_from_dt = datetime.fromtimestamp(valid_from, tz=dt_util.UTC)
+                valid_from_dt = datetime.fromtimestamp(report.valid_from, tz=dt_util.UTC)
                 self._attr_extra_state_attributes["valid_time_from"] = valid_from_dt.isoformat()
-            except (ValueError, TypeError):
-                self._attr_extra_state_attributes["valid_time_from"] = valid_from
+            except (ValueError, TypeError, OverflowError):
+                self._attr_extra_state_attributes["valid_time_from"] = report.valid_from
             
-        valid_to = self._data.get("validTimeTo")
-        if valid_to:
+        if report.valid_to:
             # Convert Unix timestamp to ISO format
             try:
-                from datetime import datetime
-                valid_to_dt = datetime.fromtimestamp(valid_to, tz=dt_util.UTC)
+                valid_to_dt = datetime.fromtimestamp(report.valid_to, tz=dt_util.UTC)
                 self._attr_extra_state_attributes["valid_time_to"] = valid_to_dt.isoformat()
-            except (ValueError, TypeError):
-                self._attr_extra_state_attributes["valid_time_to"] = valid_to
+            except (ValueError, TypeError, OverflowError):
+                self._attr_extra_state_attributes["valid_time_to"] = report.valid_to
         
         # Add latitude/longitude if available
-        if self._data.get("lat") is not None and self._data.get("lon") is not None:
-            self._attr_extra_state_attributes["latitude"] = self._data.get("lat")
-            self._attr_extra_state_attributes["longitude"] = self._data.get("lon")
+        if report.latitude is not None and report.longitude is not None:
+            self._attr_extra_state_attributes["latitude"] = report.latitude
+            self._attr_extra_state_attributes["longitude"] = report.longitude
         
         # Add elevation
-        if self._data.get("elev") is not None:
-            self._attr_extra_state_attributes["elevation_m"] = self._data.get("elev")
+        if report.elevation is not None:
+            self._attr_extra_state_attributes["elevation_m"] = report.elevation
+
+        # Decoded forecast periods with their flight category
+        if report.periods:
+            self._attr_extra_state_attributes["forecast_periods"] = build_timeline(report).as_list()
+
+
+class TafTimelineSensor(AvWeatherSensor):
+    """Base class for sensors derived from a TAF's forecast timeline.
+
+    Their state depends on the time as well as on the forecast, so besides
+    coordinator updates they re-evaluate when the next period starts or ends.
+    """
+
+    _feed_type = FEED_TAF
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        coordinator: AvWeatherFeedCoordinator,
+        icao_code: str,
+    ):
+        """Initialize the sensor."""
+        self._unsub_timer: CALLBACK_TYPE | None = None
+        super().__init__(hass, entry, coordinator, icao_code)
+
+    async def async_added_to_hass(self) -> None:
+        """Start tracking the forecast's period boundaries."""
+        await super().async_added_to_hass()
+        self._async_schedule_update()
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Stop tracking the forecast's period boundaries."""
+        self._async_cancel_update()
+        await super().async_will_remove_from_hass()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Update the sensor and track the new forecast's boundaries."""
+        super()._handle_coordinator_update()
+        self._async_schedule_update()
+
+    @callback
+    def _async_cancel_update(self) -> None:
+        """Cancel the pending boundary update."""
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+
+    @callback
+    def _async_schedule_update(self) -> None:
+        """Schedule an update for the next period boundary of the forecast."""
+        self._async_cancel_update()
+        timeline = self._timeline()
+        if timeline is None:
+            return
+        boundary = timeline.next_boundary(dt_util.utcnow().timestamp())
+        if boundary is None:
+            return
+        self._unsub_timer = async_track_point_in_utc_time(
+            self.hass, self._async_boundary_reached, dt_util.utc_from_timestamp(boundary)
+        )
+
+    @callback
+    def _async_boundary_reached(self, now: datetime) -> None:
+        """Re-evaluate the forecast when a period starts or ends."""
+        self._unsub_timer = None
+        self._update_state()
+        self.async_write_ha_state()
+        self._async_schedule_update()
+
+    def _timeline(self) -> TafTimeline | None:
+        """Return the timeline of the current forecast."""
+        return build_timeline(self._data) if self._data else None
+
+
+class TafCategorySensor(TafTimelineSensor):
+    """Flight category forecast for the current time."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        coordinator: AvWeatherFeedCoordinator,
+        icao_code: str,
+    ):
+        """Initialize the forecast category sensor."""
+        super().__init__(hass, entry, coordinator, icao_code)
+        self._attr_name = f"{icao_code} {TAF_CATEGORY_SENSOR_NAME}"
+        self._attr_unique_id = f"{self._icao_code}_{TAF_SENSOR_NAME}_category"
+
+    def _update_state(self) -> None:
+        """Update the state and attributes of the sensor."""
+        timeline = self._timeline()
+        if timeline is None:
+            self._attr_native_value = None
+            self._attr_extra_state_attributes = {}
+            self._attr_icon = DEFAULT_ICON
+            return
+
+        now = dt_util.utcnow().timestamp()
+        segment = timeline.prevailing_at(now)
+        self._attr_native_value = segment.category if segment else None
+        self._attr_icon = CATEGORY_ICONS.get(self._attr_native_value, DEFAULT_ICON)
+        self._attr_extra_state_attributes = {
+            "station_id": self._data.station,
+            "issue_time": self._data.issue_time,
+            # Includes TEMPO and PROB groups in force
+            "worst_category": timeline.worst_category_at(now),
+        }
+        if segment is not None:
+            self._attr_extra_state_attributes.update({
+                "change": segment.change,
+                "valid_until": dt_util.utc_from_timestamp(segment.end).isoformat(),
+                "visibility_mi": segment.visibility,
+                "ceiling_ft": ceiling_ft(segment.clouds),
+                "weather": segment.weather,
+            })
+
+
+class TafNextChangeSensor(TafTimelineSensor):
+    """Time of the next forecast change of flight category."""
+
+    _attr_device_class = SensorDeviceClass.TIMESTAMP
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        coordinator: AvWeatherFeedCoordinator,
+        icao_code: str,
+    ):
+        """Initialize the next category change sensor."""
+        super().__init__(hass, entry, coordinator, icao_code)
+        self._attr_name = f"{icao_code} {TAF_CHANGE_SENSOR_NAME}"
+        self._attr_unique_id = f"{self._icao_code}_{TAF_SENSOR_NAME}_next_change"
+        self._attr_icon = "mdi:clock-alert-outline"
+
+    def _update_state(self) -> None:
+        """Update the state and attributes of the sensor."""
+        timeline = self._timeline()
+        if timeline is None:
+            self._attr_native_value = None
+            self._attr_extra_state_attributes = {}
+            return
+
+        now = dt_util.utcnow().timestamp()
+        segment = timeline.prevailing_at(now)
+        change = timeline.next_change(now)
+        self._attr_native_value = dt_util.utc_from_timestamp(change[0]) if change else None
+        self._attr_extra_state_attributes = {
+            "station_id": self._data.station,
+            "current_category": segment.category if segment else None,
+            "next_category": change[1] if change else None,
+        }
+
+
+class RegionSensor(CoordinatorEntity[AvWeatherRegionCoordinator], SensorEntity):
+    """Aggregate sensor for every station reporting inside a region."""
+
+    _attr_should_poll = False
+    _attr_native_unit_of_measurement = "stations"
+    # The per-station table is large and changes with every report
+    _unrecorded_attributes = frozenset({"stations"})
+
+    def __init__(self, entry: ConfigEntry, coordinator: AvWeatherRegionCoordinator):
+        """Initialize the region sensor."""
+        super().__init__(coordinator)
+        self._entry = entry
+        self._feed_type = coordinator.feed_type
+        region_name = entry.data.get(CONF_NAME, entry.title)
+        self._attr_name = f"{region_name} {coordinator.feed_type} {REGION_SENSOR_NAME}"
+        self._attr_unique_id = f"{entry.entry_id}_{coordinator.feed_type}_{REGION_SENSOR_NAME}"
+        self._attr_icon = "mdi:map-marker-radius"
+        self._attr_attribution = "Data provided by AviationWeather.gov"
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, entry.entry_id)},
+            name=region_name,
+            manufacturer="AviationWeather.gov",
+            model="Weather Region",
+            configuration_url="https://aviationweather.gov/",
+        )
+        self._update_state()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Update the sensor from the region coordinator."""
+        self._update_state()
+        self.async_write_ha_state()
+
+    def _update_state(self) -> None:
+        """Update the state and attributes of the sensor."""
+        data = self.coordinator.data or {}
+        self._attr_native_value = len(data)
+
+        stations: dict[str, dict[str, Any]] = {}
+        category_counts: dict[str, int] = {}
+        for station, report in sorted(data.items()):
+            if isinstance(report, MetarReport):
+                flight_category = report.flight_category
+                stations[station] = {
+                    "raw_report": report.raw,
+                    "observation_time": report.report_time,
+                    "flight_category": flight_category,
+                }
+                if flight_category:
+                    category_counts[flight_category] = category_counts.get(flight_category, 0) + 1
+            else:
+                stations[station] = {
+                    "raw_forecast": report.raw,
+                    "issue_time": report.issue_time,
+                }
+
+        self._attr_extra_state_attributes = {
+            "latitude": self.coordinator.latitude,
+            "longitude": self.coordinator.longitude,
+            "radius_km": self.coordinator.radius_km,
+            "stations": stations,
+        }
+        if self._feed_type == FEED_METAR:
+            self._attr_extra_state_attributes["category_counts"] = category_counts
+
+
+class ApiMetricsSensor(SensorEntity):
+    """Diagnostic sensor with the request metrics of one feed.
+
+    The state is the number of requests made for the feed; the attributes
+    hold the byte, status, timeout and rate limit counters, the latency and
+    parse time histograms, and the report cache counters. Disabled by
+    default.
+    """
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+    _attr_native_unit_of_measurement = "requests"
+    _attr_icon = "mdi:api"
+    # Histograms and counters change with every request
+    _unrecorded_attributes = frozenset({"statuses", "latency_ms", "parse_ms", "cache"})
+
+    def __init__(self, api: AviationWeatherApi, feed_type: str) -> None:
+        """Initialize the sensor."""
+        self._api = api
+        self._feed_type = feed_type
+        self._attr_name = f"{feed_type} {API_SENSOR_NAME}"
+        self._attr_unique_id = f"{DOMAIN}_{feed_type}_api_requests"
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, "api")},
+            name="AviationWeather.gov API",
+            manufacturer="AviationWeather.gov",
+            entry_type=DeviceEntryType.SERVICE,
+            configuration_url="https://aviationweather.gov/data/api/",
+        )
+
+    async def async_update(self) -> None:
+        """Read the feed's current request metrics."""
+        metrics = self._api.metrics.feed(self._feed_type).as_dict()
+        self._attr_native_value = metrics.pop("requests")
+        self._attr_extra_state_attributes = {**metrics, "cache": self._api.cache_stats}
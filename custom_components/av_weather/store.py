@@ -0,0 +1,121 @@
+"""Persistent storage of the last known reports for Av Weather."""
+import logging
+from collections.abc import Iterable
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    HISTORY_HOURS,
+    HISTORY_SIZE,
+    HISTORY_STORAGE_KEY,
+    STORAGE_KEY,
+    STORAGE_VERSION,
+    STORAGE_SAVE_DELAY,
+    TREND_HOURS,
+)
+from .history import ReportHistory
+from .models import REPORT_TYPES, MetarReport, Report
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class AvWeatherReportStore:
+    """Keep the last report of every station on disk, per feed.
+
+    The stored reports seed the coordinators at startup so sensors come up
+    with their last known state without waiting for the network. Reports
+    are stored with the API's field names and only encoded when the delayed
+    write actually runs.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the store."""
+        self._store: Store[dict[str, dict[str, dict[str, Any]]]] = Store(
+            hass, STORAGE_VERSION, STORAGE_KEY
+        )
+        self._reports: dict[str, dict[str, Report]] = {}
+
+    async def async_load(self) -> dict[str, dict[str, Report]]:
+        """Load the stored reports (the file is read in the executor)."""
+        try:
+            stored = await self._store.async_load() or {}
+        except Exception:
+            _LOGGER.exception("Failed to load cached reports, starting empty")
+            stored = {}
+        if not isinstance(stored, dict):
+            _LOGGER.warning("Ignoring cached reports in an unknown format")
+            stored = {}
+
+        self._reports = {}
+        for feed_type, reports in stored.items():
+            model = REPORT_TYPES.get(feed_type)
+            if model is None or not isinstance(reports, dict):
+                continue
+            self._reports[feed_type] = {
+                station: model.from_dict(report)
+                for station, report in reports.items()
+                if isinstance(report, dict)
+            }
+        _LOGGER.debug(
+            "Loaded cached reports: %s",
+            {feed: len(reports) for feed, reports in self._reports.items()},
+        )
+        return self._reports
+
+    def get(self, feed_type: str) -> dict[str, Report]:
+        """Return the stored reports of a feed, indexed by station."""
+        return self._reports.get(feed_type, {})
+
+    @callback
+    def async_update(self, feed_type: str, reports: dict[str, Report]) -> None:
+        """Replace a feed's reports and schedule a delayed write."""
+        self._reports[feed_type] = reports
+        self._store.async_delay_save(self._data_to_save, STORAGE_SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, dict[str, dict[str, Any]]]:
+        """Encode the reports for writing."""
+        return {
+            feed_type: {station: report.as_dict() for station, report in reports.items()}
+            for feed_type, reports in self._reports.items()
+        }
+
+
+class AvWeatherHistoryStore:
+    """Keep the recent METAR observations of every station on disk.
+
+    The history survives restarts, so trends are available right away
+    instead of being rebuilt from the recorder.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the store."""
+        self._store: Store[dict[str, list[list[Any]]]] = Store(
+            hass, STORAGE_VERSION, HISTORY_STORAGE_KEY
+        )
+        self.history = ReportHistory(HISTORY_SIZE, HISTORY_HOURS * 3600)
+
+    async def async_load(self) -> None:
+        """Load the stored history, dropping observations that aged out while stopped."""
+        try:
+            stored = await self._store.async_load() or {}
+        except Exception:
+            _LOGGER.exception("Failed to load report history, starting empty")
+            stored = {}
+
+        self.history.load(stored)
+        self.history.evict(dt_util.utcnow().timestamp() - HISTORY_HOURS * 3600)
+
+    @callback
+    def async_add(self, reports: Iterable[MetarReport]) -> None:
+        """Record new observations and schedule a delayed write."""
+        if self.history.add_reports(reports):
+            self._store.async_delay_save(self.history.as_dict, STORAGE_SAVE_DELAY)
+
+    def trends(self, station: str) -> dict[str, Any]:
+        """Return the trends of a station over the trend window."""
+        history = self.history.get(station)
+        return history.trends(TREND_HOURS) if history is not None else {}
@@ -0,0 +1,191 @@
+"""Decoded TAF forecast-period timeline for Av Weather."""
+from bisect import bisect_right
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any
+
+from .flight_category import (
+    CATEGORY_IFR,
+    CATEGORY_LIFR,
+    CATEGORY_MVFR,
+    CATEGORY_VFR,
+    flight_category,
+)
+from .models import CloudLayer, ForecastPeriod, TafReport
+
+# Change groups that only temporarily or possibly alter the prevailing conditions
+OVERLAY_CHANGES = frozenset({"TEMPO", "PROB"})
+
+# Categories from least to most restrictive
+_SEVERITY = {CATEGORY_VFR: 1, CATEGORY_MVFR: 2, CATEGORY_IFR: 3, CATEGORY_LIFR: 4}
+
+
+@dataclass(slots=True, frozen=True)
+class TimelineSegment:
+    """Conditions forecast between two times, with their flight category."""
+
+    start: int
+    end: int
+    change: str | None
+    probability: int | None
+    visibility: float | str | None
+    weather: str | None
+    clouds: tuple[CloudLayer, ...]
+    wind_direction: float | str | None
+    wind_speed: float | None
+    wind_gust: float | None
+    category: str | None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the segment as a compact attribute value."""
+        return {
+            "start": datetime.fromtimestamp(self.start, tz=timezone.utc).isoformat(),
+            "end": datetime.fromtimestamp(self.end, tz=timezone.utc).isoformat(),
+            "change": self.change,
+            "probability": self.probability,
+            "flight_category": self.category,
+        }
+
+
+def _segment(
+    period: ForecastPeriod,
+    start: int,
+    end: int,
+    base: TimelineSegment | None = None,
+) -> TimelineSegment:
+    """Build a segment from a period, carrying over what it leaves out from ``base``."""
+    def pick(value: Any, inherited: Any) -> Any:
+        return inherited if value is None else value
+
+    visibility = pick(period.visibility, base.visibility if base else None)
+    clouds = period.clouds or (base.clouds if base else ())
+    return TimelineSegment(
+        start=start,
+        end=end,
+        change=period.change,
+        probability=period.probability,
+        visibility=visibility,
+        weather=pick(period.weather, base.weather if base else None),
+        clouds=clouds,
+        wind_direction=pick(period.wind_direction, base.wind_direction if base else None),
+        wind_speed=pick(period.wind_speed, base.wind_speed if base else None),
+        wind_gust=pick(period.wind_gust, base.wind_gust if base else None),
+        category=flight_category(visibility, clouds),
+    )
+
+
+class TafTimeline:
+    """Time-indexed forecast periods of one TAF.
+
+    The base forecast and its FM and BECMG groups form the prevailing
+    conditions: non-overlapping segments sorted by start time and found with
+    a binary search. TEMPO and PROB groups are kept apart as overlays, with
+    whatever they leave out taken from the prevailing conditions. Every
+    segment carries its flight category, computed once when the timeline is
+    built.
+    """
+
+    def __init__(self, report: TafReport) -> None:
+        """Build the timeline of a forecast."""
+        periods = sorted(
+            (period for period in report.periods if period.time_from is not None),
+            key=lambda period: period.time_from,
+        )
+        valid_to = report.valid_to
+
+        prevailing = [period for period in periods if not self._is_overlay(period)]
+        self.segments: list[TimelineSegment] = []
+        for index, period in enumerate(prevailing):
+            if index + 1 < len(prevailing):
+                end = prevailing[index + 1].time_from
+            else:
+                end = valid_to or period.time_to or period.time_from
+            if end <= period.time_from:
+                continue
+            # FM replaces the forecast, BECMG only changes what it mentions
+            base = self.segments[-1] if self.segments and period.change == "BECMG" else None
+            self.segments.append(_segment(period, period.time_from, end, base))
+        self._starts = [segment.start for segment in self.segments]
+
+        self.overlays: list[TimelineSegment] = []
+        for period in periods:
+            if not self._is_overlay(period):
+                continue
+            end = period.time_to or valid_to
+            if end is None or end <= period.time_from:
+                continue
+            self.overlays.append(_segment(period, period.time_from, end, self.prevailing_at(period.time_from)))
+
+        self._boundaries = sorted(
+            {segment.start for segment in self.segments}
+            | {segment.end for segment in self.segments}
+            | {overlay.start for overlay in self.overlays}
+            | {overlay.end for overlay in self.overlays}
+        )
+
+        # Times at which the prevailing category changes, and what it changes to
+        self._change_times: list[int] = []
+        self._change_categories: list[str | None] = []
+        for segment in self.segments:
+            if not self._change_categories or segment.category != self._change_categories[-1]:
+                self._change_times.append(segment.start)
+                self._change_categories.append(segment.category)
+        if self.segments:
+            # The forecast ends, leaving no category
+            self._change_times.append(self.segments[-1].end)
+            self._change_categories.append(None)
+
+    @staticmethod
+    def _is_overlay(period: ForecastPeriod) -> bool:
+        """Return True for TEMPO and PROB groups."""
+        return period.change in OVERLAY_CHANGES or period.probability is not None
+
+    def as_list(self) -> list[dict[str, Any]]:
+        """Return every segment and overlay in start order as attribute values."""
+        return [
+            segment.as_dict()
+            for segment in sorted(self.segments + self.overlays, key=lambda segment: segment.start)
+        ]
+
+    def prevailing_at(self, timestamp: float) -> TimelineSegment | None:
+        """Return the prevailing conditions at a Unix timestamp."""
+        index = bisect_right(self._starts, timestamp) - 1
+        if index < 0:
+            return None
+        segment = self.segments[index]
+        return segment if timestamp < segment.end else None
+
+    def overlays_at(self, timestamp: float) -> list[TimelineSegment]:
+        """Return the TEMPO and PROB groups in force at a Unix timestamp."""
+        return [overlay for overlay in self.overlays if overlay.start <= timestamp < overlay.end]
+
+    def worst_category_at(self, timestamp: float) -> str | None:
+        """Return the most restrictive category forecast at a time, TEMPO and PROB included."""
+        categories = [segment.category for segment in self.overlays_at(timestamp)]
+        prevailing = self.prevailing_at(timestamp)
+        if prevailing is not None:
+            categories.append(prevailing.category)
+        return max(
+            (category for category in categories if category),
+            key=_SEVERITY.__getitem__,
+            default=None,
+        )
+
+    def next_change(self, timestamp: float) -> tuple[int, str | None] | None:
+        """Return (time, category) of the next change of the prevailing category."""
+        index = bisect_right(self._change_times, timestamp)
+        if index >= len(self._change_times):
+            return None
+        return (self._change_times[index], self._change_categories[index])
+
+    def next_boundary(self, timestamp: float) -> int | None:
+        """Return the next time at which any segment or overlay starts or ends."""
+        index = bisect_right(self._boundaries, timestamp)
+        return self._boundaries[index] if index < len(self._boundaries) else None
+
+
+@lru_cache(maxsize=256)
+def build_timeline(report: TafReport) -> TafTimeline:
+    """Return the timeline of a forecast, shared by every sensor showing it."""
+    return TafTimeline(report)
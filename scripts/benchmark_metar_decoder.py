@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""Measure how long the raw METAR decoder takes per report.
+
+Usage: python scripts/benchmark_metar_decoder.py [--count N] [--rounds R] [metars.txt]
+
+metars.txt holds one raw METAR per line, e.g. the raw_text column of a
+metars.cache.csv download. Without it a corpus of ``count`` reports is
+generated from a fixed seed, mixing North American reports (statute miles,
+inHg, SLP and T-group remarks) with ICAO ones (metres, hPa, RVR, NOSIG).
+Each report is decoded ``rounds`` times with the decode cache bypassed.
+"""
+import argparse
+import importlib.util
+import random
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+COMPONENT_DIR = ROOT / "custom_components" / "av_weather"
+STATIONS_FILE = ROOT / "tests" / "fixtures" / "metars.txt"
+
+# metar_decoder.py only uses the standard library, so load it without Home Assistant
+_spec = importlib.util.spec_from_file_location("av_weather_metar_decoder", COMPONENT_DIR / "metar_decoder.py")
+metar_decoder = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(metar_decoder)
+
+WEATHER = ("", "", "", "", "-RA", "RA", "+RA", "BR", "FG", "HZ", "-SN", "SN", "-DZ", "TSRA", "VCSH", "-SHRA")
+COVERS = ("FEW", "SCT", "BKN", "OVC")
+
+
+def _temperature(value: int) -> str:
+    """Format a whole-degree temperature as in the body of a METAR."""
+    return f"M{-value:02d}" if value < 0 else f"{value:02d}"
+
+
+def _t_group(value: float) -> str:
+    """Format a tenth-degree temperature as in the T-group of the remarks."""
+    return f"{1 if value < 0 else 0}{round(abs(value) * 10):03d}"
+
+
+def _clouds(rng: random.Random) -> list[str]:
+    """Return zero to three cloud layers with rising bases."""
+    layers = []
+    base = 0
+    for _ in range(rng.choice((0, 1, 1, 2, 2, 3))):
+        base += rng.randrange(3, 60)
+        layers.append(f"{rng.choice(COVERS)}{base:03d}")
+    return layers or [rng.choice(("SKC", "CLR", "NSC"))]
+
+
+def generate_metar(rng: random.Random, station: str) -> str:
+    """Return one plausible METAR for a station."""
+    north_american = station[0] in "KCP"
+    day, hour = rng.randint(1, 28), rng.randrange(24)
+    minute = rng.choice((0, 20, 30, 50, 51, 53, 56)) if rng.random() < 0.9 else rng.randrange(60)
+    unit = "KT" if north_american or rng.random() < 0.85 else "MPS"
+    speed = rng.randrange(0, 35 if unit == "KT" else 18)
+    direction = "VRB" if speed < 4 and rng.random() < 0.5 else f"{rng.randrange(0, 360, 10):03d}"
+    gust = f"G{speed + rng.randrange(5, 15):02d}" if speed > 10 and rng.random() < 0.4 else ""
+    parts = [station, f"{day:02d}{hour:02d}{minute:02d}Z"]
+    if rng.random() < 0.1:
+        parts.append("AUTO")
+    parts.append(f"{direction}{speed:02d}{gust}{unit}")
+    if direction != "VRB" and speed > 6 and rng.random() < 0.15:
+        start = int(direction)
+        parts.append(f"{(start - 40) % 360:03d}V{(start + 40) % 360:03d}")
+
+    poor = rng.random() < 0.15
+    if north_american:
+        parts.append(rng.choice(("1/4SM", "1/2SM", "1SM", "2SM", "3SM")) if poor else f"{rng.choice((5, 7, 10, 10, 10))}SM")
+    else:
+        parts.append(f"{rng.choice((200, 400, 800, 1500, 3000)):04d}" if poor else "9999")
+    if poor and rng.random() < 0.5:
+        runway = f"{rng.randint(1, 36):02d}{rng.choice(('', 'L', 'R', 'C'))}"
+        low = rng.choice((600, 1200, 1800, 2400)) if north_american else rng.choice((300, 550, 900, 1200))
+        high = f"V{low * 2:04d}" if rng.random() < 0.3 else ""
+        parts.append(f"R{runway}/{low:04d}{high}{'FT' if north_american else ''}/{rng.choice('UDN')}")
+    weather = rng.choice(WEATHER)
+    if weather:
+        parts.append(weather)
+    parts.extend(_clouds(rng))
+
+    air = rng.uniform(-30, 40)
+    dew = air - rng.uniform(0, 15)
+    parts.append(f"{_temperature(round(air))}/{_temperature(round(dew))}")
+    pressure = rng.uniform(980, 1040)
+    if north_american:
+        parts.append(f"A{round(pressure / metar_decoder.HPA_PER_INHG * 100):04d}")
+        remarks = ["RMK", "AO2"]
+        if rng.random() < 0.05:
+            remarks.append("SLPNO")
+        else:
+            remarks.append(f"SLP{round(pressure * 10) % 1000:03d}")
+        remarks.append(f"T{_t_group(air)}{_t_group(dew)}")
+        parts.extend(remarks)
+    else:
+        parts.append(f"Q{round(pressure):04d}")
+        parts.append(rng.choice(("NOSIG", "NOSIG", "BECMG FEW020", "TEMPO 4000 -SHRA")))
+    if rng.random() < 0.05:
+        parts.insert(0, "SPECI")
+    return " ".join(parts)
+
+
+def generate_corpus(count: int, seed: int = 1) -> list[str]:
+    """Return ``count`` generated METARs for the stations of the test corpus."""
+    stations = sorted({
+        line.split()[1] if line.startswith(("METAR", "SPECI")) else line.split()[0]
+        for line in STATIONS_FILE.read_text(encoding="utf-8").splitlines()
+        if line
+    })
+    rng = random.Random(seed)
+    return [generate_metar(rng, rng.choice(stations)) for _ in range(count)]
+
+
+def benchmark(corpus: list[str], rounds: int) -> float:
+    """Return the mean decoding time per report, in microseconds."""
+    decode = metar_decoder.decode_metar.__wrapped__  # bypass the cache
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for raw in corpus:
+            decode(raw)
+    elapsed = time.perf_counter() - start
+    return elapsed / (rounds * len(corpus)) * 1_000_000
+
+
+def main() -> None:
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description="Benchmark the raw METAR decoder.")
+    parser.add_argument("source", nargs="?", type=Path, help="file with one raw METAR per line")
+    parser.add_argument("--count", type=int, default=20_000, help="reports to generate without a source file")
+    parser.add_argument("--rounds", type=int, default=5, help="times each report is decoded")
+    args = parser.parse_args()
+
+    if args.source is not None:
+        corpus = [line for line in args.source.read_text(encoding="utf-8").splitlines() if line]
+    else:
+        corpus = generate_corpus(args.count)
+    per_report = benchmark(corpus, args.rounds)
+    print(f"Decoded {len(corpus)} METARs {args.rounds} times, {per_report:.1f} µs per report")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Build the compact airport table (airports.bin) from airports.json.
+
+Usage: python scripts/build_airport_db.py [airports.json] [airports.bin]
+
+airports.json is the mwgg/Airports dataset keyed by ICAO code. Only the
+fields the integration uses are kept, strings are deduplicated into a
+shared string table, and records are sorted by ICAO for binary search.
+"""
+import importlib.util
+import json
+import sys
+from pathlib import Path
+
+COMPONENT_DIR = Path(__file__).resolve().parent.parent / "custom_components" / "av_weather"
+
+# airports.py only uses the standard library, so load it without Home Assistant
+_spec = importlib.util.spec_from_file_location("av_weather_airports", COMPONENT_DIR / "airports.py")
+airports = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(airports)
+
+
+def build(source: Path, target: Path) -> int:
+    """Write the compact table for every airport with a 4-letter ICAO code."""
+    with open(source, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    records = []
+    for icao, airport in data.items():
+        key = icao.strip().upper()
+        if len(key) != airports.ICAO_SIZE or not key.isascii() or not key.isalnum():
+            continue
+        records.append((key, airport))
+    records.sort(key=lambda record: record[0])
+
+    strings = bytearray(b"\0")  # offset 0 is the empty string
+    offsets: dict[str, int] = {"": 0}
+
+    def intern(value: str | None) -> int:
+        value = (value or "").strip()
+        if value not in offsets:
+            offsets[value] = len(strings)
+            strings.extend(value.encode("utf-8") + b"\0")
+        return offsets[value]
+
+    index = bytearray()
+    body = bytearray()
+    for icao, airport in records:
+        index.extend(icao.encode("ascii"))
+        iata = (airport.get("iata") or "").strip().upper()
+        body.extend(
+            airports.RECORD.pack(
+                iata.encode("ascii", "ignore")[:3],
+                intern(airport.get("name")),
+                intern(airport.get("city")),
+                intern(airport.get("country")),
+                float(airport.get("lat") or 0.0),
+                float(airport.get("lon") or 0.0),
+                int(airport.get("elevation") or 0),
+            )
+        )
+
+    strings_offset = airports.HEADER.size + len(index) + len(body)
+    with open(target, "wb") as f:
+        f.write(airports.HEADER.pack(airports.DB_MAGIC, airports.DB_VERSION, len(records), strings_offset))
+        f.write(index)
+        f.write(body)
+        f.write(strings)
+    return len(records)
+
+
+def main() -> None:
+    """Build the table from the command line."""
+    source = Path(sys.argv[1]) if len(sys.argv) > 1 else airports.AIRPORTS_JSON_FILE
+    target = Path(sys.argv[2]) if len(sys.argv) > 2 else airports.AIRPORTS_DB_FILE
+    count = build(source, target)
+    print(f"Wrote {count} airports to {target} ({target.stat().st_size} bytes)")
+
+
+if __name__ == "__main__":
+    main()
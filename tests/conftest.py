@@ -0,0 +1,34 @@
+"""Shared test helpers.
+
+Most of the integration's modules only need the standard library. They are
+imported from a bare package, without running ``__init__.py``, so they can be
+tested without Home Assistant installed. The test files also run as plain
+scripts, so they import ``load_module`` from here directly rather than
+through a fixture.
+"""
+import importlib
+import sys
+import types
+from pathlib import Path
+from types import ModuleType
+
+ROOT = Path(__file__).resolve().parent.parent
+PACKAGE_DIR = ROOT / "custom_components" / "av_weather"
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+
+# Name of the bare package the modules are imported from
+PACKAGE = "av_weather_bare"
+
+
+def load_module(name: str) -> ModuleType:
+    """Import a module of the integration, with its relative imports, without Home Assistant."""
+    if PACKAGE not in sys.modules:
+        package = types.ModuleType(PACKAGE)
+        package.__path__ = [str(PACKAGE_DIR)]
+        sys.modules[PACKAGE] = package
+    return importlib.import_module(f"{PACKAGE}.{name}")
+
+
+# Lets the tests that need Home Assistant import the integration itself
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
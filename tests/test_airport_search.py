@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Test the airport search index."""
+from conftest import load_module
+
+airport_search = load_module("airport_search")
+
+AIRPORTS = {
+    "KJFK": {"iata": "JFK", "name": "John F Kennedy International Airport", "city": "New York"},
+    "KLGA": {"iata": "LGA", "name": "La Guardia Airport", "city": "New York"},
+    "KEWR": {"iata": "EWR", "name": "Newark Liberty International Airport", "city": "Newark"},
+    "LSZH": {"iata": "ZRH", "name": "Zürich Airport", "city": "Zurich"},
+    "EGLL": {"iata": "LHR", "name": "London Heathrow Airport", "city": "London"},
+    "EGKK": {"iata": "LGW", "name": "London Gatwick Airport", "city": "London"},
+    "CYYZ": {"iata": "YYZ", "name": "Lester B. Pearson International Airport", "city": "Toronto"},
+    "00AK": {"iata": "", "name": "Lowell Field", "city": "Anchor Point"},
+}
+
+INDEX = airport_search.AirportSearchIndex(AIRPORTS)
+
+
+def test_icao_and_iata():
+    """ICAO and IATA codes find their airport, whatever their case."""
+    assert INDEX.search("kjfk")[0] == "KJFK"
+    assert INDEX.search("JFK") == ["KJFK"]
+    assert INDEX.search("lhr") == ["EGLL"]
+    assert INDEX.search("00ak") == ["00AK"]
+
+
+def test_name_and_city_tokens():
+    """Name and city words match by prefix, with accents ignored."""
+    assert INDEX.search("zürich") == ["LSZH"]
+    assert INDEX.search("zur") == ["LSZH"]
+    assert INDEX.search("heath") == ["EGLL"]
+    assert INDEX.search("toronto pearson") == ["CYYZ"]
+
+
+def test_every_term_must_match():
+    """Multi-token queries return only airports matching all their terms."""
+    assert INDEX.search("new york") == ["KJFK", "KLGA"]
+    assert INDEX.search("london gat") == ["EGKK"]
+    assert INDEX.search("london york") == []
+    assert INDEX.search("xyzzy") == []
+    assert INDEX.search("  , ") == []
+
+
+def test_ranking():
+    """Exact tokens beat prefixes, codes beat names, and ties sort by ICAO code."""
+    # "new" is the whole city token of JFK and LaGuardia, only a prefix of Newark
+    assert INDEX.search("new") == ["KJFK", "KLGA", "KEWR"]
+    # Both IATA codes start with "lg"; the London city match does not count
+    assert INDEX.search("lg") == ["EGKK", "KLGA"]
+    # A city named like the query ranks above airports only mentioning it in their name
+    assert INDEX.search("london")[:2] == ["EGKK", "EGLL"]
+    assert INDEX.search("international", limit=2) == ["CYYZ", "KEWR"]
+
+
+def test_broad_prefix_does_not_drop_matches():
+    """A short term matching many tokens does not hide airports it matches."""
+    airports = {f"K{i:03d}": {"name": f"sa{i:03d}", "city": "Elsewhere"} for i in range(300)}
+    airports["KZZZ"] = {"name": "saz field", "city": "springfield"}
+    airports.update({f"S{i:03d}": {"name": "Regional", "city": "Springfield"} for i in range(400)})
+    index = airport_search.AirportSearchIndex(airports)
+
+    assert index.search("saz springfield") == ["KZZZ"]
+    assert index.search("sa springfield") == ["KZZZ"]
+    assert len(index.search("sa", limit=1000)) == 301
+
+
+if __name__ == "__main__":
+    test_icao_and_iata()
+    test_name_and_city_tokens()
+    test_every_term_must_match()
+    test_ranking()
+    test_broad_prefix_does_not_drop_matches()
+    print("✓ Airport search OK")
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""Test the compact airport table written by scripts/build_airport_db.py."""
+import importlib.util
+import json
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from conftest import ROOT, load_module
+
+airports = load_module("airports")
+
+_spec = importlib.util.spec_from_file_location("build_airport_db", ROOT / "scripts" / "build_airport_db.py")
+build_airport_db = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(build_airport_db)
+
+SOURCE = {
+    "NZAA": {"iata": "AKL", "name": "Auckland International Airport", "city": "Auckland", "country": "NZ", "lat": -37.00805664, "lon": 174.7920074, "elevation": 23},
+    "kjfk": {"iata": "JFK", "name": "John F Kennedy International Airport", "city": "New York", "country": "US", "lat": 40.63980103, "lon": -73.77890015, "elevation": 13},
+    "KLGA": {"iata": "LGA", "name": "La Guardia Airport", "city": "New York", "country": "US", "lat": 40.77719879, "lon": -73.87259674, "elevation": 21},
+    "ENSB": {"iata": "", "name": "Svalbard Lufthavn, Longyear", "city": "Longyearbyen", "country": "NO", "lat": 78.246101, "lon": 15.4656, "elevation": 88},
+    "LFPG": {"iata": "CDG", "name": "Aéroport Paris-Charles de Gaulle", "city": "Paris", "country": "FR", "lat": 49.0127983093, "lon": 2.5499999523, "elevation": 392},
+    # Missing fields are stored empty
+    "00AK": {"name": "Lowell Field", "lat": 59.9, "lon": -151.7},
+    # Not a 4-character code, left out of the table
+    "XYZ": {"name": "Too short"},
+}
+
+
+def _build(source=SOURCE) -> bytes:
+    """Build the table from airport data and return its bytes."""
+    with tempfile.TemporaryDirectory() as directory:
+        json_file = Path(directory) / "airports.json"
+        bin_file = Path(directory) / "airports.bin"
+        json_file.write_text(json.dumps(source), encoding="utf-8")
+        build_airport_db.build(json_file, bin_file)
+        return bin_file.read_bytes()
+
+
+def test_layout():
+    """The header, sorted index, fixed-size records and shared strings follow each other."""
+    table = _build()
+    magic, version, count, strings_offset = airports.HEADER.unpack_from(table, 0)
+    assert (magic, version, count) == (airports.DB_MAGIC, airports.DB_VERSION, 6)
+    assert strings_offset == airports.HEADER.size + count * (airports.ICAO_SIZE + airports.RECORD.size)
+
+    index = table[airports.HEADER.size:airports.HEADER.size + count * airports.ICAO_SIZE]
+    codes = [index[i:i + 4].decode() for i in range(0, len(index), 4)]
+    assert codes == ["00AK", "ENSB", "KJFK", "KLGA", "LFPG", "NZAA"]
+
+    strings = table[strings_offset:]
+    assert strings.startswith(b"\0")
+    assert strings.count(b"New York\0") == 1
+
+
+def test_lookup_round_trip():
+    """Every airport reads back with its fields, whatever the case of the code."""
+    database = airports.AirportDatabase(_build())
+    assert len(database) == 6
+    assert list(database) == sorted(database)
+
+    jfk = database["kjfk"]
+    assert jfk == {
+        "icao": "KJFK",
+        "iata": "JFK",
+        "name": "John F Kennedy International Airport",
+        "city": "New York",
+        "country": "US",
+        "lat": 40.6398,
+        "lon": -73.7789,
+        "elevation": 13,
+    }
+    assert database["LFPG"]["name"] == "Aéroport Paris-Charles de Gaulle"
+    assert database["ENSB"]["iata"] == ""
+    assert database.get("NZAA")["lon"] == 174.792
+    assert database["00AK"]["city"] == "" and database["00AK"]["elevation"] == 0
+    for icao, airport in SOURCE.items():
+        if len(icao) == 4:
+            assert database[icao]["name"] == airport["name"]
+
+
+def test_missing_codes():
+    """Unknown, short and non-ASCII codes are not found."""
+    database = airports.AirportDatabase(_build())
+    for icao in ("ZZZZ", "AAAA", "KJF", "KJFKX", "ÉGLL", ""):
+        assert icao not in database
+        assert database.get(icao) is None
+    with pytest.raises(KeyError):
+        database["ZZZZ"]
+
+
+def test_rejects_other_formats():
+    """A table with another magic or version is refused."""
+    table = bytearray(_build())
+    table[:4] = b"NOPE"
+    with pytest.raises(ValueError):
+        airports.AirportDatabase(bytes(table))
+
+
+if __name__ == "__main__":
+    test_layout()
+    test_lookup_round_trip()
+    test_missing_codes()
+    test_rejects_other_formats()
+    print("✓ Airport table OK")
@@ -0,0 +1,428 @@
+#!/usr/bin/env python3
+"""Test the API client's requests against a stand-in HTTP session."""
+import asyncio
+import gzip
+import json
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+from conftest import FIXTURES, load_module  # noqa: E402
+
+api = load_module("api")
+const = load_module("const")
+
+
+class FakeContent:
+    """Response body read in fixed-size chunks."""
+
+    def __init__(self, body: bytes) -> None:
+        self._body = body
+
+    async def iter_chunked(self, size: int):
+        for i in range(0, len(self._body), size):
+            yield self._body[i:i + size]
+
+
+class FakeResponse:
+    """A canned HTTP response."""
+
+    def __init__(
+        self,
+        status: int,
+        body: bytes = b"",
+        headers: dict[str, str] | None = None,
+        gate: asyncio.Event | None = None,
+    ) -> None:
+        self.status = status
+        self.headers = headers or {}
+        self.content = FakeContent(body)
+        self._body = body
+        self._gate = gate
+
+    async def text(self) -> str:
+        return self._body.decode()
+
+    async def __aenter__(self) -> "FakeResponse":
+        if self._gate is not None:
+            await self._gate.wait()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        return None
+
+
+class FakeSession:
+    """Answers every request with ``respond(url, headers, params)`` and records the requests."""
+
+    def __init__(self, respond) -> None:
+        self._respond = respond
+        self.requests: list[tuple[str, dict, dict | None]] = []
+
+    def get(self, url, headers=None, params=None, **kwargs) -> FakeResponse:
+        self.requests.append((url, headers or {}, params))
+        return self._respond(url, headers or {}, params)
+
+
+def _metar_body(stations) -> bytes:
+    """Return a JSON METAR response for the given stations."""
+    return json.dumps([
+        {"icaoId": station, "rawOb": f"{station} 011200Z 00000KT 10SM SKC 20/10 A3000", "obsTime": 1_700_000_000}
+        for station in stations
+    ]).encode()
+
+
+def _etag_server(url, headers, params):
+    """Answer with an ETag per station set, and 304 when the client already has it."""
+    etag = f'"{params["ids"]}"'
+    if headers.get("If-None-Match") == etag:
+        return FakeResponse(304)
+    return FakeResponse(200, _metar_body(params["ids"].split(",")), {"ETag": etag})
+
+
+def test_conditional_request_returns_cached_reports():
+    """A 304 answer returns the reports decoded from the previous response."""
+    session = FakeSession(_etag_server)
+    client = api.AviationWeatherApi(session)
+
+    async def _fetch_twice():
+        first = await client._async_fetch_once(const.METAR_API_URL, "KSFO")
+        second = await client._async_fetch_once(const.METAR_API_URL, "KSFO")
+        return first, second
+
+    first, second = asyncio.run(_fetch_twice())
+    assert second is first
+    assert session.requests[1][1]["If-None-Match"] == '"KSFO"'
+
+
+def test_response_cache_is_bounded():
+    """Responses to ever-changing station sets do not accumulate."""
+    client = api.AviationWeatherApi(FakeSession(_etag_server))
+
+    async def _fetch_many():
+        await client._async_fetch_once(const.METAR_API_URL, "KSFO")
+        for i in range(const.RESPONSE_CACHE_MAX_ENTRIES + 50):
+            await client._async_fetch_once(const.METAR_API_URL, f"K{i:03d}")
+            # The station that keeps being asked for stays cached
+            await client._async_fetch_once(const.METAR_API_URL, "KSFO")
+
+    asyncio.run(_fetch_many())
+    assert len(client._responses) == const.RESPONSE_CACHE_MAX_ENTRIES
+    assert (const.METAR_API_URL, "KSFO") in client._responses
+    assert (const.METAR_API_URL, "K000") not in client._responses
+
+
+def test_identical_body_is_not_decoded_again(monkeypatch):
+    """A repeated body from a server without validators skips decoding its reports."""
+    body = _metar_body(["KSFO", "KOAK"])
+    client = api.AviationWeatherApi(FakeSession(lambda url, headers, params: FakeResponse(200, body)))
+    model = api.RESPONSE_TYPES[const.METAR_API_URL]
+    decoded = []
+    from_dict = model.from_dict
+    monkeypatch.setattr(model, "from_dict", lambda data: decoded.append(data["icaoId"]) or from_dict(data))
+
+    async def _fetch_twice():
+        first = await client._async_fetch_once(const.METAR_API_URL, "KOAK,KSFO")
+        second = await client._async_fetch_once(const.METAR_API_URL, "KOAK,KSFO")
+        return first, second
+
+    first, second = asyncio.run(_fetch_twice())
+    assert second is first
+    assert sorted(decoded) == ["KOAK", "KSFO"]
+    assert client.metrics.feed(const.FEED_METAR).records == 4
+
+
+class GatedLimiter:
+    """Limiter that holds its first caller, as a backoff would, until the gate opens."""
+
+    def __init__(self) -> None:
+        self.gate = asyncio.Event()
+        self.calls = 0
+
+    async def async_acquire(self) -> None:
+        self.calls += 1
+        if self.calls == 1:
+            await self.gate.wait()
+
+    def reset(self) -> None:
+        pass
+
+
+def test_backoff_does_not_hold_a_request_slot():
+    """A request waiting on the limiter leaves the concurrency cap to the others."""
+
+    async def _fetch(result):
+        return result
+
+    async def _run():
+        client = api.AviationWeatherApi(FakeSession(_etag_server), max_concurrency=1)
+        client._limiter = GatedLimiter()
+        backing_off = asyncio.create_task(client._async_with_retries("first", lambda: _fetch("first")))
+        await asyncio.sleep(0)
+        second = await asyncio.wait_for(client._async_with_retries("second", lambda: _fetch("second")), 1)
+        client._limiter.gate.set()
+        return second, await backing_off
+
+    assert asyncio.run(_run()) == ("second", "first")
+
+
+def test_chunks_are_delivered_as_they_arrive():
+    """Listeners get each chunk of a large batch without waiting for the slowest one."""
+    stations = {f"K{i:03d}" for i in range(const.MAX_IDS_PER_REQUEST + 1)}
+    delivered: list[set[str]] = []
+
+    async def _run():
+        # The short last chunk only answers once the first chunk was delivered
+        gate = asyncio.Event()
+
+        def _respond(url, headers, params):
+            ids = params["ids"].split(",")
+            return FakeResponse(200, _metar_body(ids), gate=gate if len(ids) == 1 else None)
+
+        def _listener(feed_type, reports):
+            delivered.append(set(reports))
+            gate.set()
+
+        client = api.AviationWeatherApi(FakeSession(_respond))
+        client.async_add_listener(_listener)
+        return await asyncio.wait_for(client._async_fetch_stations(const.FEED_METAR, stations), 1)
+
+    data = asyncio.run(_run())
+    assert set(data) == stations
+    assert delivered == [stations - {"K040"}, {"K040"}]
+
+
+def _cache_file_server(name: str, etag: str = '"v1"'):
+    """Serve a gzipped fixture as a bulk cache file, with 304 for a known ETag."""
+    body = gzip.compress((FIXTURES / name).read_bytes())
+
+    def _respond(url, headers, params):
+        if headers.get("If-None-Match") == etag:
+            return FakeResponse(304)
+        return FakeResponse(200, body, {"ETag": etag})
+
+    return _respond
+
+
+def test_bulk_file_extracts_wanted_stations():
+    """Only the wanted stations are decoded from the bulk file, and a 304 reuses them."""
+    session = FakeSession(_cache_file_server("metars.cache.csv"))
+    url = "http://localhost/metars.cache.csv.gz"
+    client = api.AviationWeatherApi(session, cache_urls={const.FEED_METAR: url})
+
+    async def _fetch_twice():
+        first = await client._async_fetch_bulk_once(url, const.FEED_METAR, {"KJFK", "NZAA"})
+        second = await client._async_fetch_bulk_once(url, const.FEED_METAR, {"KJFK", "NZAA"})
+        return first, second
+
+    first, second = asyncio.run(_fetch_twice())
+    assert second is first
+    assert sorted(report.station for report in first) == ["KJFK", "KJFK", "NZAA"]
+    assert {report.metar_type for report in first} == {"METAR", "SPECI"}
+    assert session.requests[1][1]["If-None-Match"] == '"v1"'
+
+    # The newest report of each station is kept when indexing
+    indexed = asyncio.run(client._async_fetch_bulk(const.FEED_METAR, {"KJFK"}))
+    assert indexed["KJFK"].raw.startswith("KJFK 011151Z")
+
+
+def test_bulk_taf_file():
+    """Forecasts are read from the TAF bulk file."""
+    client = api.AviationWeatherApi(FakeSession(_cache_file_server("tafs.cache.xml")))
+    data = asyncio.run(client._async_fetch_bulk_once("tafs", const.FEED_TAF, {"EGLL"}))
+    assert [report.station for report in data] == ["EGLL"]
+    assert data[0].periods
+
+
+def test_corrupt_bulk_file_is_an_error():
+    """A body that is not gzip raises an API error rather than retrying."""
+    client = api.AviationWeatherApi(FakeSession(lambda url, headers, params: FakeResponse(200, b"not gzip")))
+    with pytest.raises(api.AviationWeatherApiError):
+        asyncio.run(client._async_fetch_bulk_once("metars", const.FEED_METAR, {"KJFK"}))
+
+
+def test_failing_listener_does_not_break_the_fetch():
+    """A listener raising on one chunk leaves the other chunks and listeners alone."""
+    stations = {f"K{i:03d}" for i in range(const.MAX_IDS_PER_REQUEST + 1)}
+    delivered: list[set[str]] = []
+
+    def _failing_listener(feed_type, reports):
+        raise RuntimeError("listener bug")
+
+    async def _run():
+        client = api.AviationWeatherApi(
+            FakeSession(lambda url, headers, params: FakeResponse(200, _metar_body(params["ids"].split(","))))
+        )
+        client.async_add_listener(_failing_listener)
+        client.async_add_listener(lambda feed_type, reports: delivered.append(set(reports)))
+        return await client._async_fetch_stations(const.FEED_METAR, stations)
+
+    assert set(asyncio.run(_run())) == stations
+    assert len(delivered) == 2
+    assert set().union(*delivered) == stations
+
+
+class RecordingLimiter:
+    """Limiter that never waits and records the penalties it is given."""
+
+    def __init__(self) -> None:
+        self.penalties: list[float | None] = []
+
+    async def async_acquire(self) -> None:
+        pass
+
+    def penalize(self, retry_after: float | None = None) -> float:
+        self.penalties.append(retry_after)
+        return retry_after or 0
+
+    def reset(self) -> None:
+        pass
+
+
+def test_last_attempt_does_not_back_off(caplog):
+    """Giving up leaves the limiter alone and logs no backoff that never happens."""
+    attempts = []
+
+    async def _throttled():
+        attempts.append(None)
+        raise api._RetryableError("Rate limited (HTTP 429)", 30)
+
+    client = api.AviationWeatherApi(FakeSession(_etag_server))
+    client._limiter = RecordingLimiter()
+    with pytest.raises(api.AviationWeatherApiError):
+        asyncio.run(client._async_with_retries("KSFO", _throttled))
+
+    assert len(attempts) == const.MAX_FETCH_ATTEMPTS
+    assert client._limiter.penalties == [30] * (const.MAX_FETCH_ATTEMPTS - 1)
+    backoffs = [record for record in caplog.records if "backing off" in record.getMessage()]
+    assert len(backoffs) == const.MAX_FETCH_ATTEMPTS - 1
+
+
+def _failing_server(failing: set[str]):
+    """Answer 403 for requests including a failing station, and reports otherwise."""
+
+    def _respond(url, headers, params):
+        ids = params["ids"].split(",")
+        if failing & set(ids):
+            return FakeResponse(403, b"Forbidden")
+        return FakeResponse(200, _metar_body(ids))
+
+    return _respond
+
+
+def test_callers_in_the_gathering_window_share_a_request():
+    """Callers arriving within the gathering window are answered by one request."""
+    session = FakeSession(_etag_server)
+    client = api.AviationWeatherApi(session)
+
+    async def _run():
+        return await asyncio.gather(
+            client.async_get_data(const.FEED_METAR, ["KSFO"]),
+            client.async_get_data(const.FEED_METAR, ["koak", "KSFO"]),
+        )
+
+    first, second = asyncio.run(_run())
+    assert [params["ids"] for _, _, params in session.requests] == ["KOAK,KSFO"]
+    assert set(first) == {"KSFO"}
+    assert set(second) == {"KOAK", "KSFO"}
+
+
+def test_subset_caller_joins_the_request_in_flight():
+    """A caller whose stations are already being fetched waits for that request."""
+
+    async def _run():
+        gate = asyncio.Event()
+        session = FakeSession(lambda url, headers, params: FakeResponse(
+            200, _metar_body(params["ids"].split(",")), gate=gate,
+        ))
+        client = api.AviationWeatherApi(session)
+        first = asyncio.create_task(client.async_get_data(const.FEED_METAR, ["KSFO", "KOAK"]))
+        # Let the gathering window close, so the request is in flight
+        await asyncio.sleep(const.REQUEST_GATHER_WINDOW * 2)
+        second = asyncio.create_task(client.async_get_data(const.FEED_METAR, ["KSFO"]))
+        await asyncio.sleep(0)
+        gate.set()
+        return len(session.requests), await first, await second
+
+    requests, first, second = asyncio.run(_run())
+    assert requests == 1
+    assert set(first) == {"KOAK", "KSFO"}
+    assert second == {"KSFO": first["KSFO"]}
+
+
+def test_cancelled_caller_does_not_cancel_the_shared_request():
+    """Cancelling one caller leaves the request running for the others."""
+    session = FakeSession(_etag_server)
+    client = api.AviationWeatherApi(session)
+
+    async def _run():
+        cancelled = asyncio.create_task(client.async_get_data(const.FEED_METAR, ["KSFO"]))
+        waiting = asyncio.create_task(client.async_get_data(const.FEED_METAR, ["KOAK"]))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await cancelled
+        return await waiting
+
+    assert set(asyncio.run(_run())) == {"KOAK"}
+    assert len(session.requests) == 1
+
+
+def test_failed_stations_are_split_between_callers():
+    """Each caller of a shared request only hears about its own failed stations."""
+    others = {f"K{i:03d}" for i in range(1, const.MAX_IDS_PER_REQUEST)}
+    client = api.AviationWeatherApi(FakeSession(_failing_server({"KZZZ"})))
+
+    async def _run():
+        return await asyncio.gather(
+            client.async_get_data(const.FEED_METAR, ["K000", "KZZZ"]),
+            client.async_get_data(const.FEED_METAR, others),
+            return_exceptions=True,
+        )
+
+    mixed, healthy = asyncio.run(_run())
+    assert isinstance(mixed, api.AviationWeatherApiError)
+    assert mixed.failed_stations == {"KZZZ"}
+    assert set(mixed.data) == {"K000"}
+    # The shared request failed, but none of this caller's stations did
+    assert isinstance(healthy, api.AviationWeatherApiError)
+    assert healthy.failed_stations == set()
+    assert set(healthy.data) == others
+
+
+def test_chunk_boundaries():
+    """Station IDs are deduplicated, sorted and split at the per-request limit."""
+    limit = const.MAX_IDS_PER_REQUEST
+    assert api.chunk_station_ids([" ksfo", "KOAK", "KSFO", ""]) == ["KOAK,KSFO"]
+    assert api.chunk_station_ids([]) == []
+
+    exact = [f"K{i:03d}" for i in range(limit)]
+    assert api.chunk_station_ids(exact) == [",".join(exact)]
+
+    chunks = api.chunk_station_ids(exact + ["KZZZ"])
+    assert chunks == [",".join(exact), "KZZZ"]
+    # Keeps the ids= parameter well within URL length limits
+    assert max(len(chunk) for chunk in chunks) == limit * 5 - 1
+    assert [len(chunk.split(",")) for chunk in api.chunk_station_ids(exact, size=16)] == [16, 16, limit - 32]
+
+
+def test_one_failing_chunk_keeps_the_others():
+    """A failing chunk reports its stations as failed along with the other chunks' data."""
+    stations = {f"K{i:03d}" for i in range(const.MAX_IDS_PER_REQUEST)} | {"KZZZ"}
+    client = api.AviationWeatherApi(FakeSession(_failing_server({"KZZZ"})))
+
+    with pytest.raises(api.AviationWeatherApiError) as raised:
+        asyncio.run(client._async_fetch_stations(const.FEED_METAR, stations))
+    assert raised.value.failed_stations == {"KZZZ"}
+    assert set(raised.value.data) == stations - {"KZZZ"}
+
+
+def test_area_request():
+    """Area data is requested with a bbox parameter instead of station IDs."""
+    session = FakeSession(lambda url, headers, params: FakeResponse(200, _metar_body(["KSFO", "KOAK"])))
+    client = api.AviationWeatherApi(session)
+
+    data = asyncio.run(client.async_get_area_data(const.FEED_METAR, 37.17, -122.95, 38.07, -121.81))
+    assert set(data) == {"KSFO", "KOAK"}
+    assert session.requests[0][2] == {"bbox": "37.1700,-122.9500,38.0700,-121.8100", "format": "json"}
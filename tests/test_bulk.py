@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""Test the bulk cache file parsers against local fixture files."""
+import gzip
+
+from conftest import FIXTURES, load_module
+
+bulk = load_module("bulk")
+models = load_module("models")
+
+
+def _gzip_chunks(name: str, size: int) -> list[bytes]:
+    """Gzip a fixture file and split it into chunks as a download would arrive."""
+    data = gzip.compress((FIXTURES / name).read_bytes())
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+def _by_station(records) -> dict[str, list[dict]]:
+    """Group parsed records by station."""
+    grouped: dict[str, list[dict]] = {}
+    for record in records:
+        grouped.setdefault(record["icaoId"], []).append(record)
+    return grouped
+
+
+def test_metar_csv_keeps_only_wanted_stations():
+    """Only the configured stations are extracted from the METAR cache file."""
+    parser = bulk.MetarCsvParser({"NZAA", "KJFK"})
+    records = _by_station(bulk.iter_cache_records(_gzip_chunks("metars.cache.csv", 64), parser))
+
+    assert set(records) == {"NZAA", "KJFK"}
+    assert len(records["KJFK"]) == 2
+
+
+def test_metar_csv_maps_api_fields():
+    """METAR rows are mapped to the JSON API's field names and units."""
+    parser = bulk.MetarCsvParser({"KJFK", "NZAA"})
+    records = _by_station(bulk.iter_cache_records(_gzip_chunks("metars.cache.csv", 7), parser))
+
+    kjfk = records["KJFK"][0]
+    assert kjfk["rawOb"].startswith("KJFK 011151Z")
+    assert kjfk["reportTime"] == "2024-05-01T11:51:00Z"
+    assert kjfk["obsTime"] == 1714564260
+    assert kjfk["wdir"] == "VRB"
+    assert kjfk["visib"] == "10+"
+    assert kjfk["altim"] == 1013.2
+    assert kjfk["slp"] == 1013.2
+    assert kjfk["wxString"] == "-RA"
+    assert kjfk["clouds"] == [{"cover": "OVC", "base": 800}]
+    assert kjfk["fltCat"] == "IFR"
+    assert records["KJFK"][1]["metarType"] == "SPECI"
+
+    nzaa = records["NZAA"][0]
+    assert nzaa["clouds"] == [{"cover": "FEW", "base": 2500}, {"cover": "BKN", "base": 4000}]
+    assert nzaa["wgst"] is None
+    assert nzaa["lat"] == -37
+
+
+def test_metar_csv_chunk_size_does_not_matter():
+    """Records are identical however the download is split."""
+    results = []
+    for size in (1, 13, 1 << 16):
+        parser = bulk.MetarCsvParser(None)
+        results.append(list(bulk.iter_cache_records(_gzip_chunks("metars.cache.csv", size), parser)))
+
+    assert len(results[0]) == 4
+    assert results[0] == results[1] == results[2]
+
+
+def test_taf_xml_maps_api_fields():
+    """TAF elements are mapped to the JSON API's field names."""
+    parser = bulk.TafXmlParser({"NZAA"})
+    records = _by_station(bulk.iter_cache_records(_gzip_chunks("tafs.cache.xml", 11), parser))
+
+    assert set(records) == {"NZAA"}
+    nzaa = records["NZAA"][0]
+    assert nzaa["rawTAF"].startswith("TAF NZAA 011104Z")
+    assert nzaa["issueTime"] == "2024-05-01T11:04:00Z"
+    assert nzaa["validTimeFrom"] == 1714564800
+    assert nzaa["elev"] == 7
+    assert len(nzaa["fcsts"]) == 2
+
+    tempo = nzaa["fcsts"][1]
+    assert tempo["fcstChange"] == "TEMPO"
+    assert tempo["wxString"] == "SHRA"
+    assert tempo["clouds"] == [{"cover": "BKN", "base": 1500}]
+
+
+def test_bulk_and_json_reports_are_the_same():
+    """A report has the same identity and issuance time whichever feed it came from."""
+    parser = bulk.MetarCsvParser({"KJFK"})
+    record = next(bulk.iter_cache_records(_gzip_chunks("metars.cache.csv", 64), parser))
+    from_bulk = models.MetarReport.from_dict(record)
+    # The JSON API reports the nominal hour as reportTime
+    from_json = models.MetarReport.from_dict({**record, "reportTime": "2024-05-01T12:00:00.000Z"})
+
+    assert from_bulk.identity == from_json.identity
+    assert from_bulk.issued == from_json.issued == "2024-05-01T11:51:00+00:00"
+
+
+if __name__ == "__main__":
+    test_metar_csv_keeps_only_wanted_stations()
+    test_metar_csv_maps_api_fields()
+    test_metar_csv_chunk_size_does_not_matter()
+    test_taf_xml_maps_api_fields()
+    test_bulk_and_json_reports_are_the_same()
+    print("✓ Bulk cache parsers OK")
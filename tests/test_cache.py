@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Test the report cache's TTLs, LRU eviction and counters."""
+from conftest import load_module
+
+models = load_module("models")
+cache = load_module("cache")
+
+TTLS = {"METAR": (120, 3600), "TAF": (600, 21600)}
+
+
+class FakeClock:
+    """A clock moved by hand."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _report(station):
+    """Return a METAR report of a station."""
+    return models.MetarReport(station, f"{station} 011200Z AUTO", "2024-01-01T12:00:00Z")
+
+
+def test_fresh_stale_and_expired():
+    """Entries are fresh until the soft TTL, stale until the hard TTL, then missing."""
+    clock = FakeClock()
+    report_cache = cache.ReportCache(TTLS, max_entries=100, clock=clock)
+    report_cache.store("METAR", {"KSFO", "KOAK"}, {"KSFO": _report("KSFO"), "KOAK": _report("KOAK")})
+
+    lookup = report_cache.lookup("METAR", {"KSFO", "KJFK"})
+    assert set(lookup.reports) == {"KSFO"}
+    assert lookup.stale == set()
+    assert lookup.missing == {"KJFK"}
+
+    clock.now += 121
+    lookup = report_cache.lookup("METAR", {"KSFO"})
+    assert set(lookup.reports) == {"KSFO"} and lookup.stale == {"KSFO"}
+
+    clock.now += 3600
+    assert report_cache.lookup("METAR", {"KSFO"}).missing == {"KSFO"}
+    assert report_cache.stats == {"entries": 2, "hits": 1, "stale_hits": 1, "misses": 2}
+
+
+def test_feeds_have_separate_ttls():
+    """A TAF stays fresh for longer than a METAR stored at the same time."""
+    clock = FakeClock()
+    report_cache = cache.ReportCache(TTLS, max_entries=100, clock=clock)
+    report_cache.store("METAR", {"KSFO"}, {"KSFO": _report("KSFO")})
+    report_cache.store("TAF", {"KSFO"}, {"KSFO": _report("KSFO")})
+    clock.now += 300
+    assert report_cache.lookup("METAR", {"KSFO"}).stale == {"KSFO"}
+    assert report_cache.lookup("TAF", {"KSFO"}).stale == set()
+
+
+def test_stations_without_reports_are_cached():
+    """A station known to have no report is answered without a fetch."""
+    report_cache = cache.ReportCache(TTLS, max_entries=100, clock=FakeClock())
+    report_cache.store("METAR", {"XXXX"}, {})
+    lookup = report_cache.lookup("METAR", {"XXXX"})
+    assert lookup.reports == {} and lookup.missing == set()
+
+
+def test_lru_eviction():
+    """The least recently used station is evicted first."""
+    report_cache = cache.ReportCache(TTLS, max_entries=2, clock=FakeClock())
+    report_cache.store("METAR", {"KAAA"}, {"KAAA": _report("KAAA")})
+    report_cache.store("METAR", {"KBBB"}, {"KBBB": _report("KBBB")})
+    report_cache.lookup("METAR", {"KAAA"})
+    report_cache.store("METAR", {"KCCC"}, {"KCCC": _report("KCCC")})
+    assert len(report_cache) == 2
+    assert report_cache.lookup("METAR", {"KAAA", "KBBB", "KCCC"}).missing == {"KBBB"}
+
+
+if __name__ == "__main__":
+    test_fresh_stale_and_expired()
+    test_feeds_have_separate_ttls()
+    test_stations_without_reports_are_cached()
+    test_lru_eviction()
+    print("✓ Report cache OK")
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Test the initial refresh shared by every config entry."""
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from homeassistant.core import CoreState  # noqa: E402
+
+from custom_components.av_weather import coordinator as coordinator_module  # noqa: E402
+from custom_components.av_weather.const import FEED_METAR, FEED_TAF  # noqa: E402
+
+
+def _hass(state: CoreState) -> MagicMock:
+    """Return a Home Assistant stand-in that keeps the background tasks it is given."""
+    hass = MagicMock()
+    hass.state = state
+    hass.refreshes = []
+
+    def _create_task(coro, name):
+        hass.refreshes.append(coro)
+        return MagicMock()
+
+    hass.async_create_background_task.side_effect = _create_task
+    return hass
+
+
+def _initial_refresh(hass: MagicMock):
+    """Return an initial refresh over a METAR coordinator mock."""
+    coordinators = {FEED_METAR: MagicMock(async_refresh_stations=AsyncMock())}
+    return coordinator_module.AvWeatherInitialRefresh(hass, coordinators), coordinators[FEED_METAR]
+
+
+def _fetched(hass: MagicMock, coordinator: MagicMock) -> list[set[str]]:
+    """Run the refreshes started so far and return the station sets fetched."""
+    for coro in hass.refreshes:
+        asyncio.run(coro)
+    hass.refreshes.clear()
+    return [call.args[0] for call in coordinator.async_refresh_stations.await_args_list]
+
+
+def test_entries_set_up_before_start_are_fetched_together():
+    """Stations queued during startup are fetched in one pass once started."""
+    hass = _hass(CoreState.starting)
+    started = []
+
+    def _at_started(hass, action):
+        started.append(action)
+        return MagicMock()
+
+    with patch.object(coordinator_module, "async_at_started", _at_started):
+        initial_refresh, coordinator = _initial_refresh(hass)
+        initial_refresh.async_add_stations(FEED_METAR, {"KSFO"})
+        initial_refresh.async_add_stations(FEED_METAR, {"KLAX"})
+
+    assert len(started) == 1
+    assert _fetched(hass, coordinator) == []
+    started[0](hass)
+    assert _fetched(hass, coordinator) == [{"KSFO", "KLAX"}]
+
+
+def test_entries_set_up_after_start_are_fetched_right_away():
+    """Each entry set up once Home Assistant is running gets its own fetch."""
+    hass = _hass(CoreState.running)
+    initial_refresh, coordinator = _initial_refresh(hass)
+
+    initial_refresh.async_add_stations(FEED_METAR, {"KSFO"})
+    assert _fetched(hass, coordinator) == [{"KSFO"}]
+    initial_refresh.async_add_stations(FEED_METAR, {"KLAX", "KJFK"})
+    assert _fetched(hass, coordinator) == [{"KSFO"}, {"KLAX", "KJFK"}]
+
+
+def test_failing_feed_does_not_cancel_the_others():
+    """An unexpected error in one feed's fetch leaves the other feeds and regions running."""
+    hass = _hass(CoreState.running)
+    gate = asyncio.Event()
+    finished = []
+
+    async def _slow_refresh(stations):
+        await gate.wait()
+        finished.append(stations)
+
+    async def _failing_refresh(stations):
+        gate.set()
+        raise RuntimeError("boom")
+
+    coordinators = {
+        FEED_METAR: MagicMock(async_refresh_stations=_slow_refresh),
+        FEED_TAF: MagicMock(async_refresh_stations=_failing_refresh),
+    }
+    region = MagicMock(async_refresh=AsyncMock(side_effect=RuntimeError("boom")))
+    initial_refresh = coordinator_module.AvWeatherInitialRefresh(hass, coordinators)
+    asyncio.run(initial_refresh._async_refresh({FEED_METAR: {"KSFO"}, FEED_TAF: {"KSFO"}}, [region]))
+    assert finished == [{"KSFO"}]
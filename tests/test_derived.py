@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Test the metrics derived from METARs."""
+import pytest
+
+from conftest import load_module
+
+models = load_module("models")
+derived = load_module("derived")
+
+
+def _report(**fields):
+    """Return a METAR report with the given decoded fields."""
+    return models.MetarReport("KDEN", None, "2024-07-01T21:53:00Z", **fields)
+
+
+def test_parse_runways():
+    """Runway ends are parsed per airport, with shared lines under ""."""
+    runways = derived.parse_runways("08 26\nKJFK: 04L, 22r\nkjfk: 13R")
+    assert runways[""] == (derived.Runway("08", 80), derived.Runway("26", 260))
+    assert [runway.designator for runway in runways["KJFK"]] == ["04L", "22R", "13R"]
+    assert derived.parse_runways(None) == {}
+    with pytest.raises(ValueError):
+        derived.parse_runways("KJFK: 37")
+
+
+def test_runway_headings_corrected_to_true():
+    """A magnetic variation or an explicit heading turns runway headings true."""
+    runways = derived.parse_runways("KSFO 13E: 28L 10R 01@014\nKJFK 13W: 04L\nKBOS: 04R")
+    assert runways["KSFO"] == (
+        derived.Runway("28L", 293, True), derived.Runway("10R", 113, True), derived.Runway("01", 14, True),
+    )
+    assert runways["KJFK"] == (derived.Runway("04L", 27, True),)
+    assert runways["KBOS"] == (derived.Runway("04R", 40),)
+    assert derived.parse_runways("5E: 36")[""] == (derived.Runway("36", 5, True),)
+    assert derived.parse_runways("5W: 01")[""] == (derived.Runway("01", 5, True),)
+    for invalid in ("KSFO: 28L@361", "KSFO: 28L@0", "KSFO KOAK: 28L", "KSFO 13X: 28L"):
+        with pytest.raises(ValueError):
+            derived.parse_runways(invalid)
+
+
+def test_runway_winds_use_the_heading_reference():
+    """A true heading changes the components, and the attributes say which was used."""
+    true_wind = derived.runway_wind(derived.Runway("28L", 293, True), 293, 20)
+    magnetic_wind = derived.runway_wind(derived.Runway("28L", 280), 293, 20)
+    assert (true_wind.headwind, true_wind.crosswind) == (20, 0)
+    assert magnetic_wind.crosswind == 4
+    assert true_wind.as_dict()["heading_reference"] == "true"
+    assert magnetic_wind.as_dict()["heading_reference"] == "magnetic"
+    assert magnetic_wind.as_dict()["heading_deg"] == 280
+
+
+def test_humidity_spread_and_cloud_base():
+    """Humidity, spread and estimated cloud base come from temperature and dewpoint."""
+    metrics = derived.derive_metrics(_report(temperature=20.0, dewpoint=10.0))
+    assert metrics.relative_humidity == pytest.approx(52.5, abs=0.5)
+    assert metrics.dewpoint_spread == 10.0
+    assert metrics.estimated_cloud_base == 4000
+    assert derived.derive_metrics(_report(temperature=5.0, dewpoint=5.0)).relative_humidity == 100.0
+    assert "relative_humidity_pct" not in derived.derive_metrics(_report(temperature=5.0)).as_attributes()
+
+
+def test_density_altitude():
+    """A hot day at Denver puts the density altitude far above the field."""
+    # 1655 m field elevation, QNH 1013.2 hPa (29.92 inHg), 35 °C
+    metrics = derived.derive_metrics(_report(temperature=35.0, elevation=1655, altimeter=1013.2))
+    assert metrics.pressure_altitude == pytest.approx(5430, abs=10)
+    assert metrics.density_altitude == pytest.approx(9085, abs=20)
+
+
+def test_runway_winds():
+    """Winds resolve into head- and crosswind, positive crosswind from the right."""
+    runways = derived.parse_runways("17L 35R")[""]
+    metrics = derived.derive_metrics(
+        _report(wind_direction=200, wind_speed=20, wind_gust=30), runways
+    )
+    south, north = metrics.runway_winds
+    assert (south.headwind, south.crosswind, south.gust_crosswind) == (17, 10, 15)
+    assert (north.headwind, north.crosswind) == (-17, -10)
+    assert metrics.as_attributes()["favored_runway"] == "17L"
+
+    calm = derived.derive_metrics(_report(wind_direction="VRB", wind_speed=3), runways)
+    assert calm.runway_winds == ()
+
+
+def test_cached_per_report():
+    """The same report is derived once and shared."""
+    report = _report(temperature=12.0, dewpoint=3.0)
+    assert derived.derive_metrics(report) is derived.derive_metrics(report)
+
+
+if __name__ == "__main__":
+    test_parse_runways()
+    test_runway_headings_corrected_to_true()
+    test_runway_winds_use_the_heading_reference()
+    test_humidity_spread_and_cloud_base()
+    test_density_altitude()
+    test_runway_winds()
+    test_cached_per_report()
+    print("✓ Derived metrics OK")
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""Test flight category computation, single and batched."""
+import random
+
+from conftest import load_module
+
+models = load_module("models")
+flight_category = load_module("flight_category")
+
+CloudLayer = models.CloudLayer
+MetarReport = models.MetarReport
+
+
+def test_faa_categories():
+    """Ceiling and visibility are classified with the FAA limits."""
+    classify = flight_category.flight_category
+    assert classify("10+", [CloudLayer("SCT", 4000)]) == "VFR"
+    assert classify(10, [CloudLayer("BKN", 3000)]) == "MVFR"
+    assert classify(5, []) == "MVFR"
+    assert classify(10, [CloudLayer("FEW", 200), CloudLayer("OVC", 900)]) == "IFR"
+    assert classify(2.5, [CloudLayer("CLR")]) == "IFR"
+    assert classify(0.5, []) == "LIFR"
+    assert classify(None, [CloudLayer("VV", 100)]) == "LIFR"
+    assert classify(None, [CloudLayer("SKC")]) == "VFR"
+    assert classify(None, []) is None
+
+
+def test_custom_minima():
+    """Custom minima classify the same report more strictly."""
+    minima = flight_category.minima_from_config({
+        "mvfr_ceiling": 5000,
+        "mvfr_visibility": 7,
+        "ifr_ceiling": 2000,
+        "ifr_visibility": 5,
+        "lifr_ceiling": 1000,
+        "lifr_visibility": 3,
+    })
+    clouds = [CloudLayer("BKN", 1500)]
+    assert flight_category.flight_category(10, clouds) == "MVFR"
+    assert flight_category.flight_category(10, clouds, minima) == "IFR"
+    assert flight_category.minima_from_config(None) is None
+    assert flight_category.minima_from_config({"ifr_ceiling": 800}).ifr_ceiling == 800
+
+
+def _random_pairs(count):
+    """Return random (visibility, ceiling) pairs, some of them unknown."""
+    rng = random.Random(42)
+    return (
+        [rng.choice([None, 0.25, 1, 2.5, 3, 5, 6, 10]) for _ in range(count)],
+        [rng.choice([None, float("inf"), 200, 500, 900, 1000, 3000, 3500]) for _ in range(count)],
+    )
+
+
+def test_batch_matches_single():
+    """The batch classifier agrees with classifying each pair on its own."""
+    visibilities, ceilings = _random_pairs(500)
+    expected = [flight_category.classify(v, c) for v, c in zip(visibilities, ceilings)]
+    assert flight_category.classify_batch(visibilities, ceilings) == expected
+    # Small batches take the pure Python path even with NumPy installed
+    assert flight_category.classify_batch(visibilities[:5], ceilings[:5]) == expected[:5]
+
+
+def test_fill_flight_categories():
+    """Reports without a category from the API get a computed one."""
+    reports = [
+        MetarReport("KAAA", None, None, flight_category="VFR", visibility=0.5),
+        MetarReport("KBBB", None, None, visibility="10+", clouds=(CloudLayer("OVC", 800),)),
+        MetarReport("KCCC", None, None),
+    ]
+    filled = flight_category.fill_flight_categories(reports)
+    assert [report.flight_category for report in filled] == ["VFR", "IFR", None]
+    assert filled[0] is reports[0] and filled[2] is reports[2]
+
+
+if __name__ == "__main__":
+    test_faa_categories()
+    test_custom_minima()
+    test_batch_matches_single()
+    test_fill_flight_categories()
+    print("✓ Flight categories OK")
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Test the geospatial airport index."""
+import asyncio
+import math
+
+from conftest import load_module
+
+geo = load_module("geo")
+
+
+def _index(**positions):
+    """Return an index of airports placed at (lat, lon) positions."""
+    return geo.AirportGeoIndex({icao: {"lat": lat, "lon": lon} for icao, (lat, lon) in positions.items()})
+
+
+def test_within_radius_nearest_first():
+    """Airports inside the radius are returned nearest first, the rest are left out."""
+    index = _index(KSFO=(37.619, -122.375), KOAK=(37.721, -122.221), KSJC=(37.363, -121.929), KLAX=(33.942, -118.408))
+    found = index.within_radius(37.7, -122.3, 60)
+    assert [icao for icao, _ in found] == ["KOAK", "KSFO", "KSJC"]
+    assert all(distance <= 60 for _, distance in found)
+
+
+def test_antimeridian():
+    """A circle crossing the antimeridian finds airports on both sides."""
+    index = _index(EAST=(-17.0, 179.9), WEST=(-17.0, -179.9), FAR=(-17.0, 170.0))
+    found = index.within_radius(-17.0, 179.95, 50)
+    assert {icao for icao, _ in found} == {"EAST", "WEST"}
+    assert index.nearest(-17.0, -179.95, 2) == index.within_radius(-17.0, -179.95, 50)
+
+
+def test_poles():
+    """Near a pole every longitude is searched."""
+    index = _index(NORTH=(89.5, 180.0), SOUTH=(-89.9, 45.0))
+    found = index.within_radius(89.5, 0.0, 150)
+    assert [icao for icao, _ in found] == ["NORTH"]
+    assert math.isclose(found[0][1], 111.2, abs_tol=0.5)
+    assert [icao for icao, _ in index.nearest(-89.9, -135.0, 1)] == ["SOUTH"]
+
+
+def test_nearest_with_a_sparse_index(monkeypatch):
+    """Asking for more airports than exist stops once the whole grid is searched."""
+    index = _index(NZAA=(-37.008, 174.792))
+    searches = []
+    within_radius = index.within_radius
+    monkeypatch.setattr(index, "within_radius", lambda *args: searches.append(args[2]) or within_radius(*args))
+
+    assert [icao for icao, _ in index.nearest(51.47, -0.454, 5, float("inf"))] == ["NZAA"]
+    assert max(searches) == geo.MAX_RADIUS_KM
+    assert len(searches) <= 10
+    assert geo.AirportGeoIndex({}).nearest(0, 0, 3, float("inf")) == []
+
+
+def test_nearest_stops_once_enough_are_found():
+    """The search radius only widens until the requested count is found."""
+    index = _index(KSFO=(37.619, -122.375), KOAK=(37.721, -122.221), KLAX=(33.942, -118.408))
+    assert [icao for icao, _ in index.nearest(37.7, -122.3, 2)] == ["KOAK", "KSFO"]
+    assert [icao for icao, _ in index.nearest(37.7, -122.3, 3, max_radius_km=100)] == ["KOAK", "KSFO"]
+
+
+def test_bounding_box():
+    """Boxes are clamped at the poles and the antimeridian."""
+    min_lat, min_lon, max_lat, max_lon = geo.bounding_box(0.0, 0.0, 111.19508)
+    assert math.isclose(min_lat, -1.0, abs_tol=1e-4) and math.isclose(max_lon, 1.0, abs_tol=1e-3)
+    assert geo.bounding_box(89.5, 10.0, 100)[1:4:2] == (-180.0, 180.0)
+    assert geo.bounding_box(0.0, 179.5, 200)[3] == 180.0
+
+
+def test_shared_index_across_event_loops(monkeypatch):
+    """The shared index is built once, from calls on any event loop."""
+    loads = []
+
+    async def _load_airports():
+        loads.append(None)
+        await asyncio.sleep(0)
+        return {"KSFO": {"lat": 37.6, "lon": -122.4}}
+
+    monkeypatch.setattr(geo, "load_airports", _load_airports)
+    monkeypatch.setattr(geo, "_GEO_INDEX", None)
+    monkeypatch.setattr(geo, "_GEO_INDEX_LOCK", None)
+
+    async def _get_twice():
+        return await asyncio.gather(geo.async_get_geo_index(), geo.async_get_geo_index())
+
+    first, second = asyncio.run(_get_twice())
+    assert first is second and len(first) == 1
+    monkeypatch.setattr(geo, "_GEO_INDEX", None)
+    assert len(asyncio.run(geo.async_get_geo_index())) == 1
+    assert len(loads) == 2
+
+
+if __name__ == "__main__":
+    test_within_radius_nearest_first()
+    test_antimeridian()
+    test_poles()
+    test_nearest_stops_once_enough_are_found()
+    test_bounding_box()
+    print("✓ Geo index OK")
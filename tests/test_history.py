@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Test the per-station observation ring buffer and its trends."""
+import json
+
+from conftest import load_module
+
+models = load_module("models")
+history = load_module("history")
+
+HOUR = 3600
+START = 1_700_000_000
+
+
+def _report(hour, altimeter, temperature, dewpoint, category, visibility="10+"):
+    """Return a METAR observed ``hour`` hours after the start."""
+    return models.MetarReport(
+        "KSFO",
+        None,
+        None,
+        obs_time=START + int(hour * HOUR),
+        flight_category=category,
+        temperature=temperature,
+        dewpoint=dewpoint,
+        visibility=visibility,
+        altimeter=altimeter,
+    )
+
+
+def _falling_pressure_history():
+    """Return a history with six hours of falling pressure and converging spread."""
+    reports = [
+        _report(0, 1020.0, 15.0, 5.0, "VFR"),
+        _report(1, 1019.0, 14.0, 6.0, "VFR"),
+        _report(2, 1018.0, 13.0, 7.0, "VFR"),
+        _report(3, 1017.0, 12.0, 8.0, "VFR"),
+        _report(4, 1016.0, 11.0, 9.0, "MVFR", visibility=5),
+        _report(5, 1015.0, 10.0, 9.5, "IFR", visibility=2),
+        _report(6, 1014.0, 9.5, 9.5, "LIFR", visibility=0.5),
+    ]
+    report_history = history.ReportHistory(capacity=48, max_age=12 * HOUR)
+    assert report_history.add_reports(reports)
+    return report_history
+
+
+def test_trends():
+    """Trends cover the window before the newest observation."""
+    trends = _falling_pressure_history().get("KSFO").trends(3)
+    assert trends["altimeter_tendency_hpa"] == -3.0
+    assert trends["pressure_trend"] == "falling"
+    assert trends["dewpoint_spread_trend_c"] == -4.0
+    assert trends["visibility_trend_mi"] == -9.5
+    assert [change["flight_category"] for change in trends["category_changes"]] == ["MVFR", "IFR", "LIFR"]
+
+
+def test_duplicates_and_single_observation():
+    """Repeated observations are ignored and one observation has no trend."""
+    report_history = history.ReportHistory(capacity=48, max_age=12 * HOUR)
+    report = _report(0, 1013.0, 10.0, 5.0, "VFR")
+    assert report_history.add_reports([report])
+    assert not report_history.add_reports([report])
+    trends = report_history.get("KSFO").trends(3)
+    assert trends["altimeter_tendency_hpa"] is None
+    assert trends["pressure_trend"] is None
+    assert trends["category_changes"] == []
+
+
+def test_capacity_and_age_eviction():
+    """The buffer keeps at most its capacity, and nothing older than its maximum age."""
+    station = history.StationHistory(capacity=4, max_age=12 * HOUR)
+    for hour in range(6):
+        station.add(history.Observation.from_report(_report(hour, 1013.0, 10.0, 5.0, "VFR")))
+    assert len(station) == 4
+    assert [observation.time for observation in station][0] == START + 2 * HOUR
+
+    station.add(history.Observation.from_report(_report(16, 1013.0, 10.0, 5.0, "VFR")))
+    assert [observation.time for observation in station] == [START + 4 * HOUR, START + 5 * HOUR, START + 16 * HOUR]
+
+
+def test_persistence_round_trip():
+    """The stored history restores the same observations and trends."""
+    original = _falling_pressure_history()
+    restored = history.ReportHistory(capacity=48, max_age=12 * HOUR)
+    restored.load(json.loads(json.dumps(original.as_dict())))
+    assert list(restored.get("KSFO")) == list(original.get("KSFO"))
+    assert restored.get("KSFO").trends(3) == original.get("KSFO").trends(3)
+
+    restored.evict(START + 7 * HOUR)
+    assert restored.get("KSFO") is None
+
+
+if __name__ == "__main__":
+    test_trends()
+    test_duplicates_and_single_observation()
+    test_capacity_and_age_eviction()
+    test_persistence_round_trip()
+    print("✓ Observation history OK")
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""Test the incremental JSON array parser."""
+import json
+
+import pytest
+
+from conftest import load_module
+
+jsonstream = load_module("jsonstream")
+
+REPORTS = [
+    {"icaoId": "NZAA", "rawOb": "NZAA 011200Z 23012KT", "clouds": [{"cover": "FEW", "base": 2500}], "name": "Auckland, Ü"},
+    {"icaoId": "KJFK", "rawOb": "KJFK 011151Z VRB03KT", "clouds": [], "name": "New York/JFK [\"Intl\"]"},
+    {"icaoId": "EGLL", "rawOb": "EGLL 011150Z 27015G25KT", "clouds": [], "name": "London, {Heathrow}"},
+]
+
+
+def _parse(body: bytes, size: int, stations=None, fields=None) -> tuple[list[dict], set[str]]:
+    """Feed a body to the parser in chunks of a given size."""
+    parser = jsonstream.JsonArrayParser(stations, fields)
+    records = []
+    for i in range(0, len(body), size):
+        records.extend(parser.feed(body[i:i + size]))
+    records.extend(parser.close())
+    return records, parser.seen
+
+
+def test_chunk_size_does_not_matter():
+    """Records are identical however the body is split, even inside UTF-8 characters."""
+    body = json.dumps(REPORTS, indent=2, ensure_ascii=False).encode()
+    for size in (1, 3, 17, len(body)):
+        records, seen = _parse(body, size)
+        assert records == REPORTS
+        assert seen == {"NZAA", "KJFK", "EGLL"}
+
+
+def test_filters_and_projects():
+    """Only wanted stations are kept, projected to the wanted fields."""
+    body = json.dumps(REPORTS).encode()
+    records, seen = _parse(body, 10, {"KJFK"}, ("icaoId", "rawOb"))
+
+    assert records == [{"icaoId": "KJFK", "rawOb": "KJFK 011151Z VRB03KT"}]
+    assert seen == {"NZAA", "KJFK", "EGLL"}
+
+
+def test_empty_array():
+    """An empty array yields no records."""
+    assert _parse(b" [ ] ", 2) == ([], set())
+
+
+def test_rejects_invalid_bodies():
+    """Non-list and truncated bodies raise ValueError."""
+    with pytest.raises(ValueError):
+        _parse(b'{"error": "bad request"}', 4)
+    with pytest.raises(ValueError):
+        _parse(json.dumps(REPORTS).encode()[:-20], 8)
+    with pytest.raises(ValueError):
+        _parse(b"", 8)
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""Test the raw METAR decoder against a fixture corpus."""
+from conftest import FIXTURES, load_module
+
+metar_decoder = load_module("metar_decoder")
+
+CORPUS = (FIXTURES / "metars.txt").read_text(encoding="utf-8").splitlines()
+
+
+def test_sea_level_pressure_and_t_group():
+    """SLP and tenth-degree temperatures are decoded from the remarks."""
+    decoded = metar_decoder.decode_metar(CORPUS[0])
+    assert decoded.sea_level_pressure == 1013.2
+    assert decoded.temperature == 12.2
+    assert decoded.dewpoint == 11.1
+    assert decoded.precise_temperature
+
+    anchorage = metar_decoder.decode_metar(next(raw for raw in CORPUS if raw.startswith("KANC")))
+    assert anchorage.sea_level_pressure == 999.3
+    assert anchorage.temperature == -12.2
+
+
+def test_body_groups():
+    """Wind, variable wind, temperatures and altimeter are decoded from the body."""
+    decoded = metar_decoder.decode_metar(next(raw for raw in CORPUS if raw.startswith("EGLL")))
+    assert (decoded.wind_direction, decoded.wind_speed, decoded.wind_gust) == (270, 15, 25)
+    assert (decoded.wind_variable_from, decoded.wind_variable_to) == (240, 300)
+    assert (decoded.temperature, decoded.dewpoint) == (15, 7)
+    assert not decoded.precise_temperature
+    assert decoded.altimeter == 1012
+    assert decoded.sea_level_pressure is None
+
+    moscow = metar_decoder.decode_metar(next(raw for raw in CORPUS if raw.startswith("UUDD")))
+    assert moscow.wind_speed == 10  # 5 m/s in knots
+    assert moscow.temperature == 6 and moscow.dewpoint == -2
+
+    calm = metar_decoder.decode_metar(next(raw for raw in CORPUS if raw.startswith("KATL")))
+    assert calm.altimeter == 1017.6  # A3005 in hectopascals
+
+
+def test_runway_visual_range():
+    """RVR groups are decoded in feet with their bounds and trends."""
+    boston = metar_decoder.decode_metar(next(raw for raw in CORPUS if raw.startswith("KBOS")))
+    assert [rvr.as_dict() for rvr in boston.runway_visual_range] == [
+        {"runway": "04R", "visibility_ft": 4000, "max_visibility_ft": 6000, "modifier": "P", "trend": None},
+    ]
+
+    oslo = metar_decoder.decode_metar(next(raw for raw in CORPUS if raw.startswith("ENGM")))
+    first, second = oslo.runway_visual_range
+    assert (first.runway, first.visibility_ft, first.trend) == ("01L", 1969, "N")
+    assert (second.runway, second.modifier, second.trend) == ("19R", "P", "U")
+
+
+def test_missing_slp_and_speci():
+    """SLPNO decodes to no pressure and SPECIs decode like METARs."""
+    assert metar_decoder.decode_metar(CORPUS[-1]).sea_level_pressure is None
+    speci = metar_decoder.decode_metar(next(raw for raw in CORPUS if raw.startswith("SPECI")))
+    assert speci.wind_speed == 12 and speci.temperature == 11.7
+
+
+def test_batch_matches_single():
+    """The batch path returns the same results, with None for missing texts."""
+    decoded = metar_decoder.decode_metars(CORPUS + [None])
+    assert decoded[:-1] == [metar_decoder.decode_metar(raw) for raw in CORPUS]
+    assert decoded[-1] is None
+
+
+if __name__ == "__main__":
+    test_sea_level_pressure_and_t_group()
+    test_body_groups()
+    test_runway_visual_range()
+    test_missing_slp_and_speci()
+    test_batch_matches_single()
+    print("✓ METAR decoder OK")
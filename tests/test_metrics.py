@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""Test the request counters and histograms."""
+from conftest import load_module
+
+metrics = load_module("metrics")
+
+
+def test_histogram_buckets():
+    """Values land in the first bucket whose bound they do not exceed."""
+    histogram = metrics.Histogram((10, 100))
+    for value in (5, 10, 50, 500):
+        histogram.observe(value)
+    assert histogram.as_dict() == {
+        "count": 4,
+        "mean": 141.2,
+        "max": 500,
+        "buckets": {"<=10": 2, "<=100": 1, ">100": 1},
+    }
+    assert metrics.Histogram((10,)).as_dict()["mean"] is None
+
+
+def test_feed_counters():
+    """Responses, rate limits, timeouts and errors are counted apart."""
+    api_metrics = metrics.ApiMetrics()
+    api_metrics.record(metrics.RequestTiming("METAR", "u", status=200, bytes=1000, records=4, elapsed_ms=80))
+    api_metrics.record(metrics.RequestTiming("METAR", "u", status=200, bytes=500, records=2, elapsed_ms=120))
+    api_metrics.record(metrics.RequestTiming("METAR", "u", status=429, elapsed_ms=30))
+    api_metrics.record(metrics.RequestTiming("METAR", "u", timed_out=True, elapsed_ms=15000))
+    api_metrics.record(metrics.RequestTiming("TAF", "u", elapsed_ms=5))
+
+    metar = api_metrics.as_dict()["METAR"]
+    assert metar["requests"] == 4
+    assert metar["bytes"] == 1500
+    assert metar["records_per_response"] == 3.0
+    assert metar["statuses"] == {"200": 2, "429": 1}
+    assert (metar["rate_limited"], metar["timeouts"], metar["errors"]) == (1, 1, 0)
+    assert metar["latency_ms"]["buckets"][">10000"] == 1
+    assert metar["parse_ms"]["count"] == 2
+
+    taf = api_metrics.feed("TAF").as_dict()
+    assert taf["errors"] == 1 and taf["records_per_response"] is None
+
+
+if __name__ == "__main__":
+    test_histogram_buckets()
+    test_feed_counters()
+    print("✓ Request metrics OK")
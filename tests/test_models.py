@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""Test that reports survive being stored with the API's field names."""
+import gzip
+import json
+
+from conftest import FIXTURES, load_module
+
+bulk = load_module("bulk")
+models = load_module("models")
+
+
+def _records(name: str, parser) -> list[dict]:
+    """Return the records of a gzipped bulk fixture."""
+    return list(bulk.iter_cache_records([gzip.compress((FIXTURES / name).read_bytes())], parser))
+
+
+def _round_trip(report):
+    """Encode a report as it is stored on disk and decode it again."""
+    return type(report).from_dict(json.loads(json.dumps(report.as_dict())))
+
+
+def test_metar_round_trip():
+    """Every METAR field, including those decoded from the raw text, is restored."""
+    for record in _records("metars.cache.csv", bulk.MetarCsvParser(None)):
+        report = models.MetarReport.from_dict(record)
+        assert _round_trip(report) == report
+
+    raw = (FIXTURES / "metars.txt").read_text(encoding="utf-8").splitlines()
+    for line in raw:
+        report = models.MetarReport.from_dict({"icaoId": line.split()[0], "rawOb": line})
+        assert _round_trip(report) == report
+
+
+def test_taf_round_trip():
+    """Forecasts are restored with all their periods and cloud layers."""
+    reports = [models.TafReport.from_dict(record) for record in _records("tafs.cache.xml", bulk.TafXmlParser(None))]
+    assert reports and all(report.periods for report in reports)
+    for report in reports:
+        assert _round_trip(report) == report
+
+
+if __name__ == "__main__":
+    test_metar_round_trip()
+    test_taf_round_trip()
+    print("✓ Report models OK")
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Test the token bucket limiter and Retry-After parsing."""
+import asyncio
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+from conftest import load_module
+
+ratelimit = load_module("ratelimit")
+
+
+class FakeClock:
+    """A clock that only moves when the limiter sleeps, or by hand."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def _limiter(clock: FakeClock, rate: float = 1.0, burst: int = 3) -> "ratelimit.TokenBucketLimiter":
+    """Return a limiter on the fake clock, with 5 s backoff doubling up to 60 s."""
+    return ratelimit.TokenBucketLimiter(rate, burst, 5, 60, clock=clock, sleep=clock.sleep)
+
+
+def _acquire(limiter, times: int) -> None:
+    """Take tokens one after the other."""
+    async def _run():
+        for _ in range(times):
+            await limiter.async_acquire()
+
+    asyncio.run(_run())
+
+
+def test_burst_then_refill_rate():
+    """A full bucket allows a burst, then requests are spaced by the refill rate."""
+    clock = FakeClock()
+    limiter = _limiter(clock, rate=0.5)
+    _acquire(limiter, 3)
+    assert clock.sleeps == []
+    _acquire(limiter, 2)
+    assert clock.sleeps == [2.0, 2.0]
+    assert clock.now == 1004.0
+
+
+def test_refill_is_capped_at_burst():
+    """An idle bucket refills, but never beyond its burst size."""
+    clock = FakeClock()
+    limiter = _limiter(clock)
+    _acquire(limiter, 3)
+    clock.now += 100
+    _acquire(limiter, 3)
+    assert clock.sleeps == []
+    _acquire(limiter, 1)
+    assert clock.sleeps == [1.0]
+
+
+def test_backoff_grows_and_resets(monkeypatch):
+    """Each failure doubles the backoff up to its cap; a success starts over."""
+    monkeypatch.setattr(ratelimit.random, "uniform", lambda low, high: high)
+    limiter = _limiter(FakeClock())
+    assert [limiter.penalize() for _ in range(6)] == [5, 10, 20, 40, 60, 60]
+    assert limiter.failures == 6
+    limiter.reset()
+    assert limiter.failures == 0
+    assert limiter.penalize() == 5
+
+
+def test_backoff_jitter_stays_within_bounds():
+    """The jittered backoff lies between half and all of the exponential delay."""
+    limiter = _limiter(FakeClock())
+    for expected in (5, 10, 20):
+        assert expected / 2 <= limiter.penalize() <= expected
+
+
+def test_penalty_blocks_requests():
+    """After a penalty nobody gets a token until the Retry-After delay is over."""
+    clock = FakeClock()
+    limiter = _limiter(clock)
+    assert limiter.penalize(30) == 30
+    assert limiter.penalize(1000) == 60
+    _acquire(limiter, 1)
+    assert clock.now == 1060.0
+
+
+def test_parse_retry_after():
+    """Retry-After is read as seconds or as an HTTP date."""
+    assert ratelimit.parse_retry_after("120") == 120.0
+    assert ratelimit.parse_retry_after(None) is None
+    assert ratelimit.parse_retry_after("soon") is None
+    later = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=90), usegmt=True)
+    assert 85 <= ratelimit.parse_retry_after(later) <= 90
+    earlier = format_datetime(datetime.now(timezone.utc) - timedelta(seconds=90), usegmt=True)
+    assert ratelimit.parse_retry_after(earlier) == 0.0
+
+
+if __name__ == "__main__":
+    test_burst_then_refill_rate()
+    test_refill_is_capped_at_burst()
+    test_backoff_jitter_stays_within_bounds()
+    test_penalty_blocks_requests()
+    test_parse_retry_after()
+    print("✓ Rate limiter OK")
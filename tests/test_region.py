@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Test the region coordinator's area request and radius filter, and the region sensor."""
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from homeassistant.helpers.update_coordinator import UpdateFailed  # noqa: E402
+
+from custom_components.av_weather.api import AviationWeatherApiError  # noqa: E402
+from custom_components.av_weather.const import FEED_METAR  # noqa: E402
+from custom_components.av_weather.coordinator import AvWeatherRegionCoordinator  # noqa: E402
+from custom_components.av_weather.geo import bounding_box  # noqa: E402
+from custom_components.av_weather.models import MetarReport  # noqa: E402
+from custom_components.av_weather.sensor import RegionSensor  # noqa: E402
+
+LATITUDE, LONGITUDE, RADIUS_KM = 37.62, -122.38, 50
+
+
+def _metar(station: str, latitude: float | None, longitude: float | None, category: str = "VFR") -> MetarReport:
+    """Return a METAR at a position."""
+    return MetarReport(
+        station,
+        f"{station} 011756Z 28015KT 10SM FEW012 18/12 A3001",
+        "2024-07-01T18:00:00Z",
+        flight_category=category,
+        latitude=latitude,
+        longitude=longitude,
+    )
+
+
+# The area request returns everything inside the bounding box of the circle
+AREA = {
+    "KSFO": _metar("KSFO", 37.62, -122.38),
+    "KOAK": _metar("KOAK", 37.72, -122.22, "MVFR"),  # 18 km
+    "KSJC": _metar("KSJC", 37.36, -121.93),  # 49 km
+    "KCCR": _metar("KCCR", 38.0, -121.85),  # 63 km, in a corner of the box
+    "KXXX": _metar("KXXX", None, None),  # position unknown
+}
+
+
+def _coordinator(api: MagicMock) -> AvWeatherRegionCoordinator:
+    """Return a METAR region coordinator around KSFO."""
+    return AvWeatherRegionCoordinator(MagicMock(), api, FEED_METAR, LATITUDE, LONGITUDE, RADIUS_KM, 10)
+
+
+def test_area_request_is_filtered_to_the_circle():
+    """The bounding box is requested and stations outside the radius are dropped."""
+    api = MagicMock(async_get_area_data=AsyncMock(return_value=AREA))
+    data = asyncio.run(_coordinator(api)._async_update_data())
+
+    api.async_get_area_data.assert_awaited_once_with(FEED_METAR, *bounding_box(LATITUDE, LONGITUDE, RADIUS_KM))
+    assert set(data) == {"KSFO", "KOAK", "KSJC", "KXXX"}
+
+
+def test_area_request_failure():
+    """An API error fails the update, so the last data is kept."""
+    api = MagicMock(async_get_area_data=AsyncMock(side_effect=AviationWeatherApiError("down")))
+    with pytest.raises(UpdateFailed):
+        asyncio.run(_coordinator(api)._async_update_data())
+
+
+def test_region_sensor():
+    """The region sensor counts the stations and their flight categories."""
+    coordinator = MagicMock(
+        data={station: AREA[station] for station in ("KSFO", "KOAK", "KSJC")},
+        feed_type=FEED_METAR,
+        latitude=LATITUDE,
+        longitude=LONGITUDE,
+        radius_km=RADIUS_KM,
+    )
+    entry = MagicMock(entry_id="region", title="Bay Area", data={})
+    sensor = RegionSensor(entry, coordinator)
+
+    assert sensor.native_value == 3
+    attributes = sensor.extra_state_attributes
+    assert attributes["category_counts"] == {"VFR": 2, "MVFR": 1}
+    assert list(attributes["stations"]) == ["KOAK", "KSFO", "KSJC"]
+    assert attributes["radius_km"] == RADIUS_KM
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""Test the issuance-aware polling scheduler."""
+import math
+from datetime import datetime, timedelta, timezone
+
+from conftest import load_module
+
+scheduler = load_module("scheduler")
+
+MINUTE = timedelta(minutes=1)
+IDLE = 10 * MINUTE
+
+
+def _at(hour: int, minute: int, second: int = 0) -> datetime:
+    """Return a time on the test day."""
+    return datetime(2024, 7, 1, hour, minute, second, tzinfo=timezone.utc)
+
+
+def _metar_scheduler() -> "scheduler.IssuanceScheduler":
+    """Return a scheduler with the hourly METAR cycle and its default windows."""
+    return scheduler.IssuanceScheduler(
+        cycle=60 * MINUTE,
+        window_before=2 * MINUTE,
+        window_after=10 * MINUTE,
+        fast_interval=MINUTE,
+    )
+
+
+def _learned(*issued: datetime) -> "scheduler.IssuanceScheduler":
+    """Return a METAR scheduler that has seen KSFO issue at the given times."""
+    metar_scheduler = _metar_scheduler()
+    for time in issued:
+        assert metar_scheduler.observe("KSFO", time)
+    return metar_scheduler
+
+
+def test_pattern_needs_enough_samples():
+    """The idle interval is used until a station's offset has been seen twice."""
+    metar_scheduler = _learned(_at(10, 53))
+    assert metar_scheduler.expected_offset("KSFO") is None
+    assert metar_scheduler.next_delay(_at(11, 52), IDLE) == IDLE
+    assert _metar_scheduler().next_delay(_at(11, 52), IDLE) == IDLE
+
+
+def test_predicted_next_poll():
+    """Polls back off after the report, speed up in the window and relax once it is late."""
+    metar_scheduler = _learned(_at(10, 53), _at(11, 53))
+    assert math.isclose(metar_scheduler.expected_offset("KSFO"), 53 * 60)
+
+    # This hour's report is in: wait until two minutes before the next one
+    assert metar_scheduler.next_delay(_at(12, 40), IDLE) == 11 * MINUTE
+    # Inside the window, still waiting
+    assert metar_scheduler.next_delay(_at(12, 52), IDLE) == MINUTE
+    assert metar_scheduler.next_delay(_at(13, 3), IDLE) == MINUTE
+    # More than ten minutes late
+    assert metar_scheduler.next_delay(_at(13, 4), IDLE) == IDLE
+
+    # The new report arrives and the scheduler backs off again
+    assert metar_scheduler.observe("KSFO", _at(12, 54))
+    assert 56 * MINUTE < metar_scheduler.next_delay(_at(12, 55), 30 * MINUTE) < 57 * MINUTE
+
+
+def test_delay_clamping():
+    """Backoff is capped at three idle intervals and never below the fast interval."""
+    metar_scheduler = _learned(_at(10, 53), _at(11, 53))
+    assert metar_scheduler.next_delay(_at(12, 0), 2 * MINUTE) == 6 * MINUTE
+    assert metar_scheduler.next_delay(_at(12, 50, 30), IDLE) == MINUTE
+
+
+def test_earliest_station_wins():
+    """With several stations the soonest poll any of them wants is used."""
+    metar_scheduler = _learned(_at(10, 53), _at(11, 53))
+    for hour in (10, 11, 12):
+        metar_scheduler.observe("KOAK", _at(hour, 20))
+    assert metar_scheduler.next_delay(_at(12, 25), IDLE) == 26 * MINUTE
+    metar_scheduler.forget({"KSFO"})
+    assert metar_scheduler.next_delay(_at(12, 25), IDLE) == 3 * IDLE
+
+
+def test_offsets_across_the_cycle_boundary():
+    """Issuances either side of the hour average to the hour, not the half hour."""
+    metar_scheduler = _learned(_at(10, 59), _at(12, 1))
+    offset = metar_scheduler.expected_offset("KSFO")
+    assert min(offset, 3600 - offset) < 1
+
+
+def test_speci_and_repeated_reports_are_ignored():
+    """SPECIs and reports no newer than the last do not move the learned offset."""
+    metar_scheduler = _learned(_at(10, 53), _at(11, 53))
+    assert not metar_scheduler.observe("KSFO", _at(12, 17), routine=False)
+    assert not metar_scheduler.observe("KSFO", _at(11, 53))
+    assert not metar_scheduler.observe("KSFO", _at(11, 20))
+    assert math.isclose(metar_scheduler.expected_offset("KSFO"), 53 * 60)
+    # The SPECI did not count as this hour's report either
+    assert metar_scheduler.next_delay(_at(12, 52), IDLE) == MINUTE
+
+
+if __name__ == "__main__":
+    test_pattern_needs_enough_samples()
+    test_predicted_next_poll()
+    test_delay_clamping()
+    test_earliest_station_wins()
+    test_offsets_across_the_cycle_boundary()
+    test_speci_and_repeated_reports_are_ignored()
+    print("✓ Issuance scheduler OK")
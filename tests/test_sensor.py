@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Test the sensors against coordinators that already hold reports."""
+from unittest.mock import MagicMock
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.av_weather.const import CONF_MINIMA, CONF_RUNWAYS, DOMAIN  # noqa: E402
+from custom_components.av_weather.models import CloudLayer, MetarReport  # noqa: E402
+from custom_components.av_weather.sensor import (  # noqa: E402
+    ApiMetricsSensor,
+    MetarSensor,
+    async_hand_over_api_sensors,
+)
+
+REPORT = MetarReport(
+    "KSFO",
+    "KSFO 011756Z 28015KT 4SM BR BKN012 18/12 A3001",
+    "2024-07-01T18:00:00Z",
+    flight_category="MVFR",
+    temperature=18,
+    dewpoint=12,
+    wind_direction=280,
+    wind_speed=15,
+    visibility=4,
+    altimeter=1016,
+    clouds=(CloudLayer("BKN", 1200),),
+)
+
+
+def _coordinator(data):
+    """Return a METAR coordinator holding the given station-indexed reports."""
+    coordinator = MagicMock()
+    coordinator.data = data
+    coordinator.history = None
+    return coordinator
+
+
+def _entry(**data):
+    """Return a config entry with the given data."""
+    entry = MagicMock()
+    entry.data = data
+    return entry
+
+
+def test_metar_sensor_shows_existing_report():
+    """A report restored before the sensor is created is shown straight away."""
+    minima = {"mvfr_ceiling": 1500, "mvfr_visibility": 5}
+    sensor = MetarSensor(MagicMock(), _entry(**{CONF_MINIMA: minima}), _coordinator({"KSFO": REPORT}), "ksfo")
+
+    assert sensor.available
+    assert sensor.native_value == REPORT.raw
+    attributes = sensor.extra_state_attributes
+    assert attributes["flight_category"] == "MVFR"
+    assert attributes["custom_flight_category"] == "MVFR"
+
+
+def test_metar_sensor_runway_winds_on_first_report():
+    """Runway winds are computed for a report shown while the sensor is created."""
+    entry = _entry(**{CONF_RUNWAYS: "KSFO: 28L 10R\n01"})
+    sensor = MetarSensor(MagicMock(), entry, _coordinator({"KSFO": REPORT}), "ksfo")
+
+    attributes = sensor.extra_state_attributes
+    assert attributes["favored_runway"] == "28L"
+    assert [wind["runway"] for wind in attributes["runway_winds"]] == ["28L", "10R"]
+
+
+def test_metar_sensor_without_report():
+    """A station without a report yet is unavailable."""
+    sensor = MetarSensor(MagicMock(), _entry(), _coordinator({}), "KSFO")
+    assert not sensor.available
+    assert sensor.native_value is None
+
+
+def test_api_sensors_are_handed_over():
+    """Unloading the entry owning the API sensors adds them to another entry."""
+    hass = MagicMock()
+    first, second = MagicMock(), MagicMock()
+    hass.data = {DOMAIN: {
+        "api": MagicMock(),
+        "diagnostics_entry": "first",
+        "entity_adders": {"first": first, "second": second},
+    }}
+
+    async_hand_over_api_sensors(hass, "second")
+    assert hass.data[DOMAIN]["diagnostics_entry"] == "first"
+    second.assert_not_called()
+
+    hass.data[DOMAIN]["entity_adders"]["second"] = second
+    async_hand_over_api_sensors(hass, "first")
+    assert hass.data[DOMAIN]["diagnostics_entry"] == "second"
+    (sensors,), _ = second.call_args
+    assert all(isinstance(sensor, ApiMetricsSensor) for sensor in sensors)
+    assert len(sensors) == 2
+
+    async_hand_over_api_sensors(hass, "second")
+    assert "diagnostics_entry" not in hass.data[DOMAIN]
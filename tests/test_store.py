@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Test that the report store restores reports and ignores stores it cannot read."""
+import asyncio
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.av_weather import store as store_module  # noqa: E402
+from custom_components.av_weather.const import FEED_METAR, FEED_TAF, STORAGE_VERSION  # noqa: E402
+from custom_components.av_weather.models import MetarReport, TafReport  # noqa: E402
+
+METAR = MetarReport.from_dict({
+    "icaoId": "KSFO",
+    "rawOb": "KSFO 011756Z 28015KT 4SM BR BKN012 18/12 A3001",
+    "reportTime": "2024-07-01T18:00:00Z",
+    "obsTime": 1719856560,
+    "fltCat": "MVFR",
+    "visib": 4,
+    "clouds": [{"cover": "BKN", "base": 1200}],
+})
+TAF = TafReport.from_dict({
+    "icaoId": "KSFO",
+    "rawTAF": "TAF KSFO 011720Z 0118/0224 28015KT P6SM FEW012",
+    "issueTime": "2024-07-01T17:20:00Z",
+    "validTimeFrom": 1719856800,
+    "validTimeTo": 1719964800,
+    "fcsts": [{"timeFrom": 1719856800, "timeTo": 1719964800, "wspd": 15, "visib": "6+",
+               "clouds": [{"cover": "FEW", "base": 1200}]}],
+})
+
+
+class FakeStore:
+    """In-memory stand-in for Home Assistant's Store, written as JSON."""
+
+    files: dict[str, tuple[int, str]] = {}
+
+    def __init__(self, hass, version: int, key: str) -> None:
+        self.version = version
+        self.key = key
+
+    async def async_load(self):
+        if self.key not in self.files:
+            return None
+        version, text = self.files[self.key]
+        if version != self.version:
+            # What Store does for an old version without a migration
+            raise NotImplementedError
+        return json.loads(text)
+
+    def async_delay_save(self, data_func, delay: float) -> None:
+        self.files[self.key] = (self.version, json.dumps(data_func()))
+
+
+@pytest.fixture(autouse=True)
+def fake_store(monkeypatch):
+    """Replace the Home Assistant store with an empty in-memory one."""
+    monkeypatch.setattr(FakeStore, "files", {})
+    monkeypatch.setattr(store_module, "Store", FakeStore)
+
+
+def _load() -> store_module.AvWeatherReportStore:
+    """Return a report store loaded from the fake files."""
+    report_store = store_module.AvWeatherReportStore(MagicMock())
+    asyncio.run(report_store.async_load())
+    return report_store
+
+
+def test_reports_survive_a_restart():
+    """Saved reports are loaded back equal to what was stored."""
+    report_store = _load()
+    report_store.async_update(FEED_METAR, {"KSFO": METAR})
+    report_store.async_update(FEED_TAF, {"KSFO": TAF})
+
+    restored = _load()
+    assert restored.get(FEED_METAR) == {"KSFO": METAR}
+    assert restored.get(FEED_TAF) == {"KSFO": TAF}
+
+
+def test_unreadable_stores_are_ignored():
+    """Old versions, unknown feeds and malformed entries start empty instead of failing."""
+    key = store_module.STORAGE_KEY
+    FakeStore.files[key] = (STORAGE_VERSION - 1, json.dumps({FEED_METAR: {"KSFO": METAR.as_dict()}}))
+    assert _load().get(FEED_METAR) == {}
+
+    FakeStore.files[key] = (STORAGE_VERSION, json.dumps(["not", "a", "store"]))
+    assert _load().get(FEED_METAR) == {}
+
+    FakeStore.files[key] = (STORAGE_VERSION, json.dumps({
+        "PIREP": {"KSFO": {}},
+        FEED_TAF: ["KSFO"],
+        FEED_METAR: {"KSFO": METAR.as_dict(), "KOAK": "garbage"},
+    }))
+    report_store = _load()
+    assert report_store.get(FEED_METAR) == {"KSFO": METAR}
+    assert report_store.get(FEED_TAF) == {}
+    assert report_store.get("PIREP") == {}
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""Test the TAF timeline's segments, overlays and time lookups."""
+from conftest import load_module
+
+models = load_module("models")
+taf_timeline = load_module("taf_timeline")
+
+CloudLayer = models.CloudLayer
+ForecastPeriod = models.ForecastPeriod
+
+HOUR = 3600
+T0 = 1_700_000_000
+
+# Listed out of order on purpose; the timeline sorts them by start time
+PERIODS = (
+    # TEMPO 1-3h: LIFR in fog
+    ForecastPeriod(T0 + HOUR, T0 + 3 * HOUR, "TEMPO", visibility=0.5, weather="FG", clouds=(CloudLayer("VV", 200),)),
+    # Base forecast: VFR
+    ForecastPeriod(T0, T0 + 2 * HOUR, wind_speed=15, wind_gust=25, visibility="6+", weather="-RA", clouds=(CloudLayer("SCT", 4000),)),
+    # BECMG 4-5h: only the ceiling lowers, to IFR
+    ForecastPeriod(T0 + 4 * HOUR, T0 + 5 * HOUR, "BECMG", clouds=(CloudLayer("OVC", 800),)),
+    # PROB30 3-4h: thunderstorms under an IFR ceiling
+    ForecastPeriod(T0 + 3 * HOUR, T0 + 4 * HOUR, probability=30, weather="TSRA", clouds=(CloudLayer("OVC", 900),)),
+    # FM 2h: MVFR
+    ForecastPeriod(T0 + 2 * HOUR, T0 + 6 * HOUR, "FM", wind_speed=10, visibility=4, weather="BR", clouds=(CloudLayer("BKN", 2500),)),
+)
+REPORT = models.TafReport("KSFO", "TAF KSFO ...", "2023-11-14T22:00:00Z", T0, T0 + 6 * HOUR, periods=PERIODS)
+
+
+def test_prevailing_segments():
+    """FM replaces the forecast, BECMG only changes what it mentions."""
+    timeline = taf_timeline.TafTimeline(REPORT)
+    assert [(segment.start - T0, segment.end - T0) for segment in timeline.segments] == [
+        (0, 2 * HOUR), (2 * HOUR, 4 * HOUR), (4 * HOUR, 6 * HOUR),
+    ]
+    base, fm, becmg = timeline.segments
+    assert [segment.category for segment in timeline.segments] == ["VFR", "MVFR", "IFR"]
+    # FM starts from scratch: the base forecast's gust is not carried over
+    assert (fm.wind_gust, fm.weather) == (None, "BR")
+    # BECMG keeps the visibility, wind and weather of the FM group it changes
+    assert (becmg.visibility, becmg.wind_speed, becmg.weather) == (4, 10, "BR")
+    assert base.clouds == (CloudLayer("SCT", 4000),)
+
+
+def test_overlays_inherit_prevailing_conditions():
+    """TEMPO and PROB groups fill in what they leave out from the prevailing segment."""
+    timeline = taf_timeline.TafTimeline(REPORT)
+    tempo, prob = timeline.overlays
+    assert (tempo.change, tempo.category, tempo.wind_gust) == ("TEMPO", "LIFR", 25)
+    assert (prob.probability, prob.visibility, prob.category) == (30, 4, "IFR")
+    assert [item["change"] for item in timeline.as_list()] == [None, "TEMPO", "FM", None, "BECMG"]
+
+
+def test_boundary_timestamps():
+    """Segments include their start and exclude their end."""
+    timeline = taf_timeline.TafTimeline(REPORT)
+    assert timeline.prevailing_at(T0 - 1) is None
+    assert timeline.prevailing_at(T0).category == "VFR"
+    assert timeline.prevailing_at(T0 + 2 * HOUR - 1).category == "VFR"
+    assert timeline.prevailing_at(T0 + 2 * HOUR).category == "MVFR"
+    assert timeline.prevailing_at(T0 + 6 * HOUR - 1).category == "IFR"
+    assert timeline.prevailing_at(T0 + 6 * HOUR) is None
+
+    assert timeline.worst_category_at(T0 + HOUR - 1) == "VFR"
+    assert timeline.worst_category_at(T0 + HOUR) == "LIFR"
+    assert timeline.worst_category_at(T0 + 3 * HOUR - 1) == "LIFR"
+    assert timeline.worst_category_at(T0 + 3 * HOUR) == "IFR"
+    assert timeline.worst_category_at(T0 + 6 * HOUR) is None
+
+
+def test_next_change_and_boundary():
+    """The next category change and the next boundary are strictly after the given time."""
+    timeline = taf_timeline.TafTimeline(REPORT)
+    assert timeline.next_change(T0 - HOUR) == (T0, "VFR")
+    assert timeline.next_change(T0) == (T0 + 2 * HOUR, "MVFR")
+    assert timeline.next_change(T0 + 2 * HOUR) == (T0 + 4 * HOUR, "IFR")
+    assert timeline.next_change(T0 + 4 * HOUR) == (T0 + 6 * HOUR, None)
+    assert timeline.next_change(T0 + 6 * HOUR) is None
+
+    boundaries = []
+    boundary = T0
+    while (boundary := timeline.next_boundary(boundary)) is not None:
+        boundaries.append((boundary - T0) // HOUR)
+    assert boundaries == [1, 2, 3, 4, 6]
+
+
+def test_unchanged_category_is_not_a_change():
+    """An FM group with the same category as before does not count as a change."""
+    periods = (
+        ForecastPeriod(T0, None, visibility="6+", clouds=(CloudLayer("FEW", 5000),)),
+        ForecastPeriod(T0 + HOUR, None, "FM", visibility=8, clouds=(CloudLayer("SCT", 3500),)),
+        ForecastPeriod(T0 + 2 * HOUR, None, "FM", visibility=2, clouds=()),
+    )
+    timeline = taf_timeline.TafTimeline(models.TafReport("KSFO", None, None, T0, T0 + 3 * HOUR, periods=periods))
+    assert timeline.next_change(T0) == (T0 + 2 * HOUR, "IFR")
+    assert taf_timeline.build_timeline(REPORT) is taf_timeline.build_timeline(REPORT)
+
+
+if __name__ == "__main__":
+    test_prevailing_segments()
+    test_overlays_inherit_prevailing_conditions()
+    test_boundary_timestamps()
+    test_next_change_and_boundary()
+    test_unchanged_category_is_not_a_change()
+    print("✓ TAF timeline OK")